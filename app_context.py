@@ -0,0 +1,140 @@
+# app_context.py
+"""
+Khởi tạo và nối các manager / service dùng chung cho main, CLI, server, benchmark
+
+Manager / service chỉ được tạo (nạp file) ở lần dùng đầu tiên:
+- Phụ thuộc giữa các manager nối bằng Deferred → manager kia cũng chỉ được
+  tạo khi thật sự cần (vd xem task_list của nhân viên mới nạp tasks.csv)
+- Module báo cáo chỉ được import khi dùng tới manager / service báo cáo
+- load_all() nạp hết ngay (server, benchmark)
+"""
+from functools import cached_property
+
+import instrumentation
+from managers.dependency import Deferred
+from managers.staff_manager import StaffManager
+from managers.project_manager import ProjectManager
+from managers.task_manager import TaskManager
+from managers.unit_of_work import UnitOfWork
+from managers.write_behind import WriteBehind
+from services.task_service import TaskService
+from services.project_service import ProjectService
+from services.staff_service import StaffService
+from services.progress_service import ProgressService
+
+
+class AppContext:
+    STAFF_CSV = "staff.csv"
+    TASK_CSV = "tasks.csv"
+    PROJECT_CSV = "projects.csv"
+    WEEKLY_CSV = "weekly_reports.csv"
+    FINAL_CSV = "final_reports.csv"
+
+    # Manager dữ liệu chính – được gắn WriteBehind / UnitOfWork
+    DATA_MANAGERS = ("staff_manager", "task_manager", "project_manager")
+
+    def __init__(self):
+        # Đo đạc thao tác – chỉ bật khi có PM_METRICS, gọi lại nhiều lần không sao
+        instrumentation.install()
+        self.write_behind = None
+        # UnitOfWork chưa đóng – manager tạo sau được gắn thêm vào
+        self._units = []
+
+    # ================= MANAGER =================
+    @cached_property
+    def staff_manager(self):
+        staff_manager = StaffManager(self.STAFF_CSV)
+        staff_manager.set_task_manager(Deferred(lambda: self.task_manager))
+        return self._attach(staff_manager)
+
+    @cached_property
+    def task_manager(self):
+        task_manager = TaskManager(
+            filename=self.TASK_CSV,
+            staff_manager=Deferred(lambda: self.staff_manager)
+        )
+        task_manager.project_manager = Deferred(lambda: self.project_manager)
+        return self._attach(task_manager)
+
+    @cached_property
+    def project_manager(self):
+        return self._attach(ProjectManager(
+            self.PROJECT_CSV,
+            staff_manager=Deferred(lambda: self.staff_manager),
+            task_manager=Deferred(lambda: self.task_manager)
+        ))
+
+    # Module báo cáo import ở đây (không import ở đầu file)
+    @cached_property
+    def weekly_report_manager(self):
+        from managers.weekly_report_manager import WeeklyReportManager
+        return WeeklyReportManager(self.WEEKLY_CSV)
+
+    @cached_property
+    def final_report_manager(self):
+        from managers.final_report_manager import FinalReportManager
+        return FinalReportManager(self.FINAL_CSV)
+
+    def load_all(self):
+        """Tạo / nạp mọi manager ngay (như trước khi có lazy)"""
+        for name in ("staff_manager", "task_manager", "project_manager",
+                     "weekly_report_manager", "final_report_manager"):
+            getattr(self, name)
+        return self
+
+    # ================= SERVICE (KHÔNG INPUT) =================
+    @cached_property
+    def task_service(self):
+        return TaskService(self.task_manager, self.project_manager, self.staff_manager)
+
+    @cached_property
+    def project_service(self):
+        return ProjectService(self.project_manager, self.staff_manager, self.task_manager)
+
+    @cached_property
+    def staff_service(self):
+        return StaffService(self.staff_manager)
+
+    @cached_property
+    def progress_service(self):
+        return ProgressService(self.project_manager, self.task_manager)
+
+    @cached_property
+    def weekly_report_service(self):
+        from services.report_service import WeeklyReportService
+        return WeeklyReportService(
+            self.weekly_report_manager, self.project_manager, self.staff_manager, self.task_manager
+        )
+
+    @cached_property
+    def final_report_service(self):
+        from services.report_service import FinalReportService
+        return FinalReportService(
+            self.final_report_manager, self.project_manager, self.staff_manager, self.task_manager
+        )
+
+    # ================= GHI FILE =================
+    def start_write_behind(self):
+        """Ghi trễ theo PM_WRITE_BEHIND – manager tạo sau cũng được gắn vào"""
+        self.write_behind = WriteBehind.from_config(*self._loaded_managers())
+        return self.write_behind
+
+    def _loaded_managers(self):
+        return [getattr(self, m) for m in self.DATA_MANAGERS if m in self.__dict__]
+
+    def _attach(self, manager):
+        if self.write_behind is not None:
+            self.write_behind.add_manager(manager)
+        self._units = [u for u in self._units if u.add_manager(manager)]
+        return manager
+
+    def unit_of_work(self, defer_commit=False):
+        """
+        Gom mọi thay đổi Staff / Project / Task → mỗi file ghi 1 lần
+        Chỉ gắn manager đã tạo; manager được tạo trong lúc khối đang mở tự gắn vào
+        → thao tác chỉ đọc (vd progress) không phải nạp staff.csv / projects.csv
+        """
+        self._units = [u for u in self._units if not u.closed]
+        unit_of_work = UnitOfWork(*self._loaded_managers(), defer_commit=defer_commit)
+        self._units.append(unit_of_work)
+        return unit_of_work
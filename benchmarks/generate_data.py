@@ -0,0 +1,228 @@
+# benchmarks/generate_data.py
+"""
+Sinh bộ dữ liệu giả (đúng định dạng ID / ngày tháng của hệ thống) để đo hiệu năng
+
+    python -m benchmarks.generate_data --scale 100k --out /tmp/pm_100k
+    python -m benchmarks.generate_data --tasks 5000 --out data_test --seed 7
+
+Sinh: staff.csv, projects.csv, tasks.csv, weekly_reports.csv, final_reports.csv
+"""
+import argparse
+import csv
+import os
+import random
+from datetime import datetime, timedelta
+
+from models.project import Project
+from models.staff import CAP_DO_HOP_LE, VAI_TRO_HOP_LE
+from models.task import Task
+from managers.staff_manager import StaffManager
+from reports.final_report import FinalReport
+from reports.weekly_report import WeeklyReport
+
+SCALES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+# Tỉ lệ mặc định: ~50 task / dự án, ~20 task / nhân viên, 1 PM / 10 nhân viên
+TASKS_PER_PROJECT = 50
+TASKS_PER_STAFF = 20
+STAFF_PER_PM = 10
+
+HO = ["Nguyễn", "Trần", "Lê", "Phạm", "Hoàng", "Huỳnh", "Phan", "Vũ", "Võ", "Đặng", "Bùi", "Đỗ"]
+DEM = ["Văn", "Thị", "Minh", "Ngọc", "Thanh", "Quốc", "Hữu", "Thu", "Đức", "Gia"]
+TEN = ["An", "Bình", "Chi", "Dũng", "Giang", "Hà", "Hải", "Hiếu", "Hoa", "Khánh",
+       "Linh", "Long", "Mai", "Nam", "Phúc", "Quân", "Sơn", "Trang", "Tuấn", "Vy"]
+LINH_VUC = ["Quản Lý Kho", "Bán Hàng", "Nhân Sự", "Kế Toán", "Đặt Phòng", "Học Trực Tuyến",
+            "Thư Viện", "Bệnh Viện", "Giao Hàng", "Chấm Công", "Thanh Toán", "Khách Hàng"]
+VIEC = ["Phân tích yêu cầu", "Thiết kế CSDL", "Thiết kế giao diện", "Viết API", "Kiểm thử",
+        "Sửa lỗi", "Triển khai", "Viết tài liệu", "Họp khách hàng", "Tối ưu hiệu năng"]
+PROJECT_STATUS_WEIGHTS = [
+    ("Chưa khởi động", 1), ("Đang thực hiện", 5), ("Tạm dừng", 1), ("Hoàn thành", 2), ("Hủy", 1),
+]
+
+
+def _full_name(rng):
+    return f"{rng.choice(HO)} {rng.choice(DEM)} {rng.choice(TEN)}"
+
+
+def _write(path, fieldnames, rows):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def generate(out_dir, n_tasks, seed=2025):
+    """Ghi 5 file CSV vào out_dir; trả về số dòng từng file"""
+    rng = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+
+    n_projects = max(1, n_tasks // TASKS_PER_PROJECT)
+    n_staff = min(99_999, max(STAFF_PER_PM, n_tasks // TASKS_PER_STAFF))
+
+    # ================= STAFF =================
+    staff = []
+    for i in range(1, n_staff + 1):
+        title = "Project Manager" if i % STAFF_PER_PM == 1 else ("Team Leader" if i % STAFF_PER_PM == 2 else "")
+        staff.append({
+            "staff_id": f"NV_{i:05d}",
+            "full_name": _full_name(rng),
+            "age": rng.randint(20, 55),
+            "level": rng.choice(CAP_DO_HOP_LE),
+            "role": rng.choice(VAI_TRO_HOP_LE),
+            "management_title": title,
+            "task_list": [],
+        })
+    pm_ids = [s["staff_id"] for s in staff if s["management_title"] == "Project Manager"]
+
+    # ================= PROJECT =================
+    statuses, weights = zip(*PROJECT_STATUS_WEIGHTS)
+    today = datetime(2025, 12, 31)
+    projects = []
+    for i in range(n_projects):
+        year = 20 + i // 99_999
+        start = today - timedelta(days=rng.randint(30, 900))
+        expected_end = start + timedelta(days=rng.randint(60, 365))
+        status = rng.choices(statuses, weights)[0]
+        actual_end = None
+        if status in ("Hoàn thành", "Hủy"):
+            actual_end = min(expected_end + timedelta(days=rng.randint(-20, 20)), today)
+            actual_end = max(actual_end, start + timedelta(days=7))
+        projects.append({
+            "project_id": f"P{year:02d}_{i % 99_999 + 1:05d}",
+            "project_name": f"Hệ Thống {rng.choice(LINH_VUC)} {i + 1}",
+            "customer": _full_name(rng),
+            "description": f"Xây dựng hệ thống {rng.choice(LINH_VUC).lower()}",
+            "start_date": start,
+            "expected_end_date": expected_end,
+            "actual_end_date": actual_end,
+            "budget": float(rng.randint(50, 5000) * 1_000_000),
+            "status_project": status,
+            "pm_id": rng.choice(pm_ids),
+        })
+
+    # ================= TASK =================
+    tasks = []
+    per_project = {}
+    for i in range(n_tasks):
+        p = projects[i % n_projects]
+        seq = per_project[p["project_id"]] = per_project.get(p["project_id"], 0) + 1
+        span = (p["expected_end_date"] - p["start_date"]).days
+        start = p["start_date"] + timedelta(days=rng.randint(0, max(0, span - 1)))
+        deadline = min(start + timedelta(days=rng.randint(1, 30)), p["expected_end_date"])
+        status = rng.choice(Task.STATUS_LIST)
+        completed = None
+        if status == "Completed":
+            completed = min(deadline + timedelta(days=rng.randint(-10, 5)), today)
+            completed = max(completed, start)
+
+        assignee = "Unassigned"
+        if rng.random() < 0.9:
+            s = staff[rng.randrange(n_staff)]
+            assignee = s["staff_id"]
+            s["task_list"].append(f"T{p['project_id']}_{seq:05d}")
+
+        tasks.append(Task(
+            project_id=p["project_id"],
+            task_id=f"T{p['project_id']}_{seq:05d}",
+            task_name=rng.choice(VIEC),
+            description=f"Công việc số {seq}",
+            assignee_id=assignee,
+            start_date=start,
+            deadline=deadline,
+            completed_date=completed,
+            priority=rng.choice(Task.PRIORITY_LEVELS),
+            status_task=status,
+        ).to_dict())
+
+    # ================= BÁO CÁO TUẦN =================
+    weekly = []
+    for p in projects:
+        if p["status_project"] == "Chưa khởi động":
+            continue
+        start = p["start_date"]
+        last = min(p["actual_end_date"] or today, p["expected_end_date"])
+        week = 1
+        while start <= last and week <= 99:
+            end = min(start + timedelta(days=6), p["expected_end_date"])
+            total = rng.randint(0, TASKS_PER_PROJECT)
+            done = rng.randint(0, total)
+            weekly.append({
+                "report_id": f"WR{p['project_id']}_W{week:02d}",
+                "project_id": p["project_id"],
+                "author_id": p["pm_id"],
+                "created_date": (end + timedelta(days=1)).strftime("%Y-%m-%d %H:%M:%S"),
+                "period_start": start.strftime("%Y-%m-%d"),
+                "period_end": end.strftime("%Y-%m-%d"),
+                "total_tasks": total,
+                "completed_tasks": done,
+                "overdue_tasks": rng.randint(0, total - done),
+                "progress": round(done / total * 100, 2) if total else 0.0,
+                "status": rng.choice(["On Track", "At Risk", "Delay"]),
+            })
+            start = end + timedelta(days=1)
+            week += 1
+
+    # ================= BÁO CÁO TỔNG KẾT =================
+    final = []
+    for p in projects:
+        if not p["actual_end_date"]:
+            continue
+        total = per_project.get(p["project_id"], 0)
+        done = rng.randint(0, total)
+        late = rng.randint(0, done)
+        final.append({
+            "project_id": p["project_id"],
+            "report_id": f"FR{p['project_id']}",
+            "author_id": p["pm_id"],
+            "created_date": p["actual_end_date"].strftime("%Y-%m-%d %H:%M:%S"),
+            "project_name": p["project_name"],
+            "customer": p["customer"],
+            "project_start_date": p["start_date"].strftime("%d/%m/%Y"),
+            "actual_end_date": p["actual_end_date"].strftime("%d/%m/%Y"),
+            "duration_days": (p["actual_end_date"] - p["start_date"]).days,
+            "total_tasks": total,
+            "completed_tasks": done,
+            "ontime_tasks": done - late,
+            "overdue_tasks": late,
+            "cancelled_tasks": rng.randint(0, total - done),
+            "overall_progress": round(done / total * 100, 2) if total else 0.0,
+            "project_status": p["status_project"],
+        })
+
+    # ================= GHI FILE =================
+    for s in staff:
+        s["task_list"] = ";".join(s["task_list"])
+    for p in projects:
+        for field in ("start_date", "expected_end_date", "actual_end_date"):
+            p[field] = p[field].strftime("%Y-%m-%d") if p[field] else ""
+
+    _write(os.path.join(out_dir, "staff.csv"), StaffManager.FIELDNAMES, staff)
+    _write(os.path.join(out_dir, "projects.csv"), Project.csv_fields(), projects)
+    _write(os.path.join(out_dir, "tasks.csv"), Task.csv_fields(), tasks)
+    _write(os.path.join(out_dir, "weekly_reports.csv"), WeeklyReport.csv_fields(), weekly)
+    _write(os.path.join(out_dir, "final_reports.csv"), FinalReport.csv_fields(), final)
+
+    return {"staff": len(staff), "projects": len(projects), "tasks": len(tasks),
+            "weekly_reports": len(weekly), "final_reports": len(final)}
+
+
+def parse_scale(value):
+    value = value.lower()
+    return SCALES[value] if value in SCALES else int(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sinh dữ liệu giả cho benchmark")
+    parser.add_argument("--scale", default="1k", help="1k / 10k / 100k / 1m hoặc số task")
+    parser.add_argument("--tasks", type=int, help="Số task (ghi đè --scale)")
+    parser.add_argument("--out", required=True, help="Thư mục ghi file CSV")
+    parser.add_argument("--seed", type=int, default=2025)
+    args = parser.parse_args(argv)
+
+    n_tasks = args.tasks or parse_scale(args.scale)
+    counts = generate(args.out, n_tasks, seed=args.seed)
+    print(", ".join(f"{k}: {v}" for k, v in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+# benchmarks/run_benchmarks.py
+"""
+Đo thời gian các thao tác chính trên bộ dữ liệu sinh bởi generate_data
+
+    python -m benchmarks.run_benchmarks --scale 100k --out results.json
+    python -m benchmarks.run_benchmarks --data-dir /tmp/pm_100k --only load,find_by_id
+
+Luôn chạy trên bản sao dữ liệu trong thư mục tạm (các bài đo xóa / ghi file).
+Kết quả JSON: mỗi bài đo có số thao tác, tổng thời gian và thời gian / thao tác.
+"""
+import argparse
+import contextlib
+import glob
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from app_context import AppContext
+from benchmarks.generate_data import generate, parse_scale
+from reports.final_report import FinalReport
+from reports.weekly_report import WeeklyReport
+
+BENCHMARKS = {}
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROMPT = "Chọn chức năng: "
+
+
+def benchmark(name):
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def timed(func, repeat=1):
+    """Chạy func repeat lần, trả về (kết quả lần cuối, [thời gian từng lần – giây])"""
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return result, times
+
+
+def summarize(times, ops):
+    total = sum(times)
+    return {
+        "runs": len(times),
+        "ops_per_run": ops,
+        "total_ms": round(total * 1000, 3),
+        "min_ms": round(min(times) * 1000, 3),
+        "median_ms": round(statistics.median(times) * 1000, 3),
+        "per_op_us": round(min(times) / max(ops, 1) * 1_000_000, 3),
+    }
+
+
+def _remove_caches():
+    for pattern in ("*.snapshot", "*.journal", "*.idx"):
+        for path in glob.glob(pattern):
+            os.remove(path)
+
+
+# ================= BÀI ĐO =================
+@benchmark("load_cold")
+def bench_load_cold(ctx, rng, repeat):
+    def run():
+        _remove_caches()
+        return AppContext().load_all()
+    _, times = timed(run, repeat)
+    return summarize(times, 1)
+
+
+@benchmark("load_warm")
+def bench_load_warm(ctx, rng, repeat):
+    AppContext().load_all()  # tạo snapshot
+    _, times = timed(lambda: AppContext().load_all(), repeat)
+    return summarize(times, 1)
+
+
+def _time_to_prompt(args):
+    """Chạy tiến trình mới, đo tới khi in ra lời nhắc chọn chức năng rồi nhập 0 để thoát"""
+    start = time.perf_counter()
+    proc = subprocess.Popen(args, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL, cwd=os.getcwd())
+    output = b""
+    prompt = PROMPT.encode("utf-8")
+    while prompt not in output:
+        chunk = proc.stdout.read1(65536)
+        if not chunk:
+            raise RuntimeError("Tiến trình kết thúc trước khi hiện menu")
+        output += chunk
+    elapsed = time.perf_counter() - start
+    proc.communicate(b"0\n")
+    return elapsed
+
+
+@benchmark("first_prompt")
+def bench_first_prompt(ctx, rng, repeat):
+    """Khởi động main.py tới menu chính (tiến trình mới) – so với nạp hết mọi manager trước"""
+    lazy = [_time_to_prompt([sys.executable, os.path.join(ROOT, "main.py")]) for _ in range(repeat)]
+    eager_code = (f"import sys; sys.path.insert(0, {ROOT!r}); from app_context import AppContext; "
+                  f"AppContext().load_all().weekly_report_service; input({PROMPT!r})")
+    eager = [_time_to_prompt([sys.executable, "-c", eager_code]) for _ in range(repeat)]
+    result = summarize(lazy, 1)
+    result["eager_median_ms"] = round(statistics.median(eager) * 1000, 3)
+    return result
+
+
+@benchmark("save_all")
+def bench_save_all(ctx, rng, repeat):
+    managers = (ctx.staff_manager, ctx.project_manager, ctx.task_manager)
+    _, times = timed(lambda: [m._write_all() for m in managers], repeat)
+    return summarize(times, len(managers))
+
+
+@benchmark("find_by_id")
+def bench_find_by_id(ctx, rng, repeat):
+    ids = [t.id for t in rng.sample(ctx.task_manager.items, min(10_000, len(ctx.task_manager.items)))]
+    ids += [s.staff_id for s in rng.sample(ctx.staff_manager.staff_list, min(1_000, len(ctx.staff_manager.staff_list)))]
+    ids += ["KHONG_TON_TAI"] * 1_000
+
+    def run():
+        for i in ids:
+            ctx.task_manager.find_by_id(i)
+            ctx.staff_manager.find_by_id(i)
+    _, times = timed(run, repeat)
+    return summarize(times, len(ids) * 2)
+
+
+@benchmark("search_task")
+def bench_search_task(ctx, rng, repeat):
+    keywords = ["kiểm thử", "api", "TP20_0001", "không có"]
+    _, times = timed(lambda: [ctx.task_manager.find_tasks(k) for k in keywords], repeat)
+    return summarize(times, len(keywords))
+
+
+@benchmark("search_staff")
+def bench_search_staff(ctx, rng, repeat):
+    keywords = ["NV_00001", "Developer", "Nguyễn", "Linh"]
+    _, times = timed(lambda: [ctx.staff_manager.find_staff(k) for k in keywords], repeat)
+    return summarize(times, len(keywords))
+
+
+def _sample_projects(ctx, rng, n=100, finished=False):
+    projects = ctx.project_manager.items
+    if finished:
+        projects = [p for p in projects if p.actual_end_date and p.pm_id]
+    return rng.sample(projects, min(n, len(projects)))
+
+
+@benchmark("progress")
+def bench_progress(ctx, rng, repeat):
+    pids = [p.project_id for p in _sample_projects(ctx, rng)]
+    _, times = timed(lambda: [ctx.progress_service.compute(pid).as_dict() for pid in pids], repeat)
+    return summarize(times, len(pids))
+
+
+@benchmark("portfolio")
+def bench_portfolio(ctx, rng, repeat):
+    """Tổng quan mọi dự án: dữ liệu dạng cột so với duyệt từng Task"""
+    now = datetime.now()
+    ctx.task_manager.columns  # dựng cột trước, không tính vào thời gian truy vấn
+    _, times = timed(lambda: ctx.progress_service.portfolio(now), repeat)
+    result = summarize(times, 1)
+
+    def object_scan():
+        counts, overdue, late = {}, {}, {}
+        for t in ctx.task_manager.items:
+            per_project = counts.setdefault(t.project_id, {})
+            per_project[t.status_task] = per_project.get(t.status_task, 0) + 1
+            if t.deadline and t.deadline < now and t.status_task not in ("Completed", "Cancelled"):
+                overdue[t.project_id] = overdue.get(t.project_id, 0) + 1
+            if t.is_completed_late():
+                late[t.project_id] = late.get(t.project_id, 0) + 1
+        return counts, overdue, late
+    _, scan_times = timed(object_scan, repeat)
+    result["object_scan_median_ms"] = round(statistics.median(scan_times) * 1000, 3)
+    return result
+
+
+@benchmark("weekly_report")
+def bench_weekly_report(ctx, rng, repeat):
+    projects = _sample_projects(ctx, rng)
+
+    def run():
+        for p in projects:
+            author = ctx.staff_manager.find_by_id(p.pm_id)
+            WeeklyReport(
+                wreport_id=f"WR{p.project_id}_W01",
+                project=p,
+                author=author,
+                task_manager=ctx.task_manager,
+                report_date=datetime.now(),
+                period_start_date=p.start_date,
+                period_end_date=ctx.weekly_report_service.default_end(p, p.start_date),
+                is_loading=True
+            )
+    _, times = timed(run, repeat)
+    return summarize(times, len(projects))
+
+
+@benchmark("final_report")
+def bench_final_report(ctx, rng, repeat):
+    projects = _sample_projects(ctx, rng, finished=True)
+
+    def run():
+        for p in projects:
+            report = FinalReport(project_id=p.project_id, report_id=f"FR{p.project_id}",
+                                 author_id=p.pm_id, report_date=datetime.now())
+            report.input_info(ctx.project_manager, ctx.task_manager, ctx.staff_manager)
+    _, times = timed(run, repeat)
+    return summarize(times, len(projects))
+
+
+@benchmark("delete_project")
+def bench_delete_project(ctx, rng, repeat):
+    # Xóa thật (trên bản sao) → mỗi lần chạy xóa nhóm dự án khác nhau
+    pool = _sample_projects(ctx, rng, n=20 * repeat)
+    groups = [pool[i::repeat] for i in range(repeat)]
+    times = []
+    removed = 0
+    for group in groups:
+        start = time.perf_counter()
+        for p in group:
+            removed += len(ctx.project_manager.remove_project(p))
+        times.append(time.perf_counter() - start)
+    result = summarize(times, len(groups[0]) if groups else 0)
+    result["tasks_removed"] = removed
+    return result
+
+
+def _traced_bytes(load):
+    """(kết quả của load(), số byte còn giữ lại sau khi load() xong)"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        value = load()
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    return value, used
+
+
+@benchmark("memory")
+def bench_memory(ctx, rng, repeat):
+    """
+    Bộ nhớ (byte) còn giữ lại cho mỗi dòng sau khi nạp:
+    - baseline: giữ nguyên dict dòng CSV (cách lưu cũ)
+    - objects: object có __slots__ (dict dòng CSV đã được giải phóng)
+    """
+    result = {}
+    for label, manager in (("task", ctx.task_manager),
+                           ("project", ctx.project_manager),
+                           ("staff", ctx.staff_manager)):
+        from_row = manager._from_row
+        rows, baseline = _traced_bytes(manager.storage.load_rows)
+        del rows
+        objs, used = _traced_bytes(lambda: [from_row(row) for row in manager.storage.load_rows()])
+        n = max(len(objs), 1)
+        result[label] = {
+            "rows": len(objs),
+            "baseline_bytes_total": baseline,
+            "baseline_bytes_per_row": round(baseline / n, 1),
+            "bytes_total": used,
+            "bytes_per_row": round(used / n, 1),
+            "saved_pct": round((1 - used / baseline) * 100, 1) if baseline else 0,
+        }
+        del objs
+    return result
+
+
+# ================= CHẠY =================
+def run(data_dir, names, repeat=3, seed=1):
+    rng = random.Random(seed)
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="pm_bench_") as work:
+        for name in os.listdir(data_dir):
+            if name.endswith(".csv"):
+                shutil.copy(os.path.join(data_dir, name), work)
+
+        cwd = os.getcwd()
+        os.chdir(work)
+        try:
+            # Thông báo của manager không lẫn vào kết quả
+            with contextlib.redirect_stdout(sys.stderr):
+                ctx = AppContext().load_all()
+                for name in names:
+                    results[name] = BENCHMARKS[name](ctx, rng, repeat)
+                    summary = results[name]
+                    if "median_ms" in summary:
+                        print(f"{name}: {summary['median_ms']} ms", file=sys.stderr)
+                    else:
+                        print(f"{name}: {summary}", file=sys.stderr)
+                counts = {
+                    "staff": len(ctx.staff_manager.staff_list),
+                    "projects": len(ctx.project_manager.items),
+                    "tasks": len(ctx.task_manager.items),
+                }
+        finally:
+            os.chdir(cwd)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "rows_after_run": counts,
+        },
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark hệ thống quản lý dự án")
+    parser.add_argument("--data-dir", help="Thư mục CSV có sẵn (mặc định: tự sinh theo --scale)")
+    parser.add_argument("--scale", default="10k", help="1k / 10k / 100k / 1m hoặc số task")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", help="Danh sách bài đo, phân cách bằng dấu phẩy")
+    parser.add_argument("--out", help="Ghi kết quả JSON ra file (mặc định: stdout)")
+    args = parser.parse_args(argv)
+
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        parser.error(f"không có bài đo: {', '.join(unknown)} (có: {', '.join(BENCHMARKS)})")
+
+    with tempfile.TemporaryDirectory(prefix="pm_data_") as generated:
+        data_dir = args.data_dir
+        if not data_dir:
+            data_dir = generated
+            generate(data_dir, parse_scale(args.scale))
+        result = run(data_dir, names, repeat=args.repeat)
+
+    result["meta"]["data_dir"] = args.data_dir or f"generated:{args.scale}"
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+# cli.py
+"""
+Dòng lệnh không tương tác (không input()) – kết quả in ra stdout dạng JSON
+
+    python cli.py tasks list --project P25_00001 --status "In Progress"
+    python cli.py tasks import tasks_moi.csv
+    python cli.py progress P25_00001
+    python cli.py progress --portfolio
+    python cli.py reports weekly generate --all
+    python cli.py reports final generate --project P25_00001
+    python cli.py --batch thao_tac.json
+
+Mã thoát: 0 = thành công, 1 = có thao tác lỗi, 2 = sai tham số
+"""
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+from datetime import datetime
+from app_context import AppContext
+from services.operations import list_tasks, run_operations
+
+
+# ================= ĐỌC FILE ĐẦU VÀO =================
+def load_records(path, key=None):
+    """Đọc danh sách dict từ file .json (list hoặc {key: list}) hoặc .csv"""
+    if path.lower().endswith(".csv"):
+        with open(path, mode="r", newline="", encoding="utf-8-sig") as f:
+            return list(csv.DictReader(f))
+
+    with open(path, mode="r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get(key, []) if key else []
+    if not isinstance(data, list):
+        raise ValueError(f"{path}: cần danh sách bản ghi")
+    return data
+
+
+# ================= LỆNH =================
+def cmd_tasks_list(ctx, args):
+    tasks = list_tasks(ctx, args.project, args.status, args.assignee, args.overdue)
+    return {"ok": True, "count": len(tasks), "tasks": [t.to_dict() for t in tasks]}
+
+
+def cmd_tasks_import(ctx, args):
+    ops = []
+    for row in load_records(args.file, key="tasks"):
+        row = dict(row)
+        # completed_date tự tính theo status_task → bỏ cột này của file xuất
+        row.pop("completed_date", None)
+        if args.project:
+            row["project_id"] = args.project
+        ops.append({"op": "tasks.create", "project_id": row.get("project_id", ""), "fields": row})
+    return run_operations(ctx, ops, atomic=args.atomic)
+
+
+def cmd_progress(ctx, args):
+    if args.portfolio:
+        return {"ok": True, "portfolio": ctx.progress_service.portfolio()}
+    pids = [p.project_id for p in ctx.project_manager.items] if args.all else args.project_ids
+    return run_operations(ctx, [{"op": "progress", "project_id": pid} for pid in pids])
+
+
+def cmd_weekly_generate(ctx, args):
+    if args.all:
+        ops = [
+            {"op": "reports.weekly.generate", "project_id": p.project_id}
+            for p in ctx.project_manager.items
+            if p.status_project not in ctx.final_report_service.FINISHED_STATUSES
+        ]
+    else:
+        ops = [{
+            "op": "reports.weekly.generate",
+            "project_id": pid,
+            "start": args.start,
+            "end": args.end,
+            "author_id": args.author,
+        } for pid in args.project]
+    return run_operations(ctx, ops)
+
+
+def cmd_final_generate(ctx, args):
+    if args.all:
+        ops = [
+            {"op": "reports.final.generate", "project_id": p.project_id}
+            for p in ctx.project_manager.items
+            if p.status_project in ctx.final_report_service.FINISHED_STATUSES
+            and ctx.final_report_manager.index.get(f"FR{p.project_id}") is None
+        ]
+    else:
+        ops = [{"op": "reports.final.generate", "project_id": pid, "author_id": args.author}
+               for pid in args.project]
+    return run_operations(ctx, ops)
+
+
+def cmd_batch(ctx, args):
+    return run_operations(ctx, load_records(args.batch, key="operations"), atomic=args.atomic)
+
+
+# ================= ARGPARSE =================
+def build_parser():
+    # Tùy chọn chung – đặt được cả trước lẫn sau tên lệnh (mặc định xử lý ở main)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--data-dir", default=argparse.SUPPRESS, help="Thư mục chứa các file CSV")
+    common.add_argument("--atomic", action="store_true", default=argparse.SUPPRESS,
+                        help="Có thao tác lỗi → bỏ toàn bộ thay đổi (batch / import)")
+
+    parser = argparse.ArgumentParser(
+        prog="cli.py",
+        description="Quản lý dự án – dòng lệnh không tương tác (kết quả JSON)",
+        parents=[common]
+    )
+    parser.add_argument("--batch", metavar="FILE",
+                        help="File JSON danh sách thao tác ({'op': ...}) – nạp 1 lần, ghi 1 lần")
+    sub = parser.add_subparsers(dest="command")
+
+    # ----- tasks -----
+    tasks = sub.add_parser("tasks", help="Công việc").add_subparsers(dest="action", required=True)
+
+    p = tasks.add_parser("list", help="Liệt kê task", parents=[common])
+    p.add_argument("--project")
+    p.add_argument("--status")
+    p.add_argument("--assignee")
+    p.add_argument("--overdue", action="store_true")
+    p.set_defaults(handler=cmd_tasks_list)
+
+    p = tasks.add_parser("import", help="Thêm nhiều task từ file .json / .csv", parents=[common])
+    p.add_argument("file")
+    p.add_argument("--project", help="Gán mọi task vào dự án này")
+    p.set_defaults(handler=cmd_tasks_import)
+
+    # ----- progress -----
+    p = sub.add_parser("progress", help="Tiến độ dự án", parents=[common])
+    p.add_argument("project_ids", nargs="*")
+    p.add_argument("--all", action="store_true")
+    p.add_argument("--portfolio", action="store_true", help="Tổng quan mọi dự án (1 lần đếm trên toàn bộ task)")
+    p.set_defaults(handler=cmd_progress)
+
+    # ----- reports -----
+    reports = sub.add_parser("reports", help="Báo cáo").add_subparsers(dest="kind", required=True)
+
+    weekly = reports.add_parser("weekly").add_subparsers(dest="action", required=True)
+    p = weekly.add_parser("generate", help="Lập báo cáo tuần kế tiếp", parents=[common])
+    p.add_argument("--project", action="append", default=[])
+    p.add_argument("--all", action="store_true", help="Mọi dự án chưa kết thúc")
+    p.add_argument("--start", help="dd/mm/yyyy (mặc định: ngày bắt buộc theo tiến độ)")
+    p.add_argument("--end", help="dd/mm/yyyy")
+    p.add_argument("--author", help="Mặc định: PM của dự án")
+    p.set_defaults(handler=cmd_weekly_generate)
+
+    final = reports.add_parser("final").add_subparsers(dest="action", required=True)
+    p = final.add_parser("generate", help="Lập báo cáo tổng kết", parents=[common])
+    p.add_argument("--project", action="append", default=[])
+    p.add_argument("--all", action="store_true", help="Mọi dự án đã kết thúc, chưa có báo cáo")
+    p.add_argument("--author", help="Mặc định: PM của dự án")
+    p.set_defaults(handler=cmd_final_generate)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    args.data_dir = getattr(args, "data_dir", ".")
+    args.atomic = getattr(args, "atomic", False)
+
+    if args.batch:
+        handler = cmd_batch
+    elif args.command:
+        handler = args.handler
+    else:
+        parser.error("cần một lệnh hoặc --batch FILE")
+    if handler in (cmd_weekly_generate, cmd_final_generate) and not (args.all or args.project):
+        parser.error("cần --project hoặc --all")
+
+    # Báo cáo dùng tên file tương đối → chạy trong thư mục dữ liệu
+    os.chdir(args.data_dir)
+    out = sys.stdout
+    started = datetime.now()
+    try:
+        # Thông báo của manager (print) chuyển sang stderr để stdout chỉ có JSON
+        with contextlib.redirect_stdout(sys.stderr):
+            ctx = AppContext()
+            result = handler(ctx, args)
+    except (OSError, ValueError) as e:
+        result = {"ok": False, "error": str(e)}
+
+    result["elapsed_ms"] = round((datetime.now() - started).total_seconds() * 1000, 3)
+    json.dump(result, out, ensure_ascii=False, indent=2, default=str)
+    out.write("\n")
+    return 0 if result.get("ok") else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
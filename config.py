@@ -0,0 +1,50 @@
+# config.py
+"""
+Cấu hình chung của hệ thống (đọc từ biến môi trường)
+"""
+import math
+import os
+import sys
+
+
+def _env_number(name, default, parse, valid=lambda value: True):
+    """Đọc số từ biến môi trường; sai định dạng → cảnh báo và dùng mặc định"""
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return default
+    try:
+        value = parse(raw)
+        if not valid(value):
+            raise ValueError(raw)
+    except ValueError:
+        print(f"[config] {name}={raw!r} không hợp lệ – dùng mặc định {default}", file=sys.stderr)
+        return default
+    return value
+
+
+# Backend lưu trữ cho Staff / Project / Task: "csv" (mặc định) hoặc "sqlite"
+STORAGE_BACKEND = os.environ.get("PM_STORAGE_BACKEND", "csv").strip().lower()
+
+# File database khi dùng backend sqlite
+SQLITE_PATH = os.environ.get("PM_SQLITE_PATH", "project_data.db")
+
+# Snapshot nhị phân cho backend csv (đặt PM_SNAPSHOT_CACHE=0 để tắt)
+SNAPSHOT_CACHE = os.environ.get("PM_SNAPSHOT_CACHE", "1").strip() != "0"
+
+# Task / Project nạp ở chế độ lazy: ngày tháng, ngân sách chỉ giải mã khi được
+# đọc lần đầu (đặt PM_LAZY_ROWS=0 để giải mã hết ngay lúc nạp như cũ)
+LAZY_ROWS = os.environ.get("PM_LAZY_ROWS", "1").strip() != "0"
+
+# Server JSON cục bộ (server.py)
+SERVER_HOST = os.environ.get("PM_SERVER_HOST", "127.0.0.1")
+SERVER_PORT = _env_number("PM_SERVER_PORT", 8765, int, lambda port: 0 <= port <= 65535)
+
+# Ghi trễ (write-behind) cho Staff / Project / Task: số giây giữa 2 lần ghi nền
+# 0 (mặc định) = ghi ngay sau mỗi thao tác như cũ
+WRITE_BEHIND_INTERVAL = _env_number("PM_WRITE_BEHIND", 0.0, float,
+                                    lambda seconds: math.isfinite(seconds) and seconds >= 0)
+
+# Đo đạc thao tác (instrumentation.py): đặt PM_METRICS=<file> để bật
+# File .json → JSON, đuôi khác → Prometheus text; ghi khi thoát chương trình
+# (đường dẫn tuyệt đối – CLI / server còn chdir vào thư mục dữ liệu)
+METRICS_FILE = os.path.abspath(os.environ["PM_METRICS"]) if os.environ.get("PM_METRICS", "").strip() else ""
@@ -0,0 +1,48 @@
+# indexes/deadline_index.py
+from bisect import bisect_left, insort
+
+
+class DeadlineIndex:
+    """
+    Các task còn mở (chưa Completed / Cancelled) sắp theo deadline
+
+    - overdue(now): task có deadline < now → O(log n + k)
+    - due_between(start, end): task hết hạn trong [start, end] → O(log n + k)
+    """
+
+    CLOSED_STATUSES = ("Completed", "Cancelled")
+
+    def __init__(self):
+        self._entries = []  # (deadline, task_id)
+        self._tasks = {}
+
+    def __len__(self):
+        return len(self._tasks)
+
+    # ================= CẬP NHẬT =================
+    def add(self, task):
+        if not task.deadline or task.status_task in self.CLOSED_STATUSES:
+            return
+        self._tasks[task.id] = task
+        insort(self._entries, (task.deadline, task.id))
+
+    def remove(self, task):
+        """Gọi khi task còn giữ deadline / trạng thái cũ (trước khi sửa)"""
+        if self._tasks.pop(task.id, None) is None:
+            return
+        entry = (task.deadline, task.id)
+        i = bisect_left(self._entries, entry)
+        if i < len(self._entries) and self._entries[i] == entry:
+            del self._entries[i]
+
+    # ================= TRUY VẤN =================
+    def overdue(self, now):
+        hi = bisect_left(self._entries, (now,))
+        return [self._tasks[task_id] for _, task_id in self._entries[:hi]]
+
+    def due_between(self, start, end):
+        lo = bisect_left(self._entries, (start,))
+        hi = lo
+        while hi < len(self._entries) and self._entries[hi][0] <= end:
+            hi += 1
+        return [self._tasks[task_id] for _, task_id in self._entries[lo:hi]]
@@ -0,0 +1,238 @@
+# indexes/interval_index.py
+from bisect import bisect_left, insort
+from operator import itemgetter
+
+_start = itemgetter(0)
+_end = itemgetter(1)
+
+
+class _Node:
+    """Nút của cây khoảng (centered interval tree)"""
+    __slots__ = ("center", "by_start", "by_end", "left", "right")
+
+    def __init__(self, center, by_start, by_end, left, right):
+        self.center = center
+        self.by_start = by_start  # các khoảng chứa center, tăng dần theo ngày bắt đầu
+        self.by_end = by_end      # cùng các khoảng đó, tăng dần theo ngày kết thúc
+        self.left = left
+        self.right = right
+
+
+def _build(intervals):
+    # intervals: list (start, end, task_id)
+    if not intervals:
+        return None
+
+    points = sorted(p for iv in intervals for p in (iv[0], iv[1]))
+    center = points[len(points) // 2]
+
+    left, right, mid = [], [], []
+    for iv in intervals:
+        if iv[1] < center:
+            left.append(iv)
+        elif iv[0] > center:
+            right.append(iv)
+        else:
+            mid.append(iv)
+
+    return _Node(
+        center,
+        sorted(mid, key=_start),
+        sorted(mid, key=_end),
+        _build(left),
+        _build(right),
+    )
+
+
+def _insert(root, iv):
+    """Thêm 1 khoảng vào cây đã dựng; trả về (gốc, độ sâu của nút chứa khoảng)"""
+    if root is None:
+        return _Node(iv[0], [iv], [iv], None, None), 1
+    node, depth = root, 1
+    while True:
+        if iv[1] < node.center:
+            if node.left is None:
+                node.left = _Node(iv[0], [iv], [iv], None, None)
+                return root, depth + 1
+            node = node.left
+        elif iv[0] > node.center:
+            if node.right is None:
+                node.right = _Node(iv[0], [iv], [iv], None, None)
+                return root, depth + 1
+            node = node.right
+        else:
+            insort(node.by_start, iv, key=_start)
+            insort(node.by_end, iv, key=_end)
+            return root, depth
+        depth += 1
+
+
+def _delete(root, iv):
+    """Gỡ 1 khoảng khỏi cây (nút rỗng giữ lại, lần dựng lại sau sẽ bỏ)"""
+    node = root
+    while node is not None:
+        if iv[1] < node.center:
+            node = node.left
+        elif iv[0] > node.center:
+            node = node.right
+        else:
+            _remove_sorted(node.by_start, iv, _start)
+            _remove_sorted(node.by_end, iv, _end)
+            return
+
+
+def _remove_sorted(items, entry, key):
+    i = bisect_left(items, key(entry), key=key)
+    while i < len(items) and key(items[i]) == key(entry):
+        if items[i] == entry:
+            del items[i]
+            return
+        i += 1
+
+
+class _DayBuckets:
+    """
+    Ngày → các task_id, kèm danh sách các ngày khác nhau (tăng dần)
+    Thêm / xóa chỉ chèn vào danh sách ngày (số ngày khác nhau nhỏ hơn nhiều số task)
+    """
+    __slots__ = ("days", "ids")
+
+    def __init__(self):
+        self.days = []
+        self.ids = {}
+
+    def add(self, day, task_id):
+        bucket = self.ids.get(day)
+        if bucket is None:
+            bucket = self.ids[day] = {}
+            insort(self.days, day)
+        bucket[task_id] = None
+
+    def discard(self, day, task_id):
+        bucket = self.ids.get(day)
+        if bucket is None:
+            return
+        bucket.pop(task_id, None)
+        if not bucket:
+            del self.ids[day]
+            i = bisect_left(self.days, day)
+            del self.days[i]
+
+    def between(self, start, end):
+        for i in range(bisect_left(self.days, start), len(self.days)):
+            day = self.days[i]
+            if day > end:
+                break
+            yield from self.ids[day]
+
+
+class IntervalIndex:
+    """
+    Index theo khoảng ngày [start_date, deadline] của task
+
+    - tasks_overlapping(s, e): task có khoảng giao với [s, e]
+      (bắt đầu trong kỳ, hết hạn trong kỳ, hoặc kéo dài qua cả kỳ)
+    - tasks_starting_or_due(s, e): task bắt đầu hoặc hết hạn trong [s, e]
+
+    Ngày bắt đầu / deadline được gom theo ngày (bisect trên các ngày khác nhau).
+    Cây khoảng dựng ở truy vấn overlap đầu tiên, sau đó thêm / xóa cập nhật
+    thẳng vào cây; chỉ dựng lại khi cây bị lệch quá sâu.
+    Cả hai truy vấn đều O(log n + k).
+    """
+
+    def __init__(self):
+        self._tasks = {}
+        self._starts = _DayBuckets()
+        self._ends = _DayBuckets()
+        self._point_only = set()  # task thiếu ngày hoặc start > deadline → không vào cây
+        self._tree = None
+        self._dirty = True
+
+    def __len__(self):
+        return len(self._tasks)
+
+    # ================= CẬP NHẬT =================
+    def add(self, task):
+        self._tasks[task.id] = task
+        if task.start_date:
+            self._starts.add(task.start_date, task.id)
+        if task.deadline:
+            self._ends.add(task.deadline, task.id)
+        if not self._is_interval(task):
+            self._point_only.add(task.id)
+        elif not self._dirty:
+            self._tree, depth = _insert(self._tree, (task.start_date, task.deadline, task.id))
+            # Cây lệch (thêm nhiều khoảng về 1 phía) → dựng lại ở truy vấn kế tiếp
+            if depth > 2 * len(self._tasks).bit_length() + 8:
+                self._dirty = True
+
+    def remove(self, task):
+        """Gọi khi task còn giữ ngày cũ (trước khi sửa)"""
+        if self._tasks.pop(task.id, None) is None:
+            return
+        if task.start_date:
+            self._starts.discard(task.start_date, task.id)
+        if task.deadline:
+            self._ends.discard(task.deadline, task.id)
+        if task.id in self._point_only:
+            self._point_only.discard(task.id)
+        elif not self._dirty:
+            _delete(self._tree, (task.start_date, task.deadline, task.id))
+
+    @staticmethod
+    def _is_interval(task):
+        return bool(task.start_date and task.deadline and task.start_date <= task.deadline)
+
+    # ================= TRUY VẤN =================
+    def tasks_starting_or_due(self, start, end):
+        ids = dict.fromkeys(self._starts.between(start, end))
+        ids.update(dict.fromkeys(self._ends.between(start, end)))
+        return self._ordered(ids)
+
+    def tasks_overlapping(self, start, end):
+        if self._dirty:
+            self._tree = _build([
+                (t.start_date, t.deadline, t.id)
+                for t in self._tasks.values() if self._is_interval(t)
+            ])
+            self._dirty = False
+
+        ids = {}
+        self._query(self._tree, start, end, ids)
+
+        # Task chỉ có 1 ngày (hoặc dữ liệu lỗi start > deadline): so từng mốc ngày
+        if self._point_only:
+            for task_id in self._starts.between(start, end):
+                if task_id in self._point_only:
+                    ids[task_id] = None
+            for task_id in self._ends.between(start, end):
+                if task_id in self._point_only:
+                    ids[task_id] = None
+
+        return self._ordered(ids)
+
+    def _query(self, node, start, end, out):
+        while node is not None:
+            if end < node.center:
+                for iv in node.by_start:
+                    if iv[0] > end:
+                        break
+                    out[iv[2]] = None
+                node = node.left
+            elif start > node.center:
+                for iv in reversed(node.by_end):
+                    if iv[1] < start:
+                        break
+                    out[iv[2]] = None
+                node = node.right
+            else:
+                for iv in node.by_start:
+                    out[iv[2]] = None
+                self._query(node.left, start, end, out)
+                node = node.right
+
+    def _ordered(self, ids):
+        # Sắp xếp theo ngày bắt đầu (hoặc deadline) để kết quả ổn định
+        tasks = [self._tasks[task_id] for task_id in ids]
+        tasks.sort(key=lambda t: (t.start_date or t.deadline, t.id))
+        return tasks
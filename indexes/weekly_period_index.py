@@ -0,0 +1,98 @@
+# indexes/weekly_period_index.py
+import re
+from datetime import timedelta
+
+from models.date_codec import parse_iso
+
+
+class WeeklyPeriodIndex:
+    """
+    Chuỗi báo cáo tuần của từng dự án
+
+    project_id -> (period_end mới nhất, số tuần lớn nhất, tập mã báo cáo)
+
+    - next_start(pid): ngày bắt đầu bắt buộc của tuần kế tiếp → O(1)
+    - contains(report_id): kiểm tra trùng mã → O(1)
+    - suggest_id(pid): mã WR<pid>_Wxx gợi ý cho tuần kế tiếp → O(1)
+    """
+
+    WEEK_PATTERN = re.compile(r"_W(\d+)$")
+
+    def __init__(self):
+        # project_id -> {"last_end": datetime | None, "last_week": int, "ids": {report_id: (period_end, week)}}
+        self._projects = {}
+        # report_id -> project_id
+        self._owner = {}
+
+    @classmethod
+    def from_rows(cls, rows):
+        index = cls()
+        for row in rows:
+            index.add(row["report_id"], row["project_id"], row.get("period_end", ""))
+        return index
+
+    def __len__(self):
+        return len(self._owner)
+
+    # ================= CẬP NHẬT =================
+    def add(self, report_id, project_id, period_end):
+        """period_end: datetime hoặc chuỗi yyyy-mm-dd như trong CSV"""
+        if isinstance(period_end, str):
+            try:
+                period_end = parse_iso(period_end)
+            except ValueError:
+                period_end = None
+        week = self._week_of(report_id)
+
+        self.remove(report_id)
+        entry = self._projects.setdefault(
+            project_id, {"last_end": None, "last_week": 0, "ids": {}}
+        )
+        entry["ids"][report_id] = (period_end, week)
+        self._owner[report_id] = project_id
+
+        if period_end and (entry["last_end"] is None or period_end > entry["last_end"]):
+            entry["last_end"] = period_end
+        entry["last_week"] = max(entry["last_week"], week)
+
+    def remove(self, report_id):
+        project_id = self._owner.pop(report_id, None)
+        if project_id is None:
+            return
+        entry = self._projects[project_id]
+        period_end, week = entry["ids"].pop(report_id)
+
+        if not entry["ids"]:
+            del self._projects[project_id]
+            return
+        # Chỉ tính lại khi xóa đúng tuần mới nhất (duyệt các báo cáo của 1 dự án)
+        if period_end is not None and period_end == entry["last_end"]:
+            ends = [e for e, _ in entry["ids"].values() if e is not None]
+            entry["last_end"] = max(ends, default=None)
+        if week == entry["last_week"]:
+            entry["last_week"] = max(w for _, w in entry["ids"].values())
+
+    # ================= TRUY VẤN =================
+    def contains(self, report_id):
+        return report_id in self._owner
+
+    def has_reports(self, project_id):
+        return project_id in self._projects
+
+    def last_period_end(self, project_id):
+        entry = self._projects.get(project_id)
+        return entry["last_end"] if entry else None
+
+    def next_start(self, project_id):
+        """Ngày bắt đầu tuần kế tiếp, None nếu dự án chưa có báo cáo nào"""
+        last_end = self.last_period_end(project_id)
+        return last_end + timedelta(days=1) if last_end else None
+
+    def suggest_id(self, project_id):
+        entry = self._projects.get(project_id)
+        week = entry["last_week"] + 1 if entry else 1
+        return f"WR{project_id}_W{week:02d}"
+
+    def _week_of(self, report_id):
+        match = self.WEEK_PATTERN.search(report_id or "")
+        return int(match.group(1)) if match else 0
@@ -0,0 +1,263 @@
+# instrumentation.py
+"""
+Đo đạc từng thao tác (bật bằng biến môi trường PM_METRICS=<file>)
+
+- Số lần gọi + histogram thời gian cho mọi phương thức public của các manager
+  và các hàm đọc / ghi tĩnh của BaseReport
+- Số dòng đã duyệt, số byte đọc / ghi – cộng dồn cho các phương thức đang chạy
+- Khi thoát chương trình ghi ra <file>: .json → JSON, còn lại → Prometheus text
+
+Tắt (mặc định) → install() không làm gì, record_*() trả về ngay.
+"""
+import atexit
+import functools
+import inspect
+import json
+import threading
+import time
+
+import config
+
+ENABLED = False
+
+# Mốc histogram (giây)
+BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# Thao tác I/O không nằm trong phương thức nào (thread ghi nền, nạp lúc khởi tạo...)
+NO_METHOD = "(none)"
+
+_lock = threading.Lock()
+_local = threading.local()
+_stats = {}
+
+
+class _Stat:
+    __slots__ = ("calls", "errors", "seconds", "buckets", "rows", "bytes_read", "bytes_written")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.rows = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "seconds_total": round(self.seconds, 6),
+            "histogram": {
+                **{str(le): n for le, n in zip(BUCKETS, self.buckets)},
+                "+Inf": self.buckets[-1],
+            },
+            "rows_scanned": self.rows,
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+        }
+
+
+def _stat(name):
+    stat = _stats.get(name)
+    if stat is None:
+        stat = _stats[name] = _Stat()
+    return stat
+
+
+def _active():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+# ================= GHI NHẬN =================
+def _add(field, n):
+    if not ENABLED or not n:
+        return
+    # Cộng cho mọi phương thức đang chạy trên thread này (tính cả phần gọi lồng)
+    names = set(_active()) or {NO_METHOD}
+    with _lock:
+        for name in names:
+            stat = _stat(name)
+            setattr(stat, field, getattr(stat, field) + n)
+
+
+def record_rows(n):
+    _add("rows", n)
+
+
+def record_bytes_read(n):
+    _add("bytes_read", n)
+
+
+def record_bytes_written(n):
+    _add("bytes_written", n)
+
+
+def _observe(name, elapsed, failed):
+    i = 0
+    while i < len(BUCKETS) and elapsed > BUCKETS[i]:
+        i += 1
+    with _lock:
+        stat = _stat(name)
+        stat.calls += 1
+        stat.errors += failed
+        stat.seconds += elapsed
+        stat.buckets[i] += 1
+
+
+# ================= BỌC PHƯƠNG THỨC =================
+def _wrap(func, owner, bound):
+    """bound=True: tên theo class thực của self (TaskManager.find_by_id, ProjectManager.find_by_id...)"""
+    label = f"{owner}.{func.__name__}"
+
+    def name_of(args):
+        return f"{type(args[0]).__name__}.{func.__name__}" if bound and args else label
+
+    if inspect.isgeneratorfunction(func):
+        @functools.wraps(func)
+        def gen_wrapper(*args, **kwargs):
+            name = name_of(args)
+            stack = _active()
+            start = time.perf_counter()
+            failed = False
+            gen = func(*args, **kwargs)
+            try:
+                while True:
+                    # Chỉ tính thời gian / I/O khi generator thật sự chạy
+                    stack.append(name)
+                    try:
+                        item = next(gen)
+                    except StopIteration:
+                        return
+                    finally:
+                        stack.pop()
+                    yield item
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                gen.close()
+                _observe(name, time.perf_counter() - start, failed)
+        gen_wrapper.__instrumented__ = True
+        return gen_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        name = name_of(args)
+        stack = _active()
+        if stack and stack[-1] == name:
+            # super().method() của lớp con cũng đã được bọc → không đếm 2 lần
+            return func(*args, **kwargs)
+        stack.append(name)
+        start = time.perf_counter()
+        failed = False
+        try:
+            return func(*args, **kwargs)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            stack.pop()
+            _observe(name, time.perf_counter() - start, failed)
+    wrapper.__instrumented__ = True
+    return wrapper
+
+
+def instrument_class(cls, names=None):
+    """Bọc các phương thức public (hoặc đúng các tên trong names) định nghĩa trên cls"""
+    for attr, value in list(vars(cls).items()):
+        if names is not None and attr not in names:
+            continue
+        if names is None and attr.startswith("_"):
+            continue
+        if isinstance(value, staticmethod):
+            func = value.__func__
+            if not getattr(func, "__instrumented__", False):
+                setattr(cls, attr, staticmethod(_wrap(func, cls.__name__, bound=False)))
+        elif isinstance(value, classmethod):
+            func = value.__func__
+            if not getattr(func, "__instrumented__", False):
+                setattr(cls, attr, classmethod(_wrap(func, cls.__name__, bound=False)))
+        elif inspect.isfunction(value) and not getattr(value, "__instrumented__", False):
+            setattr(cls, attr, _wrap(value, cls.__name__, bound=True))
+
+
+def install():
+    """Bật đo đạc nếu có PM_METRICS – gọi nhiều lần cũng chỉ cài 1 lần"""
+    global ENABLED
+    if ENABLED or not config.METRICS_FILE:
+        return False
+
+    from managers.ProjectItem_manager import ProjectItemManager
+    from managers.staff_manager import StaffManager
+    from managers.task_manager import TaskManager
+    from managers.project_manager import ProjectManager
+    from managers.weekly_report_manager import WeeklyReportManager
+    from managers.final_report_manager import FinalReportManager
+    from reports.base_report import BaseReport
+
+    # Phương thức kế thừa (find_by_id, add_item...) bọc ở lớp cha, tên lấy theo lớp con
+    for cls in (ProjectItemManager, StaffManager, TaskManager, ProjectManager,
+                WeeklyReportManager, FinalReportManager):
+        instrument_class(cls)
+    instrument_class(BaseReport, names={
+        "load_from_csv", "save_to_csv", "read_header", "iter_rows", "iter_matching",
+        "iter_by_project", "update_item", "delete_item", "search_item", "add_item",
+    })
+
+    ENABLED = True
+    atexit.register(dump, config.METRICS_FILE)
+    return True
+
+
+# ================= XUẤT KẾT QUẢ =================
+def snapshot():
+    with _lock:
+        return {name: stat.as_dict() for name, stat in sorted(_stats.items())}
+
+
+def to_prometheus(data):
+    lines = []
+
+    def metric(name, kind, help_text):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    metric("pm_method_calls_total", "counter", "So lan goi phuong thuc")
+    for method, s in data.items():
+        lines.append(f'pm_method_calls_total{{method="{method}"}} {s["calls"]}')
+
+    metric("pm_method_errors_total", "counter", "So lan phuong thuc nem exception")
+    for method, s in data.items():
+        lines.append(f'pm_method_errors_total{{method="{method}"}} {s["errors"]}')
+
+    metric("pm_method_seconds", "histogram", "Thoi gian chay phuong thuc (giay)")
+    for method, s in data.items():
+        cumulative = 0
+        for le, n in s["histogram"].items():
+            cumulative += n
+            lines.append(f'pm_method_seconds_bucket{{method="{method}",le="{le}"}} {cumulative}')
+        lines.append(f'pm_method_seconds_sum{{method="{method}"}} {s["seconds_total"]}')
+        lines.append(f'pm_method_seconds_count{{method="{method}"}} {s["calls"]}')
+
+    for key, help_text in (("rows_scanned", "So dong da duyet"),
+                           ("bytes_read", "So byte doc tu file"),
+                           ("bytes_written", "So byte ghi ra file")):
+        name = f"pm_{key}_total"
+        metric(name, "counter", help_text)
+        for method, s in data.items():
+            lines.append(f'{name}{{method="{method}"}} {s[key]}')
+
+    return "\n".join(lines) + "\n"
+
+
+def dump(path):
+    data = snapshot()
+    with open(path, "w", encoding="utf-8") as f:
+        if path.lower().endswith(".json"):
+            json.dump({"generated_at": time.time(), "methods": data}, f, ensure_ascii=False, indent=2)
+        else:
+            f.write(to_prometheus(data))
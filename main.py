@@ -1,9 +1,4 @@
-from managers.staff_manager import StaffManager
-from managers.project_manager import ProjectManager
-from managers.task_manager import TaskManager
-from managers.weekly_report_manager import WeeklyReportManager
-from managers.final_report_manager import FinalReportManager
-from models.progress import Progress
+from app_context import AppContext
 
 
 def staff_menu(staff_manager):
@@ -74,6 +69,7 @@ def task_menu(task_manager):
         print("4. Tìm kiếm task")
         print("5. Hiển thị danh sách task")
         print("6. Kiểm tra task quá hạn")
+        print("7. Task sắp đến hạn")
         print("0. Quay lại")
 
         choice = input("Chọn chức năng: ").strip()
@@ -90,22 +86,29 @@ def task_menu(task_manager):
             task_manager.display_all_tasks()
         elif choice == "6":
             task_manager.display_overdue_tasks()
+        elif choice == "7":
+            task_manager.display_due_soon_tasks()
         elif choice == "0":
             break
         else:
             print("Lựa chọn không hợp lệ.")
 
 
-def progress_menu(project_manager, task_manager):
+def progress_menu(progress_service):
     print("\n--- KIỂM TRA TIẾN ĐỘ DỰ ÁN ---")
-    progress = Progress(
-        project_list=project_manager.items, 
-        all_tasks=task_manager.items
-    )
+    while True:
+        pid = input("Nhập mã dự án để tính tiến độ: ").strip()
+        try:
+            progress = progress_service.compute(pid)
+            break
+        except ValueError:
+            print("Dự án không tồn tại. Nhập lại.")
     progress.display_summary_with_tasks()
 
 
-def report_menu(weekly_manager, final_manager, project_manager, staff_manager, task_manager):
+def report_menu(ctx):
+    # Manager báo cáo (và module reports) chỉ được tạo / import khi mở menu con;
+    # dự án / nhân viên / task chỉ được nạp khi tạo hoặc xem chi tiết báo cáo
     while True:
         print("\n--- QUẢN LÝ BÁO CÁO ---")
         print("1. Báo cáo tuần (Weekly Report)")
@@ -116,6 +119,7 @@ def report_menu(weekly_manager, final_manager, project_manager, staff_manager, t
 
         # ===== MENU BÁO CÁO TUẦN =====
         if choice == "1":
+            weekly_manager = ctx.weekly_report_manager
             while True:
                 print("\n--- BÁO CÁO TUẦN ---")
                 print("1. Tạo báo cáo tuần mới")
@@ -128,9 +132,9 @@ def report_menu(weekly_manager, final_manager, project_manager, staff_manager, t
                 c = input("Chọn chức năng: ").strip()
                 
                 if c == "1":
-                    weekly_manager.create_report(project_manager, staff_manager, task_manager)
+                    weekly_manager.create_report(ctx.project_manager, ctx.staff_manager, ctx.task_manager)
                 elif c == "2":
-                    weekly_manager.view_report_detail(project_manager, staff_manager, task_manager)
+                    weekly_manager.view_report_detail(ctx.project_manager, ctx.staff_manager, ctx.task_manager)
                 elif c == "3":
                     weekly_manager.search_report()
                 elif c == "4":
@@ -144,6 +148,7 @@ def report_menu(weekly_manager, final_manager, project_manager, staff_manager, t
 
         # ===== MENU BÁO CÁO TỔNG KẾT =====
         elif choice == "2":
+            final_manager = ctx.final_report_manager
             while True:
                 print("\n--- BÁO CÁO TỔNG KẾT ---")
                 print("1. Tạo báo cáo tổng kết mới")
@@ -156,9 +161,9 @@ def report_menu(weekly_manager, final_manager, project_manager, staff_manager, t
                 c = input("Chọn chức năng: ").strip()
                 
                 if c == "1":
-                    final_manager.create_report(project_manager, staff_manager, task_manager)
+                    final_manager.create_report(ctx.project_manager, ctx.staff_manager, ctx.task_manager)
                 elif c == "2":
-                    final_manager.view_report_detail(project_manager, staff_manager, task_manager)
+                    final_manager.view_report_detail(ctx.project_manager, ctx.staff_manager, ctx.task_manager)
                 elif c == "3":
                     final_manager.search_report()
                 elif c == "4":
@@ -177,41 +182,15 @@ def report_menu(weekly_manager, final_manager, project_manager, staff_manager, t
 
 
 def main():
-    # 1. Khởi tạo StaffManager
-    staff_manager = StaffManager("staff.csv")
-
-    # 2. Khởi tạo TaskManager (TRUYỀN staff_manager VÀO)
-    # Lúc này TaskManager đã biết StaffManager là ai
-    task_manager = TaskManager(
-        filename="tasks.csv", 
-        staff_manager=staff_manager
-    )
-
-    # 3. Khởi tạo ProjectManager
-    project_manager = ProjectManager(
-        "projects.csv",
-        staff_manager=staff_manager,
-        task_manager=task_manager
-    )
-
-    # =========================================================================
-    # BƯỚC KẾT NỐI QUAN TRỌNG (DEPENDENCY INJECTION)
-    # =========================================================================
-    
-    # 4.1. Cập nhật project_manager cho task_manager (như cũ)
-    # Để TaskManager validate ngày tháng dựa trên Project
-    task_manager.project_manager = project_manager
-
-    # 4.2. [MỚI THÊM] Cập nhật task_manager cho staff_manager
-    # Để khi xóa Staff -> StaffManager gọi sang TaskManager để unassign task
-    # (Lưu ý: Bạn phải chắc chắn đã thêm hàm set_task_manager vào class StaffManager rồi nhé)
-    staff_manager.set_task_manager(task_manager)
-
-    # =========================================================================
-
-    # 5. Khởi tạo các manager báo cáo
-    weekly_report_manager = WeeklyReportManager("weekly_reports.csv")
-    final_report_manager = FinalReportManager("final_reports.csv")
+    # 1. AppContext: bật đo đạc (PM_METRICS), manager / service tạo khi dùng lần đầu
+    #    - StaffManager, TaskManager, ProjectManager nối với nhau qua Deferred
+    #      (task_manager.project_manager, staff_manager.set_task_manager...)
+    #    → menu chính hiện ra ngay, file CSV chỉ được nạp khi chức năng cần tới
+    ctx = AppContext()
+
+    # 2. Ghi trễ (bật bằng PM_WRITE_BEHIND=<giây>) – thao tác không phải chờ ghi file
+    write_behind = ctx.start_write_behind()
+
     while True:
         print("\n===== HỆ THỐNG QUẢN LÝ DỰ ÁN =====")
         print("1. Quản lý nhân viên")
@@ -224,23 +203,18 @@ def main():
         choice = input("Chọn chức năng: ").strip()
 
         if choice == "1":
-            staff_menu(staff_manager)
+            staff_menu(ctx.staff_manager)
         elif choice == "2":
-            project_menu(project_manager)
+            project_menu(ctx.project_manager)
         elif choice == "3":
-            task_menu(task_manager)
+            task_menu(ctx.task_manager)
         elif choice == "4":
-            progress_menu(project_manager, task_manager)
+            progress_menu(ctx.progress_service)
         elif choice == "5":
-            # Truyền tất cả Manager cần thiết vào report_menu
-            report_menu(
-                weekly_report_manager, 
-                final_report_manager, 
-                project_manager, 
-                staff_manager, 
-                task_manager
-            )
+            report_menu(ctx)
         elif choice == "0":
+            if write_behind:
+                write_behind.stop()
             print("Đã thoát chương trình.")
             break
         else:
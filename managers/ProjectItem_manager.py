@@ -1,87 +1,193 @@
-import csv
+from contextlib import contextmanager
 from datetime import datetime
+from models.date_codec import parse_dmy
+import config
+import instrumentation
+from storage.factory import create_storage
 
 
 class ProjectItemManager:
-    def __init__(self, filename, cls, fieldnames, id_field="id"):
+    def __init__(self, filename, cls, fieldnames, id_field="id",
+                 storage_indexes=(), dmy_date_fields=()):
         self.filename = filename
         self.cls = cls
         self.fieldnames = fieldnames
         self.id_field = id_field
+        # Backend lưu trữ (CSV + journal hoặc SQLite) – chọn theo config.py
+        self.storage = create_storage(
+            filename, fieldnames, id_field,
+            indexes=storage_indexes,
+            dmy_date_fields=dmy_date_fields,
+        )
+        self.unit_of_work = None
         self.items = []
+        # Index ID -> object để find_by_id là O(1)
+        self._by_id = {}
+        # Vị trí của object trong items (theo id(obj)) để _remove là O(1)
+        self._pos = {}
         self.load_from_file()
 
+    def _key(self, obj):
+        """Lấy ID của object (Task lưu ID ở .id, Project ở .project_id)"""
+        return getattr(obj, self.id_field, None) or getattr(obj, "id", "")
+
     # ================= FILE =================
+    @property
+    def _from_row(self):
+        # Chế độ lazy: chỉ giải mã ngày / số khi thuộc tính được đọc lần đầu
+        if config.LAZY_ROWS and hasattr(self.cls, "from_dict_lazy"):
+            return self.cls.from_dict_lazy
+        return self.cls.from_dict
+
     def load_from_file(self):
-        self.items = []
-        try:
-            with open(self.filename, "r", encoding="utf-8", newline="") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    obj = self.cls.from_dict(row)
-                    self.items.append(obj)
-        except FileNotFoundError:
-            pass
+        self.items = self.storage.load_objects(self._from_row, self._key)
+        self._rebuild_indexes()
+        self._compact_if_needed()
 
     def save_to_file(self):
-        with open(self.filename, "w", encoding="utf-8", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=self.fieldnames)
-            writer.writeheader()
-            for obj in self.items:
-                writer.writerow(obj.to_dict())  # <- sửa ở đây
+        """Ghi lại toàn bộ dữ liệu (với CSV: gộp luôn journal vào file gốc)"""
+        if self.unit_of_work:
+            self.unit_of_work.stage_full_save(self)
+            return
+        self._write_all()
+
+    def _write_all(self):
+        self.storage.save_all(self._all_rows())
+
+    def _all_rows(self):
+        return [self._to_row(obj) for obj in self.items]
+
+    def _to_row(self, obj):
+        return obj.to_dict()
+
+    # Mỗi thay đổi chỉ ghi đúng các dòng liên quan (journal / UPSERT SQLite).
+    # Đang trong UnitOfWork → chỉ ghi nhận, ghi file 1 lần khi commit.
+    def _log_upsert(self, *objs):
+        if self.unit_of_work:
+            self.unit_of_work.stage_upsert(self, objs)
+            return
+        self.storage.apply([self._to_row(obj) for obj in objs], ())
+        self._compact_if_needed()
+
+    def _log_delete(self, *item_ids):
+        if self.unit_of_work:
+            self.unit_of_work.stage_delete(self, item_ids)
+            return
+        self.storage.apply((), item_ids)
+        self._compact_if_needed()
+
+    def _compact_if_needed(self):
+        if self.storage.needs_compaction():
+            self._write_all()
+
+    def compact(self):
+        """Gộp journal vào CSV gốc"""
+        self._write_all()
+
+    # ================= INDEX =================
+    # Mọi thay đổi danh sách items phải đi qua _insert / _remove / _updating
+    # để các index luôn khớp với dữ liệu.
+    def _rebuild_indexes(self):
+        self._by_id = {}
+        self._pos = {id(obj): i for i, obj in enumerate(self.items)}
+        for obj in self.items:
+            self._index_item(obj)
+
+    def _index_item(self, obj):
+        """Thêm obj vào các index (lớp con mở rộng cho index phụ)"""
+        self._by_id[self._key(obj)] = obj
 
+    def _unindex_item(self, obj):
+        """Gỡ obj khỏi các index (gọi khi obj còn giữ giá trị cũ)"""
+        if self._by_id.get(self._key(obj)) is obj:
+            del self._by_id[self._key(obj)]
+
+    def _insert(self, obj):
+        self._pos[id(obj)] = len(self.items)
+        self.items.append(obj)
+        self._index_item(obj)
+
+    def _remove(self, obj):
+        self._unindex_item(obj)
+        # Dời phần tử cuối vào chỗ bị xóa thay vì list.remove (O(n))
+        pos = self._pos.pop(id(obj))
+        last = self.items.pop()
+        if last is not obj:
+            self.items[pos] = last
+            self._pos[id(last)] = pos
+
+    @contextmanager
+    def _updating(self, obj):
+        """
+        Bọc đoạn code sửa obj: gỡ khỏi index trước, thêm lại sau khi sửa
+        (kể cả khi đổi ID – dòng với ID cũ bị xóa khỏi file)
+        """
+        old_key = self._key(obj)
+        self._unindex_item(obj)
+        try:
+            yield obj
+        finally:
+            self._index_item(obj)
+            if self._key(obj) != old_key:
+                self._log_delete(old_key)
+
+    def find_by_id(self, item_id):
+        return self._by_id.get(item_id)
 
     # ================= CRUD =================
     # Thêm item
     def add_item(self, obj):
-        if any(getattr(x, self.id_field) == getattr(obj, self.id_field) for x in self.items):
+        if self._key(obj) in self._by_id:
             print("ID đã tồn tại")
             return False
-        self.items.append(obj)
-        self.save_to_file()
+        self._insert(obj)
+        self._log_upsert(obj)
         print("Thêm thành công")
         return True
     # Sửa item
     def update_item(self, item_id):
-        for obj in self.items:
-            if getattr(obj, self.id_field) == item_id:
-                print("Nhập thông tin mới (Enter để giữ nguyên):")
+        obj = self.find_by_id(item_id)
+        if not obj:
+            print("Không tìm thấy")
+            return False
 
-                for field in self.fieldnames:
-                    if field == self.id_field:
-                        continue
-                    old_val = getattr(obj, field)
-                    new_val = input(f"{field} ({old_val}): ").strip()
-                    if not new_val:
+        print("Nhập thông tin mới (Enter để giữ nguyên):")
+
+        with self._updating(obj):
+            for field in self.fieldnames:
+                if field == self.id_field:
+                    continue
+                old_val = getattr(obj, field)
+                new_val = input(f"{field} ({old_val}): ").strip()
+                if not new_val:
+                    continue
+                # format ngày nếu là datetime
+                if isinstance(old_val, datetime):
+                    try:
+                        new_val = parse_dmy(new_val)
+                    except ValueError:
+                        print(f"Sai định dạng ngày ở {field}")
                         continue
-                    # format ngày nếu là datetime
-                    if isinstance(old_val, datetime):
-                        try:
-                            new_val = datetime.strptime(new_val, "%d/%m/%Y")
-                        except ValueError:
-                            print(f"Sai định dạng ngày ở {field}")
-                            continue
-
-                    setattr(obj, field, new_val)
-
-                self.save_to_file()
-                print("Cập nhật thành công")
-                return True
-        print("Không tìm thấy")
-        return False
+
+                setattr(obj, field, new_val)
+
+        self._log_upsert(obj)
+        print("Cập nhật thành công")
+        return True
     # Xóa item
     def delete_item(self, item_id):
-        for obj in self.items:
-            if getattr(obj, self.id_field) == item_id:
-                self.items.remove(obj)
-                self.save_to_file()
-                print("Đã xóa")
-                return True
-        print("Không tìm thấy")
-        return False
+        obj = self.find_by_id(item_id)
+        if not obj:
+            print("Không tìm thấy")
+            return False
+        self._remove(obj)
+        self._log_delete(item_id)
+        print("Đã xóa")
+        return True
     # Tìm kiếm item
     def search_item(self, keyword):
         keyword = keyword.lower()
+        instrumentation.record_rows(len(self.items))
         return [
             obj for obj in self.items
             if any(keyword in str(v).lower() for v in obj.to_dict().values())
@@ -0,0 +1,42 @@
+# managers/dependency.py
+"""
+Manager phụ thuộc được nối khi cần (TaskManager.project_manager, StaffManager.task_manager...)
+
+    class TaskManager(ProjectItemManager):
+        project_manager = Dependency()
+
+    task_manager.project_manager = project_manager                         # nối ngay
+    task_manager.project_manager = Deferred(lambda: ctx.project_manager)   # nối khi dùng
+
+- Gán Deferred(hàm): hàm chỉ được gọi ở lần đọc đầu tiên (manager kia được tạo /
+  nạp file lúc đó), kết quả được giữ lại cho các lần sau
+- Chưa gán → None
+"""
+
+
+class Deferred:
+    __slots__ = ("factory",)
+
+    def __init__(self, factory):
+        self.factory = factory
+
+
+class Dependency:
+    def __set_name__(self, owner, name):
+        self.attr = "_" + name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = obj.__dict__.get(self.attr)
+        if isinstance(value, Deferred):
+            value = value.factory()
+            obj.__dict__[self.attr] = value
+        return value
+
+    def __set__(self, obj, value):
+        obj.__dict__[self.attr] = value
+
+    def is_set(self, obj):
+        """Đã nối (ngay hoặc trễ) chưa – không kích hoạt việc tạo manager"""
+        return obj.__dict__.get(self.attr) is not None
@@ -1,11 +1,15 @@
-import csv
-from datetime import datetime
+from itertools import chain
+from reports.base_report import BaseReport
 from reports.final_report import FinalReport
+from reports.report_index import ReportIndex
+from services.report_service import FinalReportService
 
 
 class FinalReportManager:
     def __init__(self, filename="final_reports.csv"):
         self.filename = filename
+        # Index report_id / project_id -> vị trí dòng trong file CSV
+        self.index = ReportIndex(filename)
 
     # ======================================================
     # CREATE FINAL REPORT
@@ -59,20 +63,9 @@ class FinalReportManager:
 
         # ===== 4. TẠO BÁO CÁO =====
         try:
-            report = FinalReport(
-                project_id=project.project_id,
-                report_id=rid,
-                author_id=author.staff_id,
-                report_date=datetime.now(),
-                is_loading=False
-            )
-
-            # Nạp dữ liệu + validate
-            report.input_info(
-                project_manager=project_manager,
-                task_manager=task_manager,
-                staff_manager=staff_manager
-            )
+            # Nạp dữ liệu + validate (qua service)
+            service = FinalReportService(self, project_manager, staff_manager, task_manager)
+            report = service.generate(project.project_id, author.staff_id, rid, save=False)
 
             report.display_info()
 
@@ -93,10 +86,7 @@ class FinalReportManager:
         print("\n--- XEM BÁO CÁO TỔNG KẾT ---")
         rid = input("Nhập mã báo cáo: ").strip()
 
-        data = next(
-            (r for r in self._load_all() if r["report_id"] == rid),
-            None
-        )
+        data = self.index.get(rid)
 
         if not data:
             print("Không tìm thấy báo cáo.")
@@ -113,37 +103,34 @@ class FinalReportManager:
         if not keyword:
             return
 
-        results = [
-            r for r in self._load_all()
-            if keyword in r["report_id"].lower()
-            or keyword in r["project_id"].lower()
-        ]
+        results = BaseReport.search_item(self.filename, keyword)
+        first = next(results, None)
 
-        if not results:
+        if first is None:
             print("Không có báo cáo phù hợp.")
             return
 
-        self._display_table(results)
+        self._display_table(chain([first], results))
 
     # ======================================================
     # DISPLAY ALL
     # ======================================================
     def display_all(self):
-        data = self._load_all()
-        if not data:
+        rows = BaseReport.iter_rows(self.filename)
+        first = next(rows, None)
+        if first is None:
             print("Chưa có báo cáo tổng kết.")
             return
 
-        self._display_table(data)
+        self._display_table(chain([first], rows))
 
     # ======================================================
     # DELETE
     # ======================================================
     def delete_report(self):
         rid = input("Nhập mã báo cáo cần xóa: ").strip()
-        data = self._load_all()
-
-        if not any(r["report_id"] == rid for r in data):
+        # Có index → tra thẳng, không cần duyệt file
+        if self.index.get(rid) is None:
             print("Không tìm thấy báo cáo.")
             return
 
@@ -151,25 +138,13 @@ class FinalReportManager:
         if confirm != "y":
             return
 
-        updated = [r for r in data if r["report_id"] != rid]
-
-        with open(self.filename, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=FinalReport.csv_fields())
-            writer.writeheader()
-            writer.writerows(updated)
-
+        # Ghi lại file theo kiểu stream (đọc 1 dòng – ghi 1 dòng)
+        BaseReport.delete_item(self.filename, rid)
         print("Đã xóa báo cáo.")
 
     # ======================================================
     # INTERNAL
     # ======================================================
-    def _load_all(self):
-        try:
-            with open(self.filename, "r", encoding="utf-8") as f:
-                return list(csv.DictReader(f))
-        except FileNotFoundError:
-            return []
-
     def _display_table(self, data):
         print(
             f"| {'Mã BC':<15} | {'Dự án':<12} | {'Tên dự án':<25} | "
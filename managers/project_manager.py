@@ -1,13 +1,19 @@
+from managers.dependency import Dependency
 from managers.ProjectItem_manager import ProjectItemManager
+from managers.unit_of_work import UnitOfWork
 from models.project import Project
-import csv
+from services.project_service import ProjectService
 import re
+import instrumentation
 
 class ProjectManager(ProjectItemManager):
     """
     Quản lý nghiệp vụ Project – đồng bộ Project / Task / Staff
     """
 
+    staff_manager = Dependency()
+    task_manager = Dependency()
+
     def __init__(self, filename, staff_manager, task_manager):
         super().__init__(
             filename=filename,
@@ -18,21 +24,6 @@ class ProjectManager(ProjectItemManager):
         self.staff_manager = staff_manager
         self.task_manager = task_manager
 
-    # ================= FILE =================
-    def save_to_file(self):
-        with open(self.filename, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=self.fieldnames)
-            writer.writeheader()
-            for obj in self.items:
-                writer.writerow(obj.to_dict())
-
-    # ================= BASIC FIND =================
-    def find_by_id(self, project_id):
-        return next(
-            (p for p in self.items if p.project_id == project_id),
-            None
-        )
-
     # ================= HÀM NHẬP MÃ DỰ ÁN HỢP LỆ =================
     def _input_valid_project_id(self):
         while True:
@@ -48,22 +39,16 @@ class ProjectManager(ProjectItemManager):
             return pid
 
     # ================= CRUD =================
-    def add_project(self):
-        print("\n--- THÊM DỰ ÁN ---")
-        project = Project()
-
-        # 1. Nhập thông tin cơ bản dự án (không bao gồm PM)
-        project.input_info(
-            existing_project_ids=[p.project_id for p in self.items]
-        )
+    # Menu chỉ nhập liệu; kiểm tra + ghi file đều qua ProjectService
+    def _service(self):
+        return ProjectService(self, self.staff_manager, self.task_manager)
 
-        # 2. Nhập PM của dự án
+    def _input_pm_id(self, prompt):
+        """Hỏi mã PM tới khi hợp lệ; Enter → chuỗi rỗng"""
         while True:
-            pm_id = input("Nhập mã PM của dự án (Enter để hủy): ").strip()
-
+            pm_id = input(prompt).strip()
             if not pm_id:
-                print("Đã hủy thêm dự án")
-                return  # thoát hàm nếu muốn hủy
+                return ""
 
             pm = self.staff_manager.find_by_id(pm_id)
             if not pm:
@@ -73,14 +58,26 @@ class ProjectManager(ProjectItemManager):
             if getattr(pm, "management_title", "") != "Project Manager":
                 print("Người nhập phải là Project Manager")
                 continue
+            return pm_id
+
+    def add_project(self):
+        print("\n--- THÊM DỰ ÁN ---")
+
+        # 1. Nhập thông tin cơ bản dự án (không bao gồm PM)
+        fields = Project().input_fields(existing_project_ids=self._by_id.keys())
 
-            # Gán PM cho dự án
-            project.pm_id = pm_id
-            break
+        # 2. Nhập PM của dự án
+        fields["pm_id"] = self._input_pm_id("Nhập mã PM của dự án (Enter để hủy): ")
+        if not fields["pm_id"]:
+            print("Đã hủy thêm dự án")
+            return
 
-        # 3. Thêm dự án vào danh sách và lưu file
-        self.items.append(project)
-        self.save_to_file()
+        # 3. Kiểm tra, thêm vào danh sách và lưu file
+        try:
+            project = self._service().create(fields)
+        except ValueError as e:
+            print("Lỗi:", e)
+            return
         print(f"Thêm dự án '{project.project_name}' thành công với PM: {project.pm_id}")
 
     def update_project(self):
@@ -95,24 +92,20 @@ class ProjectManager(ProjectItemManager):
             print(f"Không tìm thấy dự án '{project_id}'.")
             return
 
-        project.update_info()
+        fields = project.update_fields()
 
         # Cập nhật PM nếu muốn
-        while True:
-            pm_id = input(f"Mã PM hiện tại [{getattr(project,'pm_id','')}], nhập mới hoặc Enter để giữ: ").strip()
-            if not pm_id:
-                break
-            pm = self.staff_manager.find_by_id(pm_id)
-            if not pm:
-                print("Nhân viên không tồn tại.")
-                continue
-            if getattr(pm, "management_title", "") != "Project Manager":
-                print("Người này không phải Project Manager.")
-                continue
-            project.pm_id = pm_id
-            break
+        pm_id = self._input_pm_id(
+            f"Mã PM hiện tại [{getattr(project,'pm_id','')}], nhập mới hoặc Enter để giữ: "
+        )
+        if pm_id:
+            fields["pm_id"] = pm_id
 
-        self.save_to_file()
+        try:
+            self._service().update(project_id, fields)
+        except ValueError as e:
+            print("Lỗi:", e)
+            return
         print("Cập nhật dự án thành công")
 
     def delete_project(self):
@@ -132,28 +125,28 @@ class ProjectManager(ProjectItemManager):
             print("Đã hủy thao tác")
             return
 
-        # XÓA TẤT CẢ TASK THUỘC PROJECT (CHA → CON)
-        tasks_to_delete = [
-            t for t in self.task_manager.items
-            if t.project_id == project.project_id
-        ]
+        self._service().delete(project_id)
+        print(f"Đã xóa dự án {project.project_name} và toàn bộ task liên quan.")
 
-        for task in tasks_to_delete:
-            # gỡ task khỏi tất cả nhân viên
-            self.staff_manager.remove_task_from_all_staff(task.id)
+    def remove_project(self, project):
+        """Xóa dự án cùng toàn bộ task của nó (không input) – trả về danh sách task đã xóa"""
+        # Mỗi file (projects / tasks) chỉ ghi 1 lần khi kết thúc khối.
+        # Task của nhân viên suy ra từ tasks → không cần ghi lại staff.csv
+        with UnitOfWork(self, self.task_manager):
+            # XÓA TẤT CẢ TASK THUỘC PROJECT (CHA → CON)
+            tasks_to_delete = self.task_manager.tasks_of_project(project.project_id)
 
-            # xóa task khỏi task manager
-            self.task_manager.items.remove(task)
+            for task in tasks_to_delete:
+                self.task_manager._remove(task)
 
-        # XÓA PROJECT (CHA)
-        self.items.remove(project)
+            # XÓA PROJECT (CHA)
+            self._remove(project)
 
-        # LƯU FILE
-        self.save_to_file()
-        self.task_manager.save_to_file()
-        self.staff_manager.save_to_file()
+            # LƯU FILE (chỉ ghi các dòng bị xóa, không ghi lại cả CSV)
+            self.task_manager._log_delete(*[t.id for t in tasks_to_delete])
+            self._log_delete(project.project_id)
 
-        print(f"Đã xóa dự án {project.project_name} và toàn bộ task liên quan.")
+        return tasks_to_delete
 
 
     # ================= SEARCH & DISPLAY =================
@@ -163,6 +156,7 @@ class ProjectManager(ProjectItemManager):
             print("Không được để trống")
             return
 
+        instrumentation.record_rows(len(self.items))
         result = [p for p in self.items if keyword in p.project_id.lower() or keyword in p.customer.lower()]
         if not result:
             print("Không tìm thấy dự án")
@@ -188,7 +182,7 @@ class ProjectManager(ProjectItemManager):
             print("Chưa kết nối với Task Manager.")
             return
 
-        tasks_of_project = [t for t in self.task_manager.items if t.project_id == project_id]
+        tasks_of_project = self.task_manager.tasks_of_project(project_id)
         if not tasks_of_project:
             print("Dự án này chưa có công việc nào.")
             return
@@ -1,7 +1,10 @@
 #file staff_manager.py
-import csv
 import re
+import instrumentation
 from models.staff import Staff
+from managers.dependency import Dependency
+from storage.factory import create_storage
+from services.staff_service import StaffService
 
 CAP_DO_HOP_LE = ["Intern", "Junior", "Senior"]
 
@@ -22,71 +25,129 @@ class StaffManager:
     - Không lưu project_list (suy ra từ task)
     """
 
+    FIELDNAMES = [
+        "staff_id",
+        "full_name",
+        "age",
+        "level",
+        "role",
+        "management_title",
+        "task_list",
+    ]
+
+    task_manager = Dependency()
+
     def __init__(self, filename="staffs.csv"):
         self.filename = filename
+        # Backend lưu trữ (CSV + journal hoặc SQLite) – chọn theo config.py
+        self.storage = create_storage(filename, self.FIELDNAMES, "staff_id")
+        self.unit_of_work = None
         self.staff_list = []
-        self.load_from_file()
+        # Index staff_id -> Staff để find_by_id là O(1)
+        self._by_id = {}
         self.task_manager = None
+        self.load_from_file()
     def set_task_manager(self, task_manager):
         self.task_manager = task_manager
+        # task_list của nhân viên suy ra từ index assignee của TaskManager
+        source = self._task_source()
+        for s in self.staff_list:
+            s.task_source = source
+
+    def _task_source(self):
+        # Staff hỏi task qua StaffManager → TaskManager nối trễ (Deferred)
+        # chỉ được nạp khi có người đọc task_list
+        return self if StaffManager.task_manager.is_set(self) else None
+
+    def task_ids_of_staff(self, staff_id):
+        return self.task_manager.task_ids_of_staff(staff_id)
     # ==================================================
     # FILE
     # ==================================================
     def load_from_file(self):
-        self.staff_list = []
-
-        try:
-            with open(self.filename, "r", encoding="utf-8", newline="") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    staff = Staff(
-                        staff_id=row["staff_id"],
-                        full_name=row["full_name"],
-                        age=int(row["age"]),
-                        level=row["level"],
-                        role=row["role"],
-                        management_title=row["management_title"] or None,
-                        task_list=row["task_list"].split(";") if row["task_list"] else []
-                    )
-                    self.staff_list.append(staff)
-        except FileNotFoundError:
-            pass
+        self.staff_list = self.storage.load_objects(self._from_row, self._key)
+        self._by_id = {s.staff_id: s for s in self.staff_list}
+        source = self._task_source()
+        for s in self.staff_list:
+            s.task_source = source
+        self._compact_if_needed()
 
     def save_to_file(self):
-        with open(self.filename, "w", encoding="utf-8", newline="") as f:
-            writer = csv.DictWriter(
-                f,
-                fieldnames=[
-                    "staff_id",
-                    "full_name",
-                    "age",
-                    "level",
-                    "role",
-                    "management_title",
-                    "task_list",
-                ]
-            )
-            writer.writeheader()
-
-            for s in self.staff_list:
-                writer.writerow({
-                    "staff_id": s.staff_id,
-                    "full_name": s.full_name,
-                    "age": s.age,
-                    "level": s.level,
-                    "role": s.role,
-                    "management_title": s.management_title or "",
-                    "task_list": ";".join(s.task_list),
-                })
+        if self.unit_of_work:
+            self.unit_of_work.stage_full_save(self)
+            return
+        self._write_all()
+
+    def _write_all(self):
+        self.storage.save_all(self._all_rows())
+
+    def _all_rows(self):
+        return [self._to_row(s) for s in self.staff_list]
+
+    @staticmethod
+    def _key(s):
+        return s.staff_id
+
+    # Chỉ ghi các nhân viên thay đổi (journal / UPSERT SQLite).
+    # Đang trong UnitOfWork → chỉ ghi nhận, ghi file 1 lần khi commit.
+    def _log_upsert(self, *staffs):
+        if self.unit_of_work:
+            self.unit_of_work.stage_upsert(self, staffs)
+            return
+        self.storage.apply([self._to_row(s) for s in staffs], ())
+        self._compact_if_needed()
+
+    def _log_delete(self, *staff_ids):
+        if self.unit_of_work:
+            self.unit_of_work.stage_delete(self, staff_ids)
+            return
+        self.storage.apply((), staff_ids)
+        self._compact_if_needed()
+
+    def _compact_if_needed(self):
+        if self.storage.needs_compaction():
+            self._write_all()
+
+    @staticmethod
+    def _from_row(row):
+        return Staff(
+            staff_id=row["staff_id"],
+            full_name=row["full_name"],
+            age=int(row["age"]),
+            level=row["level"],
+            role=row["role"],
+            management_title=row["management_title"] or None,
+            task_list=row["task_list"].split(";") if row["task_list"] else []
+        )
+
+    @staticmethod
+    def _to_row(s):
+        return {
+            "staff_id": s.staff_id,
+            "full_name": s.full_name,
+            "age": s.age,
+            "level": s.level,
+            "role": s.role,
+            "management_title": s.management_title or "",
+            # Cột cũ, chỉ để tham khảo – nguồn chính là tasks.assignee_id.
+            # Ghi lại đúng giá trị đã đọc, không hỏi TaskManager (tránh nạp tasks.csv)
+            "task_list": ";".join(s._task_list),
+        }
 
     # ==================================================
     # CRUD
     # ==================================================
+    # Menu chỉ nhập liệu; kiểm tra + ghi file đều qua StaffService
+    def _service(self):
+        return StaffService(self)
+
     def add_staff(self):
-        staff = Staff()
-        staff.input_info(self.staff_list)
-        self.staff_list.append(staff)
-        self.save_to_file()
+        fields = Staff().input_fields(self._by_id.keys())
+        try:
+            self._service().create(fields)
+        except ValueError as e:
+            print("Lỗi:", e)
+            return
         print("Thêm nhân viên thành công")
 
     def update_staff(self):
@@ -98,8 +159,13 @@ class StaffManager:
             staff = self.find_by_id(staff_id)
 
             if staff:
-                staff.update_info()
-                self.save_to_file()
+                fields = staff.update_fields()
+                try:
+                    self._service().update(staff_id, fields)
+                except ValueError as e:
+                    print("Lỗi:", e)
+                    return False
+                print("Đã cập nhật thông tin nhân viên.")
                 print("Cập nhật nhân viên thành công")
                 return True
             else:
@@ -116,7 +182,7 @@ class StaffManager:
 
         while count < max_try:
             staff_id = input("Nhập mã nhân viên muốn xóa: ").strip()
-            staff = next((s for s in self.staff_list if s.staff_id == staff_id), None)
+            staff = self.find_by_id(staff_id)
 
             if not staff:
                 count += 1
@@ -130,18 +196,10 @@ class StaffManager:
             if confirm != 'y':
                 print("Đã hủy thao tác xóa.")
                 return  
-            
-            # 1. Xóa nhân viên khỏi danh sách
-            self.staff_list.remove(staff)
 
-            # 2. Cập nhật task (nếu có)
-            if self.task_manager:
-                self.task_manager.unassign_staff(staff_id)
-            else:
+            if not self.task_manager:
                 print("Cảnh báo: Chưa kết nối TaskManager.")
-
-            # 3. Lưu file
-            self.save_to_file()
+            self._service().delete(staff_id)
             print(f"Đã xóa nhân viên {staff_id} thành công.")
             return  
 
@@ -167,6 +225,29 @@ class StaffManager:
     # ==================================================
     # SEARCH 
     # ==================================================
+    def find_staff(self, keyword):
+        """
+        Tìm nhân viên theo mã NV / vai trò / họ tên (không input)
+        Từ khóa sai định dạng → ValueError
+        """
+        # -------- CASE 1: MÃ NHÂN VIÊN --------
+        if keyword.upper().startswith("NV_"):
+            if not re.fullmatch(r"NV_\d{5}", keyword.upper()):
+                raise ValueError("Mã nhân viên sai định dạng (VD: NV_00001)")
+            staff = self.find_by_id(keyword.upper())
+            return [staff] if staff else []
+
+        # -------- CASE 2: VAI TRÒ --------
+        instrumentation.record_rows(len(self.staff_list))
+        if keyword in VAI_TRO_HOP_LE:
+            return [s for s in self.staff_list if s.role == keyword]
+
+        # -------- CASE 3: HỌ TÊN --------
+        if not re.fullmatch(r"[A-Za-zÀ-ỹ\s]+", keyword):
+            raise ValueError("Từ khóa tìm kiếm không hợp lệ")
+        keyword_lower = keyword.lower()
+        return [s for s in self.staff_list if keyword_lower in s.full_name.lower()]
+
     def search_staff(self):
         while True:
             keyword = input(
@@ -177,36 +258,11 @@ class StaffManager:
                 print("Không được để trống từ khóa")
                 continue
 
-            keyword_lower = keyword.lower()
-
-            # -------- CASE 1: MÃ NHÂN VIÊN --------
-            if keyword.upper().startswith("NV_"):
-                if not re.fullmatch(r"NV_\d{5}", keyword.upper()):
-                    print("Mã nhân viên sai định dạng (VD: NV_00001)")
-                    continue
-
-                result = [
-                    s for s in self.staff_list
-                    if s.staff_id.upper() == keyword.upper()
-                ]
-
-            # -------- CASE 2: VAI TRÒ --------
-            elif keyword in VAI_TRO_HOP_LE:
-                result = [
-                    s for s in self.staff_list
-                    if s.role == keyword
-                ]
-
-            # -------- CASE 3: HỌ TÊN --------
-            else:
-                if not re.fullmatch(r"[A-Za-zÀ-ỹ\s]+", keyword):
-                    print("Từ khóa tìm kiếm không hợp lệ")
-                    continue
-
-                result = [
-                    s for s in self.staff_list
-                    if keyword_lower in s.full_name.lower()
-                ]
+            try:
+                result = self.find_staff(keyword)
+            except ValueError as e:
+                print(e)
+                continue
 
             if not result:
                 print("Không tìm thấy nhân viên phù hợp")
@@ -224,34 +280,23 @@ class StaffManager:
     # NGHIỆP VỤ LIÊN KẾT
     # ==================================================
     def find_by_id(self, staff_id):
-        return next(
-            (s for s in self.staff_list if s.staff_id == staff_id),
-            None
-        )
+        return self._by_id.get(staff_id)
 
-    def remove_task_from_all_staff(self, task_id):
-        """
-        Khi task bị xóa hoặc hủy
-        → gỡ task khỏi toàn bộ nhân viên
-        """
-        changed = False
-
-        for s in self.staff_list:
-            if task_id in s.task_list:
-                s.task_list.remove(task_id)
-                changed = True
+    def _insert(self, staff):
+        staff.task_source = self._task_source()
+        self.staff_list.append(staff)
+        self._by_id[staff.staff_id] = staff
 
-        if changed:
-            self.save_to_file()
+    def _remove(self, staff):
+        self._by_id.pop(staff.staff_id, None)
+        self.staff_list.remove(staff)
 
     def add_task_to_staff(self, staff_id, task_id):
         """
         Khi giao task cho nhân viên
+        → chỉ sửa assignee_id của task, staff.csv không đổi
         """
-        staff = self.find_by_id(staff_id)
-        if not staff:
+        if not self.find_by_id(staff_id) or not self.task_manager:
             return
 
-        if task_id not in staff.task_list:
-            staff.task_list.append(task_id)
-            self.save_to_file()
+        self.task_manager.assign_task(task_id, staff_id)
@@ -1,37 +1,185 @@
 # task_manager.py
 import re
-from datetime import datetime
+import instrumentation
+from collections import Counter
+from datetime import datetime, timedelta
 from models.task import Task
+from indexes.interval_index import IntervalIndex
+from indexes.deadline_index import DeadlineIndex
+from indexes.task_columns import TaskColumns
+from managers.dependency import Dependency
 from managers.ProjectItem_manager import ProjectItemManager
+from services.task_service import TaskService
 
 
 class TaskManager(ProjectItemManager):
+    staff_manager = Dependency()
+    project_manager = Dependency()
+
     def __init__(self, filename, staff_manager):
         super().__init__(
             filename=filename,
             cls=Task,
             fieldnames=Task.csv_fields(),
-            id_field="task_id"
+            id_field="task_id",
+            storage_indexes=("project_id", "assignee_id", "deadline", "status_task"),
+            dmy_date_fields=("start_date", "deadline", "completed_date")
         )
         self.staff_manager = staff_manager
         self.task_list = self.items
 
-    # ================= SAVE =================
-    def save_to_file(self):
-        """
-        Alias để đồng bộ tên hàm với ProjectManager
-        """
-        super().save_to_file()
+    def load_from_file(self):
+        super().load_from_file()
+        # task_list là alias của items → phải trỏ lại sau khi nạp lại danh sách
+        self.task_list = self.items
 
-    # ================= FIND =================
-    def find_by_id(self, task_id):
-        return next((t for t in self.items if t.id == task_id), None)
+    # ================= INDEX =================
+    def _rebuild_indexes(self):
+        # project_id -> {task_id: Task}
+        self._by_project = {}
+        # staff_id (chuẩn hóa) -> {task_id: Task}
+        self._by_assignee = {}
+        # Các index theo ngày chỉ dựng ở truy vấn đầu tiên cần tới (toàn hệ thống
+        # hoặc từng dự án) → nạp lazy không phải giải mã ngày của mọi task
+        # Index khoảng ngày [start_date, deadline]: toàn hệ thống + từng dự án
+        self._dates = None
+        self._dates_by_project = {}
+        # Task còn mở sắp theo deadline (cho danh sách quá hạn / sắp đến hạn)
+        self._open_deadlines = None
+        # project_id -> Counter(status_task -> số task)
+        self._status_counts = {}
+        # Dữ liệu dạng cột cho thống kê toàn hệ thống – chỉ dựng khi cần (columns)
+        self._columns = None
+        super()._rebuild_indexes()
+
+    @staticmethod
+    def _assignee_key(staff_id):
+        key = (staff_id or "").strip().upper()
+        return key if key and key != "UNASSIGNED" else None
+
+    def _index_item(self, task):
+        super()._index_item(task)
+        self._by_project.setdefault(task.project_id, {})[task.id] = task
+
+        a_key = self._assignee_key(task.assignee_id)
+        if a_key:
+            self._by_assignee.setdefault(a_key, {})[task.id] = task
+
+        if self._dates is not None:
+            self._dates.add(task)
+        if task.project_id in self._dates_by_project:
+            self._dates_by_project[task.project_id].add(task)
+        if self._open_deadlines is not None:
+            self._open_deadlines.add(task)
+        self._status_counts.setdefault(task.project_id, Counter())[task.status_task] += 1
+        if self._columns is not None:
+            self._columns.add(task)
+
+    def _unindex_item(self, task):
+        if self._by_id.get(task.id) is not task:
+            return
+        super()._unindex_item(task)
+        self._discard(self._by_project, task.project_id, task)
+        self._discard(self._by_assignee, self._assignee_key(task.assignee_id), task)
+
+        if self._dates is not None:
+            self._dates.remove(task)
+        dates = self._dates_by_project.get(task.project_id)
+        if dates is not None:
+            dates.remove(task)
+            if not len(dates):
+                del self._dates_by_project[task.project_id]
+        if self._open_deadlines is not None:
+            self._open_deadlines.remove(task)
+
+        counts = self._status_counts.get(task.project_id)
+        if counts is not None and counts[task.status_task] > 0:
+            counts[task.status_task] -= 1
+            if not +counts:
+                del self._status_counts[task.project_id]
+        if self._columns is not None:
+            self._columns.remove(task)
+
+    @staticmethod
+    def _discard(index, key, task):
+        bucket = index.get(key)
+        if bucket is not None and bucket.get(task.id) is task:
+            del bucket[task.id]
+            if not bucket:
+                del index[key]
+
+    @property
+    def columns(self):
+        """TaskColumns của toàn bộ task – dựng ở lần dùng đầu, sau đó cập nhật theo từng thay đổi"""
+        if self._columns is None:
+            self._columns = TaskColumns.from_tasks(self.items, Task.STATUS_LIST, Task.PRIORITY_LEVELS)
+        return self._columns
+
+    def tasks_of_project(self, project_id):
+        """Danh sách task của 1 dự án – không phải duyệt toàn bộ task"""
+        return list(self._by_project.get(project_id, {}).values())
+
+    def status_counts(self, project_id):
+        """Số task theo từng trạng thái của dự án – O(1), không duyệt task"""
+        return Task.full_status_counts(self._status_counts.get(project_id, Counter()))
+
+    def tasks_of_staff(self, staff_id):
+        """Danh sách task đang giao cho 1 nhân viên"""
+        return list(self._by_assignee.get(self._assignee_key(staff_id), {}).values())
+
+    def task_ids_of_staff(self, staff_id):
+        # Staff.task_list được suy ra từ đây, không lưu riêng nữa
+        return list(self._by_assignee.get(self._assignee_key(staff_id), {}))
+
+    def _date_index(self, project_id):
+        # Dựng lần đầu từ task hiện có (giải mã ngày lúc này), sau đó cập nhật theo CRUD
+        if project_id is None:
+            if self._dates is None:
+                self._dates = IntervalIndex()
+                for task in self.items:
+                    self._dates.add(task)
+            return self._dates
+        dates = self._dates_by_project.get(project_id)
+        if dates is None:
+            tasks = self._by_project.get(project_id)
+            if not tasks:
+                return IntervalIndex()
+            dates = self._dates_by_project[project_id] = IntervalIndex()
+            for task in tasks.values():
+                dates.add(task)
+        return dates
+
+    def _deadline_index(self):
+        if self._open_deadlines is None:
+            self._open_deadlines = DeadlineIndex()
+            for task in self.items:
+                self._open_deadlines.add(task)
+        return self._open_deadlines
+
+    def tasks_overlapping(self, start, end, project_id=None):
+        """Task có khoảng [start_date, deadline] giao với [start, end]"""
+        return self._date_index(project_id).tasks_overlapping(start, end)
+
+    def tasks_starting_or_due(self, start, end, project_id=None):
+        """Task bắt đầu hoặc hết hạn trong [start, end]"""
+        return self._date_index(project_id).tasks_starting_or_due(start, end)
+
+    def overdue_tasks(self, now=None):
+        """Task chưa Completed / Cancelled có deadline < now"""
+        return self._deadline_index().overdue(now or datetime.now())
+
+    def tasks_due_within(self, days, now=None):
+        """Task chưa Completed / Cancelled hết hạn trong N ngày tới"""
+        now = now or datetime.now()
+        return self._deadline_index().due_between(now, now + timedelta(days=days))
 
     # ================= CRUD =================
+    # Menu chỉ nhập liệu; kiểm tra + ghi file đều qua TaskService (giống CLI / server)
+    def _service(self):
+        return TaskService(self, self.project_manager, self.staff_manager)
+
     def add_task(self):
         print("\n--- THÊM TASK ---")
-        task = Task()
-        existing_ids = [t.id for t in self.items]
 
         # --- Chọn dự án ---
         while True:
@@ -54,44 +202,22 @@ class TaskManager(ProjectItemManager):
             if not re.fullmatch(rf"{prefix}\d{{5}}", task_id):
                 print("Sai định dạng mã task.")
                 continue
-            if task_id in existing_ids:
+            if self.find_by_id(task_id):
                 print("Mã task đã tồn tại.")
                 continue
             break
 
-        task.id = task_id
-        task.project_id = project_id
-
         # --- Nhập thông tin ---
         staff_list = self.staff_manager.staff_list if self.staff_manager else []
-        task.input_info(staff_list, project)
-
-        # --- Validate ngày ---
-        if task.start_date < project.start_date:
-            print("Ngày bắt đầu task < ngày bắt đầu dự án. Tự chỉnh.")
-            task.start_date = project.start_date
-
-        if task.start_date > project.expected_end_date:
-            print("Ngày bắt đầu task > ngày kết thúc dự án. Tự chỉnh.")
-            task.start_date = project.expected_end_date
-
-
-        if task.deadline > project.expected_end_date:
-            print("Deadline task > ngày kết thúc dự kiến dự án. Tự chỉnh.")
-            task.deadline = project.expected_end_date
-
-        # --- Gán task cho staff ---
-        if task.assignee_id and self.staff_manager:
-            staff = self.staff_manager.find_by_id(task.assignee_id)
-            if staff:
-                staff.task_list.append(task.id)
-
-        self.items.append(task)
-        self.save_to_file()
-
-        if self.staff_manager:
-            self.staff_manager.save_to_file()
-
+        fields = Task(project_id=project_id, task_id=task_id).input_fields(staff_list, project)
+        fields["task_id"] = task_id
+
+        # Task giao cho ai suy ra từ assignee_id → không cần ghi lại staff.csv
+        try:
+            task = self._service().create(project_id, fields)
+        except ValueError as e:
+            print("Lỗi:", e)
+            return
         print(f"Đã thêm task {task.id} thành công!")
 
     def update_task(self):
@@ -105,10 +231,13 @@ class TaskManager(ProjectItemManager):
 
         staff_list = self.staff_manager.staff_list if self.staff_manager else []
         project = self.project_manager.find_by_id(task.project_id)
+        fields = task.update_fields(staff_list, project)
 
-        task.update_info(staff_list, project)
-
-        self.save_to_file()
+        try:
+            self._service().update(task_id, fields)
+        except ValueError as e:
+            print("Lỗi:", e)
+            return
         print("Cập nhật task thành công!")
 
     def delete_task(self):
@@ -124,17 +253,7 @@ class TaskManager(ProjectItemManager):
         if confirm != "y":
             return
 
-        if task.assignee_id and self.staff_manager:
-            staff = self.staff_manager.find_by_id(task.assignee_id)
-            if staff and task.id in staff.task_list:
-                staff.task_list.remove(task.id)
-
-        self.items.remove(task)
-        self.save_to_file()
-
-        if self.staff_manager:
-            self.staff_manager.save_to_file()
-
+        self._service().delete(task_id)
         print("Đã xóa task.")
 
     # ================= DISPLAY =================
@@ -154,11 +273,7 @@ class TaskManager(ProjectItemManager):
 
     def display_overdue_tasks(self):
         print("\n--- TASK QUÁ HẠN ---")
-        today = datetime.now()
-        overdue = [
-            t for t in self.items
-            if t.deadline and t.deadline < today and t.status_task != "Completed"
-        ]
+        overdue = self.overdue_tasks()
 
         if not overdue:
             print("Không có task quá hạn.")
@@ -167,17 +282,54 @@ class TaskManager(ProjectItemManager):
         for t in overdue:
             print(f"{t.id} | {t.name} | Deadline: {t.deadline.strftime('%d/%m/%Y')}")
 
+    def display_due_soon_tasks(self):
+        print("\n--- TASK SẮP ĐẾN HẠN ---")
+        days = input("Số ngày tới (mặc định 7): ").strip()
+        try:
+            days = int(days) if days else 7
+        except ValueError:
+            print("Số ngày không hợp lệ.")
+            return
+
+        due_soon = self.tasks_due_within(days)
+        if not due_soon:
+            print(f"Không có task đến hạn trong {days} ngày tới.")
+            return
+
+        for t in due_soon:
+            print(f"{t.id} | {t.name} | Deadline: {t.deadline.strftime('%d/%m/%Y')}")
+
+    def assign_task(self, task_id, staff_id):
+        """Giao (lại) task cho nhân viên – chỉ ghi dòng task đó"""
+        task = self.find_by_id(task_id)
+        if not task:
+            return False
+        with self._updating(task):
+            task.assignee_id = staff_id
+        self._log_upsert(task)
+        return True
+
     def unassign_staff(self, staff_id):
-        updated = False
-        for t in self.items:
-            if t.assignee_id and t.assignee_id.strip().upper() == staff_id.strip().upper():
+        # Chỉ duyệt task của nhân viên này (index assignee)
+        updated = self.tasks_of_staff(staff_id)
+        for t in updated:
+            with self._updating(t):
                 t.assignee_id = "Unassigned"
-                updated = True
 
         if updated:
-            self.save_to_file()
+            self._log_upsert(*updated)
             print(f"Đã gỡ task khỏi nhân viên {staff_id}")
     
+    def find_tasks(self, keyword):
+        """Task có mã hoặc tên chứa keyword (không phân biệt hoa thường)"""
+        keyword = keyword.lower()
+        instrumentation.record_rows(len(self.items))
+        return [
+            t for t in self.items
+            if keyword in t.id.lower()
+            or keyword in t.name.lower()
+        ]
+
     def search_task(self):
         print("\n--- TÌM KIẾM TASK ---")
         keyword = input("Nhập mã task hoặc tên task: ").strip().lower()
@@ -186,11 +338,7 @@ class TaskManager(ProjectItemManager):
             print("Không được để trống.")
             return
 
-        results = [
-            t for t in self.items
-            if keyword in t.id.lower()
-            or keyword in t.name.lower()
-        ]
+        results = self.find_tasks(keyword)
 
         if not results:
             print("Không tìm thấy task.")
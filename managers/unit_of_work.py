@@ -0,0 +1,124 @@
+# managers/unit_of_work.py
+
+
+class UnitOfWork:
+    """
+    Gom các thay đổi của nhiều manager trong một thao tác nghiệp vụ
+    và ghi mỗi file đúng 1 lần khi commit.
+
+        with UnitOfWork(project_manager, task_manager, staff_manager):
+            ...  # các lệnh _log_upsert / _log_delete / save_to_file chỉ được ghi nhận
+
+    - Thoát khối bình thường → commit: mỗi manager bị thay đổi flush 1 lần
+    - Có exception → rollback: bỏ thay đổi chưa ghi, nạp lại dữ liệu từ file
+    - Manager đang thuộc một UnitOfWork khác (lồng nhau) → để UnitOfWork ngoài xử lý
+    - Manager đang gắn WriteBehind → UnitOfWork chen lên trên: commit thì chuyển
+      thay đổi cho WriteBehind ghi trễ, rollback thì bỏ thay đổi của khối này
+    - defer_commit=True: thoát khối bình thường chỉ giữ thay đổi, người gọi tự
+      commit() sau (vd server chạy commit trong thread riêng)
+    - add_manager(): gắn thêm manager được tạo khi khối đang mở
+    """
+
+    def __init__(self, *managers, defer_commit=False):
+        self.managers = [m for m in managers if m is not None]
+        self.defer_commit = defer_commit
+        self._entered = False
+        self.closed = False
+        self._attached = []
+        # manager -> WriteBehind đang gắn trước khi UnitOfWork chen lên
+        self._outer = {}
+        # manager -> {id: object (upsert) | None (delete)}
+        self._changes = {}
+        # manager cần ghi lại toàn bộ file
+        self._full_saves = set()
+
+    # ================= CONTEXT =================
+    def __enter__(self):
+        self._entered = True
+        for m in self.managers:
+            self._attach(m)
+        return self
+
+    def add_manager(self, manager):
+        """Gắn thêm manager (AppContext tạo manager khi cần) – False nếu khối đã đóng"""
+        if self.closed:
+            return False
+        self.managers.append(manager)
+        if self._entered:
+            self._attach(manager)
+        return True
+
+    def _attach(self, m):
+        current = getattr(m, "unit_of_work", None)
+        if isinstance(current, UnitOfWork):
+            return
+        if current is not None:
+            self._outer[m] = current
+        m.unit_of_work = self
+        self._attached.append(m)
+
+    def __exit__(self, exc_type, exc, tb):
+        self.closed = True
+        for m in self._attached:
+            m.unit_of_work = self._outer.get(m)
+
+        if exc_type is None:
+            if not self.defer_commit:
+                self.commit()
+        else:
+            self.rollback()
+        return False
+
+    # ================= GHI NHẬN THAY ĐỔI =================
+    def stage_upsert(self, manager, objs):
+        changes = self._changes.setdefault(manager, {})
+        for obj in objs:
+            changes[manager._key(obj)] = obj
+
+    def stage_delete(self, manager, item_ids):
+        changes = self._changes.setdefault(manager, {})
+        for item_id in item_ids:
+            changes[item_id] = None
+
+    def stage_full_save(self, manager):
+        self._full_saves.add(manager)
+
+    # ================= COMMIT / ROLLBACK =================
+    def commit(self):
+        dirty = list(self._changes) + [m for m in self._full_saves if m not in self._changes]
+        for m in dirty:
+            outer = self._outer.get(m)
+            if outer is not None:
+                # Ghi trễ: chuyển thay đổi cho WriteBehind (chụp dòng ngay lúc này)
+                if m in self._full_saves:
+                    outer.stage_full_save(m)
+                    continue
+                changes = self._changes[m]
+                outer.stage_upsert(m, [obj for obj in changes.values() if obj is not None])
+                outer.stage_delete(m, [item_id for item_id, obj in changes.items() if obj is None])
+                continue
+
+            if m in self._full_saves:
+                m._write_all()
+                continue
+
+            changes = self._changes[m]
+            upserts = [m._to_row(obj) for obj in changes.values() if obj is not None]
+            deletes = [item_id for item_id, obj in changes.items() if obj is None]
+            m.storage.apply(upserts, deletes)
+            m._compact_if_needed()
+
+        self._changes = {}
+        self._full_saves = set()
+
+    def rollback(self):
+        dirty = set(self._changes) | self._full_saves
+        self._changes = {}
+        self._full_saves = set()
+        # Thay đổi trước khối này còn nằm trong hàng đợi WriteBehind → ghi hết
+        # xuống file trước, nếu không nạp lại sẽ làm mất chúng
+        for outer in {self._outer[m] for m in dirty if m in self._outer}:
+            outer.flush()
+        # Dữ liệu trong bộ nhớ đã bị sửa dở → nạp lại trạng thái đã lưu
+        for m in dirty:
+            m.load_from_file()
@@ -1,7 +1,12 @@
 # file weekly_report_manager.py
-from datetime import datetime, timedelta
+from datetime import timedelta
+from itertools import chain
+from models.date_codec import parse_datetime, parse_dmy, parse_iso
 from reports.weekly_report import WeeklyReport
 from reports.base_report import BaseReport
+from reports.report_index import ReportIndex
+from indexes.weekly_period_index import WeeklyPeriodIndex
+from services.report_service import WeeklyReportService
 import re
 
 
@@ -15,10 +20,21 @@ class WeeklyReportManager:
 
     def __init__(self, filename="weekly_reports.csv"):
         self.filename = filename
+        # Index report_id / project_id -> vị trí dòng trong file CSV
+        self.index = ReportIndex(filename)
+        # project_id -> (tuần mới nhất, mã báo cáo) – dựng 1 lần, cập nhật khi tạo / xóa
+        self._periods = None
+
+    @property
+    def periods(self):
+        if self._periods is None:
+            self._periods = WeeklyPeriodIndex.from_rows(BaseReport.iter_rows(self.filename))
+        return self._periods
 
     # ================= 1. TẠO BÁO CÁO TUẦN =================
     def create_report(self, project_manager, staff_manager, task_manager):
         print("\n--- TẠO BÁO CÁO TUẦN ---")
+        service = WeeklyReportService(self, project_manager, staff_manager, task_manager)
 
         # 1. Chọn dự án
         while True:
@@ -64,28 +80,23 @@ class WeeklyReportManager:
 
 
         # 3. RÀNG BUỘC TUẦN
-        reports = BaseReport.load_from_csv(self.filename)
-        project_reports = [r for r in reports if r["project_id"] == pid]
-        if not project_reports:
-            expected_start = project.start_date
+        periods = self.periods
+        try:
+            expected_start, is_first_week = service.expected_period(project)
+        except ValueError as e:
+            print("Lỗi:", e)
+            return
+        if is_first_week:
             print(f"Tuần đầu tiên bắt buộc bắt đầu từ: {expected_start.strftime('%d/%m/%Y')}")
-            is_first_week = True
         else:
-            last_report = max(
-                project_reports,
-                key=lambda r: datetime.strptime(r["period_end"], "%Y-%m-%d")
-            )
-            last_end = datetime.strptime(last_report["period_end"], "%Y-%m-%d")
-            expected_start = last_end + timedelta(days=1)
             print(f"Tuần tiếp theo bắt buộc bắt đầu từ: {expected_start.strftime('%d/%m/%Y')}")
-            is_first_week = False
 
 
         while True:
             try:
                 # ===== NHẬP NGÀY BẮT ĐẦU =====
                 s_date_str = input("Nhập ngày bắt đầu tuần (dd/mm/yyyy): ").strip()
-                s_date = datetime.strptime(s_date_str, "%d/%m/%Y")
+                s_date = parse_dmy(s_date_str)
 
                 if s_date.date() != expected_start.date():
                     print("Ngày bắt đầu không hợp lệ theo tiến độ dự án.")
@@ -94,7 +105,7 @@ class WeeklyReportManager:
                 # ===== TUẦN ĐẦU: NHẬP TAY NGÀY KẾT THÚC =====
                 if is_first_week:
                     e_date_str = input("Nhập ngày kết thúc tuần 1 (dd/mm/yyyy): ").strip()
-                    e_date = datetime.strptime(e_date_str, "%d/%m/%Y")
+                    e_date = parse_dmy(e_date_str)
 
                     if e_date < s_date:
                         print("Ngày kết thúc không được trước ngày bắt đầu.")
@@ -122,23 +133,15 @@ class WeeklyReportManager:
             except ValueError:
                 print("Sai định dạng ngày (dd/mm/yyyy).")
 
-        print(f"Mã báo cáo phải theo dạng: WR{pid}_Wxx (VD: WR{pid}_W01)")
-
-        # Lấy danh sách báo cáo đã có
-        existing_reports = BaseReport.load_from_csv(self.filename)
-        existing_ids = {r["report_id"] for r in existing_reports}
+        suggested_id = periods.suggest_id(pid)
+        print(f"Mã báo cáo phải theo dạng: WR{pid}_Wxx (gợi ý: {suggested_id})")
 
         pattern = rf"^WR{pid}_W\d{{2}}$"
 
         while True:
-            rid = input("Nhập mã báo cáo: ").strip()
-
-            # 1. Không được để trống
-            if not rid:
-                print("Mã báo cáo không được để trống.")
-                continue
+            rid = input(f"Nhập mã báo cáo (Enter = {suggested_id}): ").strip() or suggested_id
 
-            # 2. Kiểm tra đúng format
+            # 1. Kiểm tra đúng format (Enter → dùng mã gợi ý)
             if not re.fullmatch(pattern, rid):
                 print(
                     f"Sai định dạng mã báo cáo.\n"
@@ -146,30 +149,21 @@ class WeeklyReportManager:
                 )
                 continue
 
-            # 3. Kiểm tra trùng
-            if rid in existing_ids:
+            # 2. Kiểm tra trùng
+            if periods.contains(rid):
                 print("Mã báo cáo đã tồn tại. Vui lòng nhập mã khác.")
                 continue
 
             break
-        # 5. Tạo và lưu báo cáo
+        # 5. Tạo và lưu báo cáo (qua service – kiểm tra lại toàn bộ ràng buộc)
         try:
-            report = WeeklyReport(
-                wreport_id=rid,
-                project=project,
-                author=author,
-                task_manager=task_manager,
-                report_date=datetime.now(),
-                period_start_date=s_date,
-                period_end_date=e_date,
-                is_loading=False
-            )
+            report = service.generate(pid, s_date, e_date, author.staff_id, rid, save=False)
 
             report.display()
 
             confirm = input("Xác nhận lưu báo cáo? (y/n): ").lower()
             if confirm == "y":
-                report.save()
+                service.save(report)
                 print("Lưu báo cáo thành công.")
             else:
                 print("Đã hủy tạo báo cáo.")
@@ -182,8 +176,7 @@ class WeeklyReportManager:
         print("\n--- XEM CHI TIẾT BÁO CÁO ---")
         report_id = input("Nhập mã báo cáo: ").strip()
 
-        raw = BaseReport.search_item(self.filename, report_id)
-        row = next((r for r in raw if r["report_id"] == report_id), None)
+        row = self.index.get(report_id)
 
         if not row:
             print("Không tìm thấy báo cáo.")
@@ -193,9 +186,9 @@ class WeeklyReportManager:
             project = project_manager.find_by_id(row["project_id"])
             author = staff_manager.find_by_id(row["author_id"])
 
-            s_date = datetime.strptime(row["period_start"], "%Y-%m-%d")
-            e_date = datetime.strptime(row["period_end"], "%Y-%m-%d")
-            c_date = datetime.strptime(row["created_date"], "%Y-%m-%d %H:%M:%S")
+            s_date = parse_iso(row["period_start"])
+            e_date = parse_iso(row["period_end"])
+            c_date = parse_datetime(row["created_date"])
 
             report = WeeklyReport(
                 wreport_id=report_id,
@@ -215,25 +208,29 @@ class WeeklyReportManager:
 
     # ================= 3. HIỂN THỊ DANH SÁCH =================
     def display_all(self):
-        data = BaseReport.load_from_csv(self.filename)
-        if not data:
+        rows = BaseReport.iter_rows(self.filename)
+        first = next(rows, None)
+        if first is None:
             print("Danh sách báo cáo trống.")
             return
-        self._display_table(data)
+        self._display_table(chain([first], rows))
 
     # ================= 4. TÌM KIẾM =================
     def search_report(self):
         keyword = input("Nhập mã báo cáo hoặc mã dự án: ").strip().lower()
         results = BaseReport.search_item(self.filename, keyword)
-        if not results:
+        first = next(results, None)
+        if first is None:
             print("Không tìm thấy báo cáo.")
             return
-        self._display_table(results)
+        self._display_table(chain([first], results))
 
     # ================= 5. XÓA =================
     def delete_report(self):
         rid = input("Nhập mã báo cáo cần xóa: ").strip()
         if BaseReport.delete_item(self.filename, rid):
+            if self._periods is not None:
+                self._periods.remove(rid)
             print("Đã xóa báo cáo.")
         else:
             print("Không tìm thấy báo cáo.")
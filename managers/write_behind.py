@@ -0,0 +1,136 @@
+# managers/write_behind.py
+import atexit
+import sys
+import threading
+
+import config
+
+
+class WriteBehind:
+    """
+    Ghi trễ (write-behind): thao tác chỉ ghi nhận thay đổi rồi trả về ngay,
+    một thread nền gom lại và ghi xuống file theo chu kỳ + khi thoát chương trình.
+
+        write_behind = WriteBehind.from_config(staff_manager, task_manager, project_manager)
+
+    - Gắn vào manager qua thuộc tính unit_of_work (giống UnitOfWork) → các lệnh
+      _log_upsert / _log_delete / save_to_file chỉ được ghi nhận
+    - Dòng dữ liệu được chụp lại (_to_row) ngay lúc ghi nhận → thread nền không
+      đụng tới object đang bị sửa
+    - Nhiều thay đổi cùng 1 ID trong 1 chu kỳ chỉ ghi 1 lần (bản mới nhất)
+    - Crash → mất tối đa các thay đổi của 1 chu kỳ
+    - UnitOfWork mở trong lúc này chen lên trên: thay đổi chỉ vào hàng đợi khi
+      UnitOfWork commit, rollback thì không có gì của khối đó bị ghi
+    - Ghi journal qua storage.apply (sửa dòng cụt + fsync), ghi toàn bộ qua
+      file tạm + os.replace
+    """
+
+    def __init__(self, *managers, interval=1.0):
+        self.managers = [m for m in managers if m is not None]
+        self.interval = interval
+        self._attached = []
+        # manager -> {id: row (upsert) | None (delete)}
+        self._changes = {}
+        # manager -> toàn bộ dòng cần ghi lại
+        self._full_rows = {}
+        self._lock = threading.Lock()
+        # Chỉ 1 lần ghi tại một thời điểm (thread nền / lúc thoát)
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_config(cls, *managers):
+        """Bật theo PM_WRITE_BEHIND (giây); tắt → None, manager ghi ngay như cũ"""
+        if config.WRITE_BEHIND_INTERVAL <= 0:
+            return None
+        return cls(*managers, interval=config.WRITE_BEHIND_INTERVAL).start()
+
+    # ================= BẬT / TẮT =================
+    def start(self):
+        for m in self.managers:
+            self._attach(m)
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+        return self
+
+    def add_manager(self, manager):
+        """Gắn thêm manager được tạo sau khi đã bật (AppContext tạo manager khi cần)"""
+        self.managers.append(manager)
+        if self._thread is not None:
+            self._attach(manager)
+
+    def _attach(self, manager):
+        if getattr(manager, "unit_of_work", None) is None:
+            manager.unit_of_work = self
+            self._attached.append(manager)
+
+    def stop(self):
+        """Dừng thread nền, ghi nốt thay đổi còn lại và trả manager về ghi ngay"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        for m in self._attached:
+            if m.unit_of_work is self:
+                m.unit_of_work = None
+        self._attached = []
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    # ================= GHI NHẬN THAY ĐỔI =================
+    def stage_upsert(self, manager, objs):
+        rows = {manager._key(obj): manager._to_row(obj) for obj in objs}
+        with self._lock:
+            self._changes.setdefault(manager, {}).update(rows)
+
+    def stage_delete(self, manager, item_ids):
+        with self._lock:
+            changes = self._changes.setdefault(manager, {})
+            for item_id in item_ids:
+                changes[item_id] = None
+
+    def stage_full_save(self, manager):
+        rows = manager._all_rows()
+        with self._lock:
+            # Bản đầy đủ đã gồm các thay đổi lẻ trước đó
+            self._changes.pop(manager, None)
+            self._full_rows[manager] = rows
+
+    # ================= GHI FILE =================
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                changes, self._changes = self._changes, {}
+                full_rows, self._full_rows = self._full_rows, {}
+
+            for m in list(full_rows) + [m for m in changes if m not in full_rows]:
+                rows = full_rows.get(m)
+                pending = changes.get(m, {})
+                try:
+                    if rows is not None:
+                        m.storage.save_all(rows)
+                    upserts = [row for row in pending.values() if row is not None]
+                    deletes = [item_id for item_id, row in pending.items() if row is None]
+                    m.storage.apply(upserts, deletes)
+                    if m.storage.needs_compaction():
+                        m.storage.compact()
+                except OSError as e:
+                    print(f"[write-behind] Lỗi ghi {m.filename}: {e} – sẽ thử lại", file=sys.stderr)
+                    self._requeue(m, rows, pending)
+
+    def _requeue(self, manager, rows, pending):
+        # Ghi lỗi → trả lại hàng đợi; thay đổi mới hơn (nếu có) được ưu tiên
+        with self._lock:
+            if manager in self._full_rows:
+                # Đã có bản đầy đủ mới hơn → bỏ bản cũ
+                return
+            if rows is not None:
+                self._full_rows[manager] = rows
+            newer = self._changes.setdefault(manager, {})
+            for item_id, row in pending.items():
+                newer.setdefault(item_id, row)
@@ -1,6 +1,9 @@
-from datetime import datetime
+from models.date_codec import parse_dmy
 
 class ProjectItem:
+    # Không có __dict__ riêng cho từng object → tiết kiệm bộ nhớ khi nạp nhiều dòng
+    __slots__ = ("id", "name", "description", "start_date")
+
     def __init__(self):
         self.id = ""
         self.name = ""
@@ -18,7 +21,7 @@ class ProjectItem:
         while True:
             date_str = input("Ngày bắt đầu (dd/mm/yyyy): ").strip()
             try:
-                self.start_date = datetime.strptime(date_str, "%d/%m/%Y")
+                self.start_date = parse_dmy(date_str)
                 break
             except ValueError:
                 print("Sai định dạng ngày (dd/mm/yyyy)")
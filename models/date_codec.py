@@ -0,0 +1,77 @@
+# models/date_codec.py
+"""
+Đọc / ghi ngày tháng cho mọi cột ngày trong CSV (task, dự án, báo cáo)
+
+- dd/mm/yyyy : tách chuỗi thủ công (nhanh hơn strptime nhiều lần)
+- yyyy-mm-dd : datetime.fromisoformat
+- Kết quả được cache (LRU) theo chuỗi: nhiều task chung ngày → parse 1 lần
+  và dùng chung 1 object datetime (datetime bất biến nên dùng chung an toàn)
+
+parse_*: dùng thay strptime – chuỗi rỗng / sai định dạng → ValueError như strptime
+format_*: None → chuỗi rỗng
+"""
+from datetime import datetime
+from functools import lru_cache
+
+DMY = "%d/%m/%Y"
+ISO = "%Y-%m-%d"
+ISO_DATETIME = "%Y-%m-%d %H:%M:%S"
+
+CACHE_SIZE = 8192
+
+
+# ================= ĐỌC =================
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_dmy(s):
+    """'dd/mm/yyyy' → datetime (00:00) – thay cho datetime.strptime(s, "%d/%m/%Y")"""
+    if len(s) == 10 and s[2] == "/" and s[5] == "/":
+        day, month, year = s[:2], s[3:5], s[6:]
+        if (day + month + year).isdigit():
+            return datetime(int(year), int(month), int(day))
+    # Dạng ít gặp (1/7/2025...) hoặc sai → để strptime xử lý / báo lỗi
+    return datetime.strptime(s, DMY)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_iso(s):
+    """'yyyy-mm-dd' → datetime (00:00) – thay cho datetime.strptime(s, "%Y-%m-%d")"""
+    if len(s) != 10:
+        raise ValueError(f"Ngày '{s}' không đúng định dạng yyyy-mm-dd")
+    return datetime.fromisoformat(s)
+
+
+def parse_datetime(s):
+    """'yyyy-mm-dd HH:MM:SS' (created_date của báo cáo) – không cache vì hầu như không trùng"""
+    if len(s) != 19:
+        raise ValueError(f"Thời điểm '{s}' không đúng định dạng yyyy-mm-dd HH:MM:SS")
+    return datetime.fromisoformat(s)
+
+
+def parse_any(value):
+    """datetime giữ nguyên; chuỗi thử yyyy-mm-dd rồi dd/mm/yyyy; không đọc được → None"""
+    if isinstance(value, datetime):
+        return value
+    if not isinstance(value, str) or not value:
+        return None
+    for parse in (parse_iso, parse_dmy):
+        try:
+            return parse(value)
+        except ValueError:
+            pass
+    return None
+
+
+# ================= GHI =================
+def format_dmy(d):
+    """datetime → 'dd/mm/yyyy' ('' nếu None)"""
+    return f"{d.day:02d}/{d.month:02d}/{d.year:04d}" if d else ""
+
+
+def format_iso(d):
+    """datetime → 'yyyy-mm-dd' ('' nếu None)"""
+    return f"{d.year:04d}-{d.month:02d}-{d.day:02d}" if d else ""
+
+
+def format_datetime(d):
+    return (f"{d.year:04d}-{d.month:02d}-{d.day:02d} "
+            f"{d.hour:02d}:{d.minute:02d}:{d.second:02d}") if d else ""
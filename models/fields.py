@@ -0,0 +1,16 @@
+# models/fields.py
+"""Kiểm tra dict trường truyền vào apply_fields (CLI / batch / server)"""
+
+
+def check_fields(fields, allowed):
+    """
+    fields phải là dict chỉ gồm các khóa trong allowed
+    Khóa lạ (gõ sai tên cột...) → ValueError thay vì bị bỏ qua im lặng
+    """
+    if not isinstance(fields, dict):
+        raise ValueError("fields phải là object {tên cột: giá trị}")
+    unknown = [str(key) for key in fields if key not in allowed]
+    if unknown:
+        raise ValueError(
+            f"Trường không hợp lệ: {', '.join(unknown)} (được phép: {', '.join(allowed)})"
+        )
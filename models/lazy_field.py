@@ -0,0 +1,87 @@
+# models/lazy_field.py
+"""
+Trường giải mã trễ (lazy) cho model dùng __slots__
+
+Object nạp từ file giữ nguyên chuỗi gốc của các cột tốn công giải mã (ngày, số thực)
+ngay trong slot của trường; lần đầu đọc thuộc tính mới giải mã và ghi đè vào slot.
+
+    class Task(ProjectItem):
+        __slots__ = ("_deadline", ...)
+        deadline = LazyField(decode_date, format_dmy, slot="_deadline")
+
+- set_raw(obj, s) → lưu chuỗi gốc, chưa giải mã
+- Gán giá trị (task.deadline = ...) → ghi thẳng vào slot như thuộc tính thường
+- encode(obj) → chuỗi để ghi CSV: chưa giải mã thì trả lại đúng chuỗi gốc
+- Giá trị sau giải mã không được là str (str trong slot nghĩa là chưa giải mã)
+- Chuỗi gốc sai định dạng → đọc ra default (cảnh báo 1 lần), slot vẫn giữ chuỗi
+  gốc nên lần lưu sau ghi lại y nguyên, không mất dữ liệu
+"""
+import sys
+from types import MemberDescriptorType
+
+
+class LazyField:
+    # (trường, chuỗi gốc) đã cảnh báo – mỗi giá trị sai chỉ báo 1 lần
+    _warned = set()
+
+    def __init__(self, decode, encode, slot, default=None):
+        self.decode = decode
+        self.encode_value = encode
+        self.slot_name = slot
+        self.slot = None
+        self.default = default
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        # Slot lưu giá trị: tìm trong owner và các lớp cha
+        # (vd start_date của Task dùng lại slot start_date của ProjectItem)
+        for klass in owner.__mro__:
+            member = klass.__dict__.get(self.slot_name)
+            if isinstance(member, MemberDescriptorType):
+                self.slot = member
+                return
+        # __set_name__ chạy sau khi tạo slot của owner → không tìm thấy là khai báo sai
+        raise TypeError(f"{owner.__name__}: không có slot {self.slot_name} cho {name}")
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = self.slot.__get__(obj, owner)
+        if value.__class__ is str:
+            return self._decode_into(obj, value)
+        return value
+
+    def __set__(self, obj, value):
+        self.slot.__set__(obj, value)
+
+    def set_raw(self, obj, raw):
+        self.slot.__set__(obj, raw)
+
+    def load(self, obj, raw):
+        """Giải mã ngay (nạp không lazy) – cùng cách xử lý giá trị sai như đọc trễ"""
+        self.slot.__set__(obj, raw)
+        self._decode_into(obj, raw)
+
+    def _decode_into(self, obj, raw):
+        try:
+            value = self.decode(raw)
+        except ValueError:
+            # Giữ chuỗi gốc trong slot → encode() ghi lại đúng như file
+            key = (self.name, raw)
+            if key not in LazyField._warned:
+                LazyField._warned.add(key)
+                print(f"Cảnh báo: {self.name} không hợp lệ ({raw!r}) – giữ nguyên giá trị trong file",
+                      file=sys.stderr)
+            return self.default
+        self.slot.__set__(obj, value)
+        return value
+
+    def is_decoded(self, obj):
+        return self.slot.__get__(obj, type(obj)).__class__ is not str
+
+    def encode(self, obj):
+        """Giá trị để ghi file – chưa giải mã thì không cần giải mã rồi mã hóa lại"""
+        value = self.slot.__get__(obj, type(obj))
+        if value.__class__ is str:
+            return value
+        return self.encode_value(value)
@@ -1,41 +1,27 @@
 class Progress:
-    def __init__(self, project_list, all_tasks):
+    def __init__(self, project, task_manager):
         """
-        project_list: danh sách tất cả Project
-        all_tasks: danh sách tất cả Task object
+        project: Project cần tính tiến độ (đã tra cứu sẵn – không input())
+        task_manager: TaskManager (lấy task theo dự án qua index)
         """
-        # Nhập mã dự án
-        while True:
-            pid = input("Nhập mã dự án để tính tiến độ: ").strip()
-            
-            # --- [FIX 1] Tìm dự án an toàn (chấp nhận cả .id lẫn .project_id) ---
-            found_p = None
-            for p in project_list:
-                # Lấy ID an toàn: ưu tiên project_id, nếu không có thì lấy id
-                current_p_id = getattr(p, 'project_id', getattr(p, 'id', ''))
-                if current_p_id == pid:
-                    found_p = p
-                    break
-            
-            if not found_p:
-                print("Dự án không tồn tại. Nhập lại.")
-                continue
-            
-            self.project = found_p
-            self.pid = pid # Lưu lại pid đã nhập để dùng về sau
-            break
+        self.project = project
+        self.pid = getattr(project, "project_id", getattr(project, "id", ""))
 
-        # --- [FIX 2] Lọc Task ---
-        self.tasks = [t for t in all_tasks if t.project_id == self.pid]
+        # Chỉ lấy task của dự án này (index project_id -> task)
+        self.tasks = task_manager.tasks_of_project(self.pid)
+        # Số task theo trạng thái do TaskManager duy trì sẵn
+        self.counts = task_manager.status_counts(self.pid)
 
     # Tổng số task (bỏ qua task Cancelled)
     def total_tasks(self):
-        return len([t for t in self.tasks if t.status_task != "Cancelled"])
+        return sum(n for status, n in self.counts.items() if status != "Cancelled")
+
+    # Số task theo trạng thái
+    def count_by_status(self, status):
+        return self.counts.get(status, 0)
 
     # Task theo trạng thái (bỏ qua Cancelled khi tính tổng)
     def tasks_by_status(self, status):
-        if status == "Cancelled":
-            return [t for t in self.tasks if t.status_task == "Cancelled"]
         return [t for t in self.tasks if t.status_task == status]
 
     # Tỉ lệ tiến độ (%) (bỏ qua Cancelled)
@@ -43,16 +29,26 @@ class Progress:
         total = self.total_tasks()
         if total == 0:
             return 0
-        completed = len(self.tasks_by_status("Completed"))
+        completed = self.count_by_status("Completed")
         return round((completed / total) * 100, 2)
 
+    # Kết quả dạng dict (cho CLI / API)
+    def as_dict(self):
+        return {
+            "project_id": self.pid,
+            "project_name": getattr(self.project, "project_name", ""),
+            "total_tasks": self.total_tasks(),
+            "status_counts": dict(self.counts),
+            "progress_rate": self.progress_rate(),
+        }
+
     # Hiển thị bảng tổng quan và chi tiết task
     def display_summary_with_tasks(self):
         total = self.total_tasks()
-        completed = len(self.tasks_by_status("Completed"))
-        in_progress = len(self.tasks_by_status("In Progress"))
-        todo = len(self.tasks_by_status("To Do"))
-        cancelled = len(self.tasks_by_status("Cancelled"))
+        completed = self.count_by_status("Completed")
+        in_progress = self.count_by_status("In Progress")
+        todo = self.count_by_status("To Do")
+        cancelled = self.count_by_status("Cancelled")
 
         # --- [FIX 3] Lấy tên dự án an toàn (tránh lỗi has no attribute 'name') ---
         p_name = getattr(self.project, 'project_name', getattr(self.project, 'name', 'Unknown'))
@@ -1,9 +1,21 @@
 # models/project.py
 import re
+import sys
 from datetime import datetime
+from models.date_codec import format_iso, parse_dmy, parse_iso
+from models.fields import check_fields
+from models.lazy_field import LazyField
 from models.ProjectItem import ProjectItem
 
 
+def _decode_date(s):
+    return parse_iso(s) if s else None
+
+
+def _decode_budget(s):
+    return float(s) if s else 0.0
+
+
 class Project(ProjectItem):
     STATUS_LIST = [
         "Chưa khởi động",
@@ -12,6 +24,20 @@ class Project(ProjectItem):
         "Hoàn thành",
         "Hủy"
     ]
+    # Cột được sửa qua apply_fields (mã dự án / PM do ProjectService xử lý)
+    EDITABLE_FIELDS = ("project_name", "customer", "description", "start_date",
+                       "expected_end_date", "actual_end_date", "budget", "status_project")
+
+    __slots__ = (
+        "project_id", "project_name", "customer", "_expected_end_date",
+        "_actual_end_date", "_budget", "status_project", "pm_id",
+    )
+
+    # Ngày và ngân sách nạp từ file được giải mã ở lần đọc đầu tiên
+    start_date = LazyField(_decode_date, format_iso, slot="start_date")
+    expected_end_date = LazyField(_decode_date, format_iso, slot="_expected_end_date")
+    actual_end_date = LazyField(_decode_date, format_iso, slot="_actual_end_date")
+    budget = LazyField(_decode_budget, lambda value: value, slot="_budget", default=0.0)
 
     def __init__(self):
         super().__init__()
@@ -22,8 +48,6 @@ class Project(ProjectItem):
         self.actual_end_date = None
         self.budget = 0.0
         self.status_project = ""
-        self.member_list = []  # KHÔNG LƯU CSV
-        self.task_list = []    # KHÔNG LƯU CSV
         self.pm_id = ""        # Mã Project Manager
 
     @staticmethod
@@ -47,10 +71,10 @@ class Project(ProjectItem):
             "project_name": self.project_name,
             "customer": self.customer,
             "description": self.description,
-            "start_date": self.start_date.strftime("%Y-%m-%d") if self.start_date else "",
-            "expected_end_date": self.expected_end_date.strftime("%Y-%m-%d") if self.expected_end_date else "",
-            "actual_end_date": self.actual_end_date.strftime("%Y-%m-%d") if self.actual_end_date else "",
-            "budget": self.budget,
+            "start_date": Project.start_date.encode(self),
+            "expected_end_date": Project.expected_end_date.encode(self),
+            "actual_end_date": Project.actual_end_date.encode(self),
+            "budget": Project.budget.encode(self),
             "status_project": self.status_project,
             "pm_id": self.pm_id,
         }
@@ -58,24 +82,143 @@ class Project(ProjectItem):
     @classmethod
     def from_dict(cls, data: dict):
         p = cls()
-        p.project_id = data.get("project_id", "")
+        # Chuỗi lặp lại nhiều (mã dự án, trạng thái, PM) dùng chung 1 object
+        p.project_id = sys.intern(data.get("project_id", ""))
+        p.id = p.project_id
+        p.project_name = data.get("project_name", "")
+        p.name = p.project_name
+        p.customer = data.get("customer", "")
+        p.description = data.get("description", "")
+        cls.start_date.load(p, data.get("start_date", ""))
+        cls.expected_end_date.load(p, data.get("expected_end_date", ""))
+        cls.actual_end_date.load(p, data.get("actual_end_date", ""))
+        cls.budget.load(p, data.get("budget", ""))
+        p.status_project = sys.intern(data.get("status_project", ""))
+        p.pm_id = sys.intern(data.get("pm_id", ""))
+        return p
+
+    @classmethod
+    def from_dict_lazy(cls, data):
+        """Như from_dict nhưng chưa giải mã ngày / ngân sách – giữ chuỗi gốc cho tới lần đọc đầu"""
+        p = cls.__new__(cls)
+        p.project_id = sys.intern(data.get("project_id", ""))
         p.id = p.project_id
         p.project_name = data.get("project_name", "")
         p.name = p.project_name
         p.customer = data.get("customer", "")
         p.description = data.get("description", "")
-        p.start_date = datetime.strptime(data["start_date"], "%Y-%m-%d") if data.get("start_date") else None
-        p.expected_end_date = datetime.strptime(data["expected_end_date"], "%Y-%m-%d") if data.get("expected_end_date") else None
-        p.actual_end_date = datetime.strptime(data["actual_end_date"], "%Y-%m-%d") if data.get("actual_end_date") else None
-        p.budget = float(data.get("budget", 0))
-        p.status_project = data.get("status_project", "")
-        p.pm_id = data.get("pm_id", "")
+        p.status_project = sys.intern(data.get("status_project", ""))
+        p.pm_id = sys.intern(data.get("pm_id", ""))
+        cls.start_date.set_raw(p, data.get("start_date", ""))
+        cls.expected_end_date.set_raw(p, data.get("expected_end_date", ""))
+        cls.actual_end_date.set_raw(p, data.get("actual_end_date", ""))
+        cls.budget.set_raw(p, data.get("budget", ""))
         return p
 
+    # ================= HEADLESS =================
+    @staticmethod
+    def _to_date(value, field_name):
+        if value is None or isinstance(value, datetime):
+            return value
+        value = str(value).strip()
+        if not value:
+            return None
+        try:
+            return parse_dmy(value)
+        except ValueError:
+            raise ValueError(f"{field_name} sai định dạng (dd/mm/yyyy)")
+
+    @staticmethod
+    def _validate_name(name):
+        name = str(name).strip()
+        if len(name) < 2:
+            raise ValueError("Tên tối thiểu 2 ký tự")
+        return name.title()
+
+    @staticmethod
+    def _validate_customer(customer):
+        customer = str(customer).strip()
+        if not customer:
+            raise ValueError("Khách hàng không được để trống")
+        return customer.title()
+
+    @staticmethod
+    def _validate_budget(budget):
+        try:
+            budget = float(budget)
+        except (TypeError, ValueError):
+            raise ValueError("Ngân sách phải là số")
+        if budget <= 0:
+            raise ValueError("Ngân sách phải > 0")
+        return budget
+
+    @staticmethod
+    def _validate_dates(start_date, expected_end_date, actual_end_date):
+        if not start_date:
+            raise ValueError("Thiếu ngày bắt đầu")
+        if not expected_end_date:
+            raise ValueError("Thiếu ngày hoàn thành dự kiến")
+        if expected_end_date < start_date:
+            raise ValueError("Ngày dự kiến phải >= ngày bắt đầu")
+        if actual_end_date and actual_end_date < start_date:
+            raise ValueError("Ngày thực tế phải >= ngày bắt đầu")
+
+    def _validate_status(self, status):
+        if status not in self.STATUS_LIST:
+            raise ValueError("Trạng thái không hợp lệ")
+        return status
+
+    def apply_fields(self, fields):
+        """
+        Gán thông tin dự án từ dict (không input) – dữ liệu sai thì raise ValueError
+        và dự án giữ nguyên. Khóa giống cột CSV: project_name, customer, description,
+        start_date, expected_end_date, actual_end_date, budget, status_project
+        (mã dự án / PM do ProjectService kiểm tra)
+        """
+        check_fields(fields, self.EDITABLE_FIELDS)
+        name = self.project_name
+        if "project_name" in fields:
+            name = self._validate_name(fields["project_name"])
+        customer = self.customer
+        if "customer" in fields:
+            customer = self._validate_customer(fields["customer"])
+
+        start_date = self.start_date
+        if "start_date" in fields:
+            start_date = self._to_date(fields["start_date"], "Ngày bắt đầu")
+        expected_end_date = self.expected_end_date
+        if "expected_end_date" in fields:
+            expected_end_date = self._to_date(fields["expected_end_date"], "Ngày hoàn thành dự kiến")
+        actual_end_date = self.actual_end_date
+        if "actual_end_date" in fields:
+            actual_end_date = self._to_date(fields["actual_end_date"], "Ngày hoàn thành thực tế")
+        self._validate_dates(start_date, expected_end_date, actual_end_date)
+
+        budget = self.budget
+        if "budget" in fields:
+            budget = self._validate_budget(fields["budget"])
+        status = self.status_project
+        if "status_project" in fields:
+            status = self._validate_status(fields["status_project"])
+
+        self.project_name = name
+        self.name = name
+        self.customer = customer
+        if "description" in fields:
+            self.description = str(fields["description"]).strip()
+        self.start_date = start_date
+        self.expected_end_date = expected_end_date
+        self.actual_end_date = actual_end_date
+        self.budget = budget
+        self.status_project = status
+
     # ================= INPUT =================
-    def input_info(self, existing_project_ids=None, staff_manager=None):
+    # Chỉ hỏi và kiểm tra từng trường để nhập lại ngay khi sai; không sửa dự án.
+    # Trả về dict trường cho ProjectService.create / update (kiểm tra lần cuối + ghi)
+    def input_fields(self, existing_project_ids=None):
         if existing_project_ids is None:
             existing_project_ids = []
+        fields = {}
 
         while True:
             pid = input("Nhập mã dự án (PYY_NNNNN): ").strip()
@@ -85,38 +228,39 @@ class Project(ProjectItem):
             if pid in existing_project_ids:
                 print("Mã dự án đã tồn tại")
                 continue
-            self.project_id = pid
-            self.id = pid
+            fields["project_id"] = pid
             break
 
         while True:
-            name = input("Nhập tên dự án: ").strip()
-            if len(name) < 2:
-                print("Tên tối thiểu 2 ký tự")
-                continue
-            self.project_name = name.title()
-            self.name = self.project_name
-            break
+            try:
+                fields["project_name"] = self._validate_name(input("Nhập tên dự án: "))
+                break
+            except ValueError as e:
+                print(e)
 
         while True:
-            customer = input("Nhập khách hàng: ").strip()
-            if not customer:
-                print("Không được để trống")
-                continue
-            self.customer = customer.title()
-            break
+            try:
+                fields["customer"] = self._validate_customer(input("Nhập khách hàng: "))
+                break
+            except ValueError as e:
+                print(e)
 
-        self.description = input("Nhập mô tả dự án: ").strip()
+        fields["description"] = input("Nhập mô tả dự án: ").strip()
 
-        self.input_start_date()
+        while True:
+            try:
+                fields["start_date"] = parse_dmy(input("Ngày bắt đầu (dd/mm/yyyy): ").strip())
+                break
+            except ValueError:
+                print("Sai định dạng ngày (dd/mm/yyyy)")
 
         while True:
             try:
-                d = datetime.strptime(input("Ngày hoàn thành dự kiến (dd/mm/yyyy): "), "%d/%m/%Y")
-                if d < self.start_date:
+                d = parse_dmy(input("Ngày hoàn thành dự kiến (dd/mm/yyyy): ").strip())
+                if d < fields["start_date"]:
                     print("Ngày dự kiến phải >= ngày bắt đầu")
                     continue
-                self.expected_end_date = d
+                fields["expected_end_date"] = d
                 break
             except ValueError:
                 print("Sai định dạng ngày")
@@ -124,27 +268,24 @@ class Project(ProjectItem):
         while True:
             s = input("Ngày hoàn thành thực tế (Enter nếu chưa xong): ").strip()
             if not s:
-                self.actual_end_date = None
+                fields["actual_end_date"] = None
                 break
             try:
-                d = datetime.strptime(s, "%d/%m/%Y")
-                if d < self.start_date:
+                d = parse_dmy(s)
+                if d < fields["start_date"]:
                     print("Ngày thực tế phải >= ngày bắt đầu")
                     continue
-                self.actual_end_date = d
+                fields["actual_end_date"] = d
                 break
             except ValueError:
                 print("Sai định dạng ngày")
 
         while True:
             try:
-                self.budget = float(input("Ngân sách dự kiến: "))
-                if self.budget <= 0:
-                    print("Ngân sách phải > 0")
-                    continue
+                fields["budget"] = self._validate_budget(input("Ngân sách dự kiến: "))
                 break
-            except ValueError:
-                print("Phải là số")
+            except ValueError as e:
+                print(e)
 
         while True:
             print("Chọn trạng thái:")
@@ -153,71 +294,65 @@ class Project(ProjectItem):
             try:
                 choice = int(input("Chọn: "))
                 if 1 <= choice <= len(self.STATUS_LIST):
-                    self.status_project = self.STATUS_LIST[choice - 1]
+                    fields["status_project"] = self.STATUS_LIST[choice - 1]
                     break
             except ValueError:
                 print("Lựa chọn không hợp lệ")
 
-        if staff_manager:
-            while True:
-                pm_id = input("Nhập mã PM của dự án: ").strip()
-                if pm_id.lower() == "exit":
-                    return False
-                staff = staff_manager.find_by_id(pm_id)
-                if not staff:
-                    print("Nhân viên không tồn tại")
-                    continue
-                if getattr(staff, "management_title", "") != "Project Manager":
-                    print("Người nhập phải là Project Manager")
-                    continue
-                self.pm_id = pm_id
-                break
+        return fields
 
-        return True
-
-    # ================= UPDATE (THÊM MỚI – SỬA LỖI) =================
-    def update_info(self):
+    # ================= UPDATE =================
+    def update_fields(self):
+        """Chỉ trả về các trường được nhập mới (Enter = giữ nguyên)"""
         print("\n--- CẬP NHẬT DỰ ÁN ---")
+        fields = {}
 
         s = input(f"Tên dự án [{self.project_name}]: ").strip()
         if s:
-            self.project_name = s.title()
-            self.name = self.project_name
+            try:
+                fields["project_name"] = self._validate_name(s)
+            except ValueError as e:
+                print(e)
 
         s = input(f"Khách hàng [{self.customer}]: ").strip()
         if s:
-            self.customer = s.title()
+            try:
+                fields["customer"] = self._validate_customer(s)
+            except ValueError as e:
+                print(e)
 
         s = input(f"Mô tả [{self.description}]: ").strip()
         if s:
-            self.description = s
+            fields["description"] = s
 
         s = input("Ngày hoàn thành dự kiến (dd/mm/yyyy, Enter bỏ qua): ").strip()
         if s:
             try:
-                d = datetime.strptime(s, "%d/%m/%Y")
+                d = parse_dmy(s)
                 if d >= self.start_date:
-                    self.expected_end_date = d
+                    fields["expected_end_date"] = d
+                else:
+                    print("Ngày dự kiến phải >= ngày bắt đầu")
             except ValueError:
                 print("Sai định dạng ngày")
 
         s = input("Ngày hoàn thành thực tế (dd/mm/yyyy, Enter bỏ qua): ").strip()
         if s:
             try:
-                d = datetime.strptime(s, "%d/%m/%Y")
+                d = parse_dmy(s)
                 if d >= self.start_date:
-                    self.actual_end_date = d
+                    fields["actual_end_date"] = d
+                else:
+                    print("Ngày thực tế phải >= ngày bắt đầu")
             except ValueError:
                 print("Sai định dạng ngày")
 
         s = input(f"Ngân sách [{self.budget}]: ").strip()
         if s:
             try:
-                b = float(s)
-                if b > 0:
-                    self.budget = b
-            except ValueError:
-                print("Ngân sách phải là số")
+                fields["budget"] = self._validate_budget(s)
+            except ValueError as e:
+                print(e)
 
         print("Chọn trạng thái mới:")
         for i, st in enumerate(self.STATUS_LIST, 1):
@@ -227,8 +362,8 @@ class Project(ProjectItem):
             try:
                 idx = int(s)
                 if 1 <= idx <= len(self.STATUS_LIST):
-                    self.status_project = self.STATUS_LIST[idx - 1]
+                    fields["status_project"] = self.STATUS_LIST[idx - 1]
             except ValueError:
                 print("Lựa chọn không hợp lệ")
 
-        print("✅ Đã cập nhật dự án")
+        return fields
@@ -1,4 +1,7 @@
 import re
+import sys
+
+from models.fields import check_fields
 
 # ================= CONSTANT =================
 CAP_DO_HOP_LE = ["Intern", "Junior", "Senior"]
@@ -16,9 +19,17 @@ CHUC_DANH_QUAN_LY = ["Team Leader", "Project Manager"]
 class Staff:
     """
     Lớp Staff lưu thông tin cá nhân.
-    project_list và task_list chỉ dùng để hiển thị / lưu CSV
+    task_list chỉ dùng để hiển thị / lưu CSV
+    task_list được suy ra từ Task.assignee_id khi đã gắn task_source (TaskManager)
     """
 
+    __slots__ = (
+        "staff_id", "full_name", "age", "level", "role", "management_title",
+        "task_source", "_task_list",
+    )
+    # Cột được sửa qua apply_fields (mã nhân viên do StaffService kiểm tra)
+    EDITABLE_FIELDS = ("full_name", "age", "level", "role", "management_title")
+
     def __init__(
         self,
         staff_id="",
@@ -27,19 +38,30 @@ class Staff:
         level="",
         role="",
         management_title=None,
-        project_list=None,
         task_list=None
     ):
         self.staff_id = staff_id
         self.full_name = full_name
         self.age = age
-        self.level = level
-        self.role = role
-        self.management_title = management_title
+        # Cấp độ / vai trò / chức danh chỉ có vài giá trị → dùng chung 1 object chuỗi
+        self.level = sys.intern(level) if level else level
+        self.role = sys.intern(role) if role else role
+        self.management_title = sys.intern(management_title) if management_title else management_title
 
-        self.project_list = project_list or []
+        # Nguồn task (TaskManager) – None thì dùng danh sách đọc từ file
+        self.task_source = None
         self.task_list = task_list or []
 
+    @property
+    def task_list(self):
+        if self.task_source is not None:
+            return self.task_source.task_ids_of_staff(self.staff_id)
+        return self._task_list
+
+    @task_list.setter
+    def task_list(self, value):
+        self._task_list = list(value or [])
+
     # ================= CSV =================
     @staticmethod
     def csv_fields():
@@ -62,7 +84,8 @@ class Staff:
             "level": self.level,
             "role": self.role,
             "management_title": self.management_title or "",
-            "project_list": "|".join(self.project_list),
+            # Cột giữ lại cho đúng định dạng file, danh sách dự án suy ra từ task
+            "project_list": "",
             "task_list": "|".join(self.task_list),
         }
 
@@ -75,18 +98,50 @@ class Staff:
             level=data.get("level", ""),
             role=data.get("role", ""),
             management_title=data.get("management_title") or None,
-            project_list=[],
             task_list=[],
         )
 
+    # ================= HEADLESS =================
+    def apply_fields(self, fields):
+        """
+        Gán các trường có trong fields (không input)
+        Kiểm tra hết rồi mới gán → lỗi thì nhân viên không đổi gì
+        """
+        check_fields(fields, self.EDITABLE_FIELDS)
+        values = {}
+        if "full_name" in fields:
+            values["full_name"] = self.validate_name(str(fields["full_name"]).strip())
+        if "age" in fields:
+            try:
+                values["age"] = self.validate_age(fields["age"])
+            except (TypeError, ValueError):
+                raise ValueError("Tuổi không hợp lệ")
+        if "level" in fields:
+            values["level"] = self.validate_choice(
+                str(fields["level"]).strip().title(), CAP_DO_HOP_LE, "Cấp độ")
+        if "role" in fields:
+            values["role"] = self.validate_choice(
+                str(fields["role"]).strip().title(), VAI_TRO_HOP_LE, "Vai trò")
+        if "management_title" in fields:
+            values["management_title"] = self.validate_management_title(
+                str(fields["management_title"] or "").strip().title())
+
+        for key, value in values.items():
+            # Cấp độ / vai trò / chức danh dùng chung object chuỗi như __init__
+            if key in ("level", "role", "management_title") and value:
+                value = sys.intern(value)
+            setattr(self, key, value)
+
     # ================= INPUT =================
-    def input_info(self, staff_list):
-        """Nhập thông tin nhân viên mới"""
+    def input_fields(self, existing_staff_ids):
+        """Hỏi thông tin nhân viên mới → dict theo cột CSV (chưa gán vào object)"""
+        fields = {}
+
         # ===== STAFF ID =====
         while True:
             try:
                 value = input("Nhập mã NV (NV_00001): ").strip()
-                self.staff_id = self.validate_staff_id(value, staff_list)
+                fields["staff_id"] = self.validate_staff_id(value, existing_staff_ids)
                 break
             except ValueError as e:
                 print("Lỗi:", e)
@@ -95,7 +150,7 @@ class Staff:
         while True:
             try:
                 value = input("Nhập họ tên: ").strip()
-                self.full_name = self.validate_name(value)
+                fields["full_name"] = self.validate_name(value)
                 break
             except ValueError as e:
                 print("Lỗi:", e)
@@ -104,7 +159,7 @@ class Staff:
         while True:
             try:
                 value = input("Nhập tuổi: ").strip()
-                self.age = self.validate_age(value)
+                fields["age"] = self.validate_age(value)
                 break
             except ValueError as e:
                 print("Lỗi:", e)
@@ -114,7 +169,7 @@ class Staff:
             print("Cấp độ hợp lệ:", ", ".join(CAP_DO_HOP_LE))
             value = input("Nhập cấp độ: ").strip().title()
             if value in CAP_DO_HOP_LE:
-                self.level = value
+                fields["level"] = value
                 break
             print("Cấp độ không hợp lệ. Nhập lại.")
 
@@ -123,7 +178,7 @@ class Staff:
             print("Vai trò hợp lệ:", ", ".join(VAI_TRO_HOP_LE))
             value = input("Nhập vai trò: ").strip().title()
             if value in VAI_TRO_HOP_LE:
-                self.role = value
+                fields["role"] = value
                 break
             print("Vai trò không hợp lệ. Nhập lại.")
 
@@ -132,28 +187,41 @@ class Staff:
             print("Chức danh quản lý (Enter nếu không có):")
             print(", ".join(CHUC_DANH_QUAN_LY))
             value = input("Nhập chức danh: ").strip().title()
-            if value == "":
-                self.management_title = None
-                break
-            if value in CHUC_DANH_QUAN_LY:
-                self.management_title = value
+            if value == "" or value in CHUC_DANH_QUAN_LY:
+                fields["management_title"] = value
                 break
             print("Chức danh quản lý không hợp lệ. Nhập lại hoặc Enter để bỏ qua.")
 
+        return fields
+
     # ================= UPDATE =================
-    def update_info(self):
+    def update_fields(self):
+        """Hỏi các trường cần sửa → dict chỉ gồm trường thay đổi (chưa gán vào object)"""
         print("\n--- CẬP NHẬT NHÂN VIÊN ---")
         print("(Enter để giữ nguyên giá trị cũ)\n")
+        fields = {}
 
         # Họ tên
-        name = input(f"Họ tên ({self.full_name}): ").strip()
-        if name:
-            self.full_name = self.validate_name(name)
+        while True:
+            name = input(f"Họ tên ({self.full_name}): ").strip()
+            if name == "":
+                break
+            try:
+                fields["full_name"] = self.validate_name(name)
+                break
+            except ValueError as e:
+                print("Lỗi:", e)
 
         # Tuổi
-        age = input(f"Tuổi ({self.age}): ").strip()
-        if age:
-            self.age = self.validate_age(age)
+        while True:
+            age = input(f"Tuổi ({self.age}): ").strip()
+            if age == "":
+                break
+            try:
+                fields["age"] = self.validate_age(age)
+                break
+            except ValueError as e:
+                print("Lỗi:", e)
 
         # Cấp độ
         while True:
@@ -162,7 +230,7 @@ class Staff:
             if new_lv == "":
                 break
             if new_lv in CAP_DO_HOP_LE:
-                self.level = new_lv
+                fields["level"] = new_lv
                 break
             print("Cấp độ không hợp lệ. Nhập lại.")
             print("Cấp độ hợp lệ:", ", ".join(CAP_DO_HOP_LE))
@@ -174,7 +242,7 @@ class Staff:
             if new_role == "":
                 break
             if new_role in VAI_TRO_HOP_LE:
-                self.role = new_role
+                fields["role"] = new_role
                 break
             print("Vai trò không hợp lệ. Nhập lại.")
             print("Vai trò hợp lệ:", ", ".join(VAI_TRO_HOP_LE))
@@ -187,17 +255,17 @@ class Staff:
             if mt == "":
                 break
             if mt in CHUC_DANH_QUAN_LY:
-                self.management_title = mt
+                fields["management_title"] = mt
                 break
             print("Chức danh quản lý không hợp lệ. Nhập lại hoặc Enter để bỏ qua.")
 
-        print("Đã cập nhật thông tin nhân viên.")
+        return fields
 
     # ================= VALIDATE =================
-    def validate_staff_id(self, ma_nv, staff_list):
+    def validate_staff_id(self, ma_nv, existing_staff_ids):
         if not re.match(r"^NV_\d{5}$", ma_nv):
             raise ValueError("Mã nhân viên phải theo định dạng NV_00001")
-        if any(s.staff_id == ma_nv for s in staff_list):
+        if ma_nv in existing_staff_ids:
             raise ValueError("Mã nhân viên đã tồn tại")
         return ma_nv
 
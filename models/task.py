@@ -1,12 +1,32 @@
 import re
 import csv
+import sys
 from datetime import datetime
+from models.date_codec import format_dmy, parse_dmy
+from models.fields import check_fields
+from models.lazy_field import LazyField
 from models.ProjectItem import ProjectItem
 
+
+def _decode_date(s):
+    # Ngày sai định dạng → ValueError, LazyField giữ chuỗi gốc và đọc ra None
+    return parse_dmy(s) if s else None
+
+
 # ================= Task =================
 class Task(ProjectItem):
     PRIORITY_LEVELS = ["Low", "Medium", "High", "Critical"]
     STATUS_LIST = ["To Do", "In Progress", "Completed", "Cancelled"]
+    # Cột được sửa qua apply_fields (mã task / dự án không đổi, completed_date tự tính)
+    EDITABLE_FIELDS = ("task_name", "task_description", "assignee_id",
+                       "start_date", "deadline", "priority", "status_task")
+
+    __slots__ = ("project_id", "assignee_id", "_deadline", "_completed_date", "priority", "status_task")
+
+    # Ngày nạp từ file được giải mã ở lần đọc đầu tiên
+    start_date = LazyField(_decode_date, format_dmy, slot="start_date")
+    deadline = LazyField(_decode_date, format_dmy, slot="_deadline")
+    completed_date = LazyField(_decode_date, format_dmy, slot="_completed_date")
 
     def __init__(self, project_id="", task_id="", task_name="", description="", 
                  assignee_id="Unassigned", start_date=None, deadline=None, completed_date=None, 
@@ -23,6 +43,15 @@ class Task(ProjectItem):
         self.priority = priority
         self.status_task = status_task
 
+    @classmethod
+    def full_status_counts(cls, counts):
+        """Đủ mọi trạng thái trong STATUS_LIST (0 nếu không có task) + trạng thái lạ còn task"""
+        result = {status: counts.get(status, 0) for status in cls.STATUS_LIST}
+        for status, n in counts.items():
+            if n and status not in result:
+                result[status] = n
+        return result
+
     # ================= CSV =================
     @staticmethod
     def csv_fields():
@@ -39,33 +68,56 @@ class Task(ProjectItem):
             "task_name": self.name,
             "task_description": self.description,
             "assignee_id": self.assignee_id,
-            "start_date": self.start_date.strftime("%d/%m/%Y") if self.start_date else "",
-            "deadline": self.deadline.strftime("%d/%m/%Y") if self.deadline else "",
-            "completed_date": self.completed_date.strftime("%d/%m/%Y") if self.completed_date else "",
+            "start_date": Task.start_date.encode(self),
+            "deadline": Task.deadline.encode(self),
+            "completed_date": Task.completed_date.encode(self),
             "priority": self.priority,
             "status_task": self.status_task,
         }
 
     @classmethod
     def from_dict(cls, data):
-        def parse_date(s):
-            try:
-                return datetime.strptime(s, "%d/%m/%Y") if s else None
-            except ValueError:
-                return None
-        return cls(
-            project_id=data.get("project_id", ""),
+        # Chuỗi lặp lại giữa các task (dự án, người làm, ưu tiên, trạng thái) dùng chung 1 object
+        task = cls(
+            project_id=sys.intern(data.get("project_id", "")),
             task_id=data.get("task_id", ""),
             task_name=data.get("task_name", ""),
             description=data.get("task_description", ""),
-            assignee_id=data.get("assignee_id", "Unassigned"),
-            start_date=parse_date(data.get("start_date", "")),
-            deadline=parse_date(data.get("deadline", "")),
-            completed_date=parse_date(data.get("completed_date", "")),
-            priority=data.get("priority", "Low"),
-            status_task=data.get("status_task", "To Do"),
+            assignee_id=sys.intern(data.get("assignee_id", "Unassigned")),
+            priority=sys.intern(data.get("priority", "Low")),
+            status_task=sys.intern(data.get("status_task", "To Do")),
         )
+        cls.start_date.load(task, data.get("start_date", ""))
+        cls.deadline.load(task, data.get("deadline", ""))
+        cls.completed_date.load(task, data.get("completed_date", ""))
+        return task
+
+    @classmethod
+    def from_dict_lazy(cls, data):
+        """Như from_dict nhưng chưa giải mã ngày – giữ chuỗi gốc cho tới lần đọc đầu"""
+        task = cls.__new__(cls)
+        task.id = data.get("task_id", "")
+        task.name = data.get("task_name", "")
+        task.description = data.get("task_description", "")
+        task.project_id = sys.intern(data.get("project_id", ""))
+        task.assignee_id = sys.intern(data.get("assignee_id", "Unassigned"))
+        task.priority = sys.intern(data.get("priority", "Low"))
+        task.status_task = sys.intern(data.get("status_task", "To Do"))
+        # Nhiều task chung ngày → intern để dùng chung chuỗi
+        cls.start_date.set_raw(task, sys.intern(data.get("start_date", "")))
+        cls.deadline.set_raw(task, sys.intern(data.get("deadline", "")))
+        cls.completed_date.set_raw(task, sys.intern(data.get("completed_date", "")))
+        return task
 
+    # ================= TRẠNG THÁI =================
+    def is_completed_late(self):
+        """
+        Hoàn thành sau deadline – so theo ngày (deadline là cả ngày đó),
+        giờ của completed_date không tính. TaskColumns dùng cùng quy tắc.
+        """
+        if not self.deadline or not self.completed_date:
+            return False
+        return self.completed_date.date() > self.deadline.date()
 
     # ================= VALIDATION =================
     def _validate_name(self, name):
@@ -85,25 +137,102 @@ class Task(ProjectItem):
             raise ValueError(f"{field_name} không hợp lệ")
         return value
 
+    def _validate_dates(self, start_date, deadline, project=None):
+        if not start_date or not deadline:
+            raise ValueError("Thiếu ngày bắt đầu / deadline")
+        if deadline < start_date:
+            raise ValueError("Deadline phải ≥ ngày bắt đầu task")
+        if project:
+            if project.start_date and start_date < project.start_date:
+                raise ValueError(
+                    f"Ngày bắt đầu task phải ≥ ngày bắt đầu dự án ({project.start_date.strftime('%d/%m/%Y')})"
+                )
+            max_end = project.expected_end_date
+            if max_end and deadline > max_end:
+                raise ValueError(f"Deadline phải ≤ ngày kết thúc dự án ({max_end.strftime('%d/%m/%Y')})")
+
+    @staticmethod
+    def _to_date(value, field_name):
+        if value is None or isinstance(value, datetime):
+            return value
+        value = str(value).strip()
+        if not value:
+            return None
+        try:
+            return parse_dmy(value)
+        except ValueError:
+            raise ValueError(f"{field_name} sai định dạng (dd/mm/yyyy)")
+
+    # ================= HEADLESS =================
+    def apply_fields(self, fields, staff_list, project=None):
+        """
+        Gán thông tin task từ dict (không input) – dữ liệu sai thì raise ValueError
+        và task giữ nguyên. Khóa giống cột CSV: task_name, task_description,
+        assignee_id, start_date, deadline, priority, status_task
+        """
+        check_fields(fields, self.EDITABLE_FIELDS)
+        name = self.name
+        if "task_name" in fields:
+            name = self._validate_name(str(fields["task_name"]).strip())
+
+        assignee_id = self.assignee_id
+        if "assignee_id" in fields:
+            assignee_id = str(fields["assignee_id"] or "").strip() or "Unassigned"
+            if assignee_id != "Unassigned":
+                assignee_id = self._validate_assignee(assignee_id, staff_list)
+
+        start_date = self.start_date
+        if "start_date" in fields:
+            start_date = self._to_date(fields["start_date"], "Ngày bắt đầu")
+        deadline = self.deadline
+        if "deadline" in fields:
+            deadline = self._to_date(fields["deadline"], "Deadline")
+        self._validate_dates(start_date, deadline, project)
+
+        priority = self.priority
+        if "priority" in fields:
+            priority = self._validate_choice(fields["priority"], self.PRIORITY_LEVELS, "Priority")
+        status = self.status_task
+        if "status_task" in fields:
+            status = self._validate_choice(fields["status_task"], self.STATUS_LIST, "Status")
+
+        self.name = name
+        if "task_description" in fields:
+            self.description = str(fields["task_description"]).strip()
+        self.assignee_id = assignee_id
+        self.start_date = start_date
+        self.deadline = deadline
+        self.priority = priority
+        self.status_task = status
+
+        # Ngày hoàn thành tự động
+        if self.status_task == "Completed" and not self.completed_date:
+            self.completed_date = datetime.now()
+        elif self.status_task != "Completed":
+            self.completed_date = None
+
     # ================= INPUT =================
-    def input_info(self, staff_list, project=None):
+    # Chỉ hỏi và kiểm tra từng trường để nhập lại ngay khi sai; không sửa task.
+    # Trả về dict trường cho TaskService.create / update (kiểm tra lần cuối + ghi)
+    def input_fields(self, staff_list, project=None):
+        fields = {}
+
         # 1. Tên công việc
         while True:
             try:
-                name = input("Tên công việc: ").strip()
-                self.name = self._validate_name(name)
+                fields["task_name"] = self._validate_name(input("Tên công việc: ").strip())
                 break
             except ValueError as e:
                 print("Lỗi:", e)
 
         # 2. Mô tả
-        self.description = input("Mô tả: ").strip()
+        fields["task_description"] = input("Mô tả: ").strip()
 
         # 3. Người phụ trách
         while True:
             aid = input("Mã nhân viên phụ trách (NV_00001): ").strip()
             try:
-                self.assignee_id = self._validate_assignee(aid, staff_list)
+                fields["assignee_id"] = self._validate_assignee(aid, staff_list)
                 break
             except ValueError as e:
                 print("Lỗi:", e)
@@ -111,12 +240,11 @@ class Task(ProjectItem):
         # 4. Ngày bắt đầu task
         while True:
             try:
-                s_str = input("Ngày bắt đầu (dd/mm/yyyy): ").strip()
-                s_date = datetime.strptime(s_str, "%d/%m/%Y")
+                s_date = parse_dmy(input("Ngày bắt đầu (dd/mm/yyyy): ").strip())
                 if project and project.start_date and s_date < project.start_date:
                     print(f"Ngày bắt đầu task phải ≥ ngày bắt đầu dự án ({project.start_date.strftime('%d/%m/%Y')})")
                     continue
-                self.start_date = s_date
+                fields["start_date"] = s_date
                 break
             except ValueError:
                 print("Ngày không hợp lệ. Nhập lại.")
@@ -124,26 +252,18 @@ class Task(ProjectItem):
         # 5. Deadline
         while True:
             try:
-                dl_str = input("Deadline (dd/mm/yyyy): ").strip()
-                dl = datetime.strptime(dl_str, "%d/%m/%Y")
-                if dl < self.start_date:
-                    print("Deadline phải ≥ ngày bắt đầu task")
-                    continue
-                if project:
-                    max_end = project.expected_end_date
-                    if max_end and dl > max_end:
-                        print(f"Deadline phải ≤ ngày kết thúc dự án ({max_end.strftime('%d/%m/%Y')})")
-                        continue
-                self.deadline = dl
+                dl = parse_dmy(input("Deadline (dd/mm/yyyy): ").strip())
+                self._validate_dates(fields["start_date"], dl, project)
+                fields["deadline"] = dl
                 break
-            except ValueError:
-                print("Ngày không hợp lệ. Nhập lại.")
+            except ValueError as e:
+                print("Lỗi:", e)
 
         # 6. Priority
         while True:
             try:
                 p = input(f"Priority ({'/'.join(self.PRIORITY_LEVELS)}): ").strip()
-                self.priority = self._validate_choice(p, self.PRIORITY_LEVELS, "Priority")
+                fields["priority"] = self._validate_choice(p, self.PRIORITY_LEVELS, "Priority")
                 break
             except ValueError as e:
                 print("Lỗi:", e)
@@ -152,18 +272,18 @@ class Task(ProjectItem):
         while True:
             try:
                 s = input(f"Status ({'/'.join(self.STATUS_LIST)}): ").strip()
-                self.status_task = self._validate_choice(s, self.STATUS_LIST, "Status")
+                fields["status_task"] = self._validate_choice(s, self.STATUS_LIST, "Status")
                 break
             except ValueError as e:
                 print("Lỗi:", e)
 
-        # Nếu Completed mà chưa có ngày hoàn thành
-        if self.status_task == "Completed" and not self.completed_date:
-            self.completed_date = datetime.now()
+        return fields
 
     # ================= UPDATE =================
-    def update_info(self, staff_list, project=None):
+    def update_fields(self, staff_list, project=None):
+        """Chỉ trả về các trường được nhập mới (Enter = giữ nguyên)"""
         print("\n--- CẬP NHẬT TASK (Enter để bỏ qua) ---")
+        fields = {}
 
         # 1. Tên
         while True:
@@ -171,7 +291,7 @@ class Task(ProjectItem):
             if not new_name:
                 break
             try:
-                self.name = self._validate_name(new_name)
+                fields["task_name"] = self._validate_name(new_name)
                 break
             except ValueError as e:
                 print(f"Lỗi: {e}. Nhập lại hoặc Enter để bỏ qua.")
@@ -179,7 +299,7 @@ class Task(ProjectItem):
         # 2. Mô tả
         new_desc = input(f"Mô tả ({self.description}): ").strip()
         if new_desc:
-            self.description = new_desc
+            fields["task_description"] = new_desc
 
         # 3. Người phụ trách
         while True:
@@ -187,7 +307,7 @@ class Task(ProjectItem):
             if not new_aid:
                 break
             try:
-                self.assignee_id = self._validate_assignee(new_aid, staff_list)
+                fields["assignee_id"] = self._validate_assignee(new_aid, staff_list)
                 break
             except ValueError as e:
                 print(f"Lỗi: {e}. Nhập lại hoặc Enter để bỏ qua.")
@@ -198,36 +318,28 @@ class Task(ProjectItem):
             if not new_s:
                 break
             try:
-                s_date = datetime.strptime(new_s, "%d/%m/%Y")
+                s_date = parse_dmy(new_s)
                 if project and project.start_date and s_date < project.start_date:
                     print(f"Ngày bắt đầu task phải ≥ ngày bắt đầu dự án. Nhập lại hoặc Enter để bỏ qua.")
                 else:
-                    self.start_date = s_date
+                    fields["start_date"] = s_date
                     break
             except ValueError:
                 print("Ngày không hợp lệ. Nhập lại hoặc Enter để bỏ qua.")
 
         # 5. Deadline
+        start_date = fields.get("start_date", self.start_date)
         while True:
             new_dl = input(f"Deadline ({self.deadline.strftime('%d/%m/%Y') if self.deadline else ''}): ").strip()
             if not new_dl:
                 break
             try:
-                dl = datetime.strptime(new_dl, "%d/%m/%Y")
-                if dl < self.start_date:
-                    print("Deadline phải ≥ ngày bắt đầu task. Nhập lại hoặc Enter để bỏ qua.")
-                elif project:
-                    max_end = project.actual_end_date or project.expected_end_date
-                    if max_end and dl > max_end:
-                        print("Deadline phải ≤ ngày kết thúc dự án. Nhập lại hoặc Enter để bỏ qua.")
-                    else:
-                        self.deadline = dl
-                        break
-                else:
-                    self.deadline = dl
-                    break
-            except ValueError:
-                print("Ngày không hợp lệ. Nhập lại hoặc Enter để bỏ qua.")
+                dl = parse_dmy(new_dl)
+                self._validate_dates(start_date, dl, project)
+                fields["deadline"] = dl
+                break
+            except ValueError as e:
+                print(f"Lỗi: {e}. Nhập lại hoặc Enter để bỏ qua.")
 
         # 6. Priority
         while True:
@@ -235,7 +347,7 @@ class Task(ProjectItem):
             if not new_priority:
                 break
             try:
-                self.priority = self._validate_choice(new_priority, self.PRIORITY_LEVELS, "Priority")
+                fields["priority"] = self._validate_choice(new_priority, self.PRIORITY_LEVELS, "Priority")
                 break
             except ValueError as e:
                 print(f"Lỗi: {e}. Nhập lại hoặc Enter để bỏ qua.")
@@ -246,17 +358,12 @@ class Task(ProjectItem):
             if not new_status:
                 break
             try:
-                self.status_task = self._validate_choice(new_status, self.STATUS_LIST, "Status")
+                fields["status_task"] = self._validate_choice(new_status, self.STATUS_LIST, "Status")
                 break
             except ValueError as e:
                 print(f"Lỗi: {e}. Nhập lại hoặc Enter để bỏ qua.")
 
-
-        # Ngày hoàn thành tự động
-        if self.status_task == "Completed" and not self.completed_date:
-            self.completed_date = datetime.now()
-        elif self.status_task != "Completed":
-            self.completed_date = None
+        return fields
 
     # ================= DISPLAY =================
     def display_info(self):
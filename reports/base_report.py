@@ -1,8 +1,11 @@
 from abc import ABC
 from datetime import datetime
+from models.date_codec import format_datetime
 import csv
 import os
 
+import instrumentation
+
 
 class BaseReport(ABC):
     def __init__(self, report_id, project_id, author_id, created_date=None):
@@ -18,18 +21,46 @@ class BaseReport(ABC):
             "report_id": self.report_id,
             "project_id": self.project_id,
             "author_id": self.author_id,
-            "created_date": self.created_date.strftime("%Y-%m-%d %H:%M:%S")
+            "created_date": format_datetime(self.created_date)
         }
 
     # ================= CSV =================
     @staticmethod
     def load_from_csv(filename):
         """Đọc CSV và trả về danh sách dict"""
+        return list(BaseReport.iter_rows(filename))
+
+    @staticmethod
+    def iter_rows(filename):
+        """Duyệt lần lượt từng dòng (dict) của file CSV, không nạp cả file"""
         if not os.path.exists(filename):
-            return []
+            return
         with open(filename, mode="r", newline="", encoding="utf-8") as file:
-            reader = csv.DictReader(file)
-            return list(reader)
+            count = 0
+            try:
+                for row in csv.DictReader(file):
+                    count += 1
+                    yield row
+            finally:
+                # Dừng sớm (next / break) → chỉ tính phần đã đọc
+                instrumentation.record_rows(count)
+                instrumentation.record_bytes_read(file.buffer.tell())
+
+    @staticmethod
+    def iter_matching(filename, predicate):
+        """Duyệt các dòng thỏa predicate(row) – dừng sớm được bằng break / next()"""
+        return (row for row in BaseReport.iter_rows(filename) if predicate(row))
+
+    @staticmethod
+    def iter_by_project(filename, project_id, index=None):
+        """
+        Duyệt các dòng báo cáo của 1 dự án
+        - Có ReportIndex → chỉ đọc đúng các dòng của dự án
+        - Không có → quét tuần tự file
+        """
+        if index is not None:
+            return index.iter_rows_for_project(project_id)
+        return BaseReport.iter_matching(filename, lambda r: r.get("project_id") == project_id)
 
     @staticmethod
     def save_to_csv(filename, data_list):
@@ -40,12 +71,51 @@ class BaseReport(ABC):
             writer = csv.DictWriter(file, fieldnames=data_list[0].keys())
             writer.writeheader()
             writer.writerows(data_list)
+            instrumentation.record_bytes_written(file.tell())
+
+    @staticmethod
+    def read_header(filename):
+        """Đọc dòng header của file CSV (list rỗng nếu file chưa có)"""
+        if not os.path.exists(filename):
+            return []
+        with open(filename, mode="r", newline="", encoding="utf-8") as file:
+            return next(csv.reader(file), [])
+
+    @staticmethod
+    def csv_fields():
+        return ["report_id", "project_id", "author_id", "created_date"]
 
     # ================= CÁC PHƯƠNG THỨC =================
     def add_item(self, filename):
-        data = BaseReport.load_from_csv(filename)
-        data.append(self.as_dict())
-        BaseReport.save_to_csv(filename, data)
+        """Ghi thêm 1 dòng vào cuối file, chỉ ghi header khi file mới"""
+        row = self.as_dict()
+        fieldnames = self.csv_fields()
+
+        is_new = not os.path.exists(filename) or os.path.getsize(filename) == 0
+        if not is_new:
+            header = BaseReport.read_header(filename)
+            if set(header) != set(fieldnames):
+                raise ValueError(
+                    f"Cấu trúc file {filename} không khớp. "
+                    f"Cần các cột: {', '.join(fieldnames)}"
+                )
+            # Giữ nguyên thứ tự cột đang có trong file
+            fieldnames = header
+
+        with open(filename, mode="a+b") as file:
+            # Dòng cuối thiếu ký tự xuống dòng → bổ sung trước khi ghi nối
+            if not is_new:
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) not in (b"\n", b"\r"):
+                    file.write(b"\r\n")
+
+        with open(filename, mode="a", newline="", encoding="utf-8") as file:
+            start = file.tell()
+            writer = csv.DictWriter(file, fieldnames=fieldnames)
+            if is_new:
+                writer.writeheader()
+            writer.writerow(row)
+            instrumentation.record_bytes_written(file.tell() - start)
         return True
 
     @staticmethod
@@ -62,16 +132,37 @@ class BaseReport(ABC):
 
     @staticmethod
     def delete_item(filename, report_id):
-        data = BaseReport.load_from_csv(filename)
-        new_data = [r for r in data if r["report_id"] != report_id]
-        BaseReport.save_to_csv(filename, new_data)
-        return True
+        """Chép từng dòng sang file tạm (bỏ dòng cần xóa) rồi thay file gốc"""
+        header = BaseReport.read_header(filename)
+        if not header:
+            return False
+
+        found = False
+        tmp = filename + ".tmp"
+        with open(tmp, mode="w", newline="", encoding="utf-8") as out:
+            writer = csv.DictWriter(out, fieldnames=header)
+            writer.writeheader()
+            for row in BaseReport.iter_rows(filename):
+                if row["report_id"] == report_id:
+                    found = True
+                    continue
+                writer.writerow(row)
+            instrumentation.record_bytes_written(out.tell())
+
+        if found:
+            os.replace(tmp, filename)
+        else:
+            os.remove(tmp)
+        return found
 
     @staticmethod
     def search_item(filename, keyword):
-        data = BaseReport.load_from_csv(filename)
+        """Duyệt lazy các báo cáo có mã báo cáo / mã dự án chứa keyword"""
         keyword = keyword.lower()
-        return [r for r in data if keyword in r["report_id"].lower() or keyword in r["project_id"].lower()]
+        return BaseReport.iter_matching(
+            filename,
+            lambda r: keyword in r["report_id"].lower() or keyword in r["project_id"].lower()
+        )
 
     # ================= HIỂN THỊ =================
     def format_display(self):
@@ -1,5 +1,6 @@
 import csv
 from datetime import datetime
+from models.date_codec import format_dmy, parse_any, parse_datetime
 from reports.base_report import BaseReport
 
 
@@ -78,17 +79,14 @@ class FinalReport(BaseReport):
 
         self._validate_report_date()
 
-        tasks = [t for t in task_manager.task_list if t.project_id == self.project_id]
+        tasks = task_manager.tasks_of_project(self.project_id)
+        counts = task_manager.status_counts(self.project_id)
 
-        self.total_tasks = len(tasks)
-        self.completed_tasks = len([t for t in tasks if t.status_task == "Completed"])
-        self.cancelled_tasks = len([t for t in tasks if t.status_task == "Cancelled"])
+        self.total_tasks = sum(counts.values())
+        self.completed_tasks = counts.get("Completed", 0)
+        self.cancelled_tasks = counts.get("Cancelled", 0)
 
-        self.overdue_tasks = 0
-        for t in tasks:
-            if t.deadline and t.completed_date:
-                if self._parse_date(t.completed_date) > self._parse_date(t.deadline):
-                    self.overdue_tasks += 1
+        self.overdue_tasks = sum(1 for t in tasks if t.is_completed_late())
 
         self.ontime_tasks = max(0, self.completed_tasks - self.overdue_tasks)
 
@@ -115,15 +113,7 @@ class FinalReport(BaseReport):
             )
 
     def _parse_date(self, d):
-        if isinstance(d, datetime):
-            return d
-        if isinstance(d, str):
-            for fmt in ("%Y-%m-%d", "%d/%m/%Y"):
-                try:
-                    return datetime.strptime(d, fmt)
-                except ValueError:
-                    pass
-        return None
+        return parse_any(d)
 
     # ======================================================
     # LOAD FROM CSV
@@ -144,9 +134,7 @@ class FinalReport(BaseReport):
 
         created_raw = data.get("created_date")
         try:
-            created_date = datetime.strptime(
-                created_raw, "%Y-%m-%d %H:%M:%S"
-            ) if created_raw else datetime.now()
+            created_date = parse_datetime(created_raw) if created_raw else datetime.now()
         except ValueError:
             created_date = datetime.now()
 
@@ -158,8 +146,8 @@ class FinalReport(BaseReport):
             stats={
                 "project_name": data.get("project_name", ""),
                 "customer": data.get("customer", ""),
-                "project_start_date": data.get("project_start_date"),
-                "actual_end_date": data.get("actual_end_date"),
+                "project_start_date": parse_any(data.get("project_start_date")),
+                "actual_end_date": parse_any(data.get("actual_end_date")),
                 "duration_days": safe_int(data.get("duration_days")),
                 "total_tasks": safe_int(data.get("total_tasks")),
                 "completed_tasks": safe_int(data.get("completed_tasks")),
@@ -205,14 +193,12 @@ class FinalReport(BaseReport):
         ]
 
     def as_dict(self):
-        def fmt(d): return d.strftime("%d/%m/%Y") if d else ""
-
         data = super().as_dict()
         data.update({
             "project_name": self.project_name,
             "customer": self.customer,
-            "project_start_date": fmt(self.project_start_date),
-            "actual_end_date": fmt(self.actual_end_date),
+            "project_start_date": format_dmy(self.project_start_date),
+            "actual_end_date": format_dmy(self.actual_end_date),
             "duration_days": self.duration_days,
             "total_tasks": self.total_tasks,
             "completed_tasks": self.completed_tasks,
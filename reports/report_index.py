@@ -0,0 +1,221 @@
+# reports/report_index.py
+import csv
+import json
+import os
+
+import instrumentation
+
+
+class ReportIndex:
+    """
+    Index vị trí byte của từng dòng trong file báo cáo CSV
+    - report_id  -> offset
+    - project_id -> [offset, ...]
+
+    Lưu ra file phụ <file>.idx. Khi kích thước / mtime của file CSV thay đổi
+    thì index tự cập nhật ở lần tra cứu kế tiếp: file chỉ được ghi thêm vào cuối
+    → quét tiếp từ kích thước cũ; file bị ghi lại → dựng lại toàn bộ.
+
+    keep_rows=True (server): các dòng đã đọc được giữ trong bộ nhớ, tra cứu sau
+    không đọc lại file cho tới khi file đổi
+    """
+
+    TAIL_BYTES = 64
+
+    def __init__(self, filename, keep_rows=False):
+        self.filename = filename
+        self.index_file = filename + ".idx"
+        self.keep_rows = keep_rows
+        self._signature = None
+        # TAIL_BYTES byte cuối của phần file đã index (hex)
+        self._tail = ""
+        self._header = []
+        self._by_report = {}
+        self._by_project = {}
+        # offset -> dòng (dict), chỉ dùng khi keep_rows
+        self._rows = None
+
+    # ================= TRA CỨU =================
+    def get(self, report_id):
+        """Dòng báo cáo (dict) theo mã, None nếu không có"""
+        if not self._ensure():
+            return None
+        offset = self._by_report.get(report_id)
+        if offset is None:
+            return None
+        if self.keep_rows:
+            return self._row_cache()[offset]
+        with open(self.filename, "rb") as f:
+            return self._read_at(f, offset)
+
+    def iter_rows_for_project(self, project_id):
+        """Duyệt lazy các dòng báo cáo của 1 dự án, theo thứ tự trong file"""
+        if not self._ensure():
+            return
+        offsets = self._by_project.get(project_id, [])
+        if self.keep_rows:
+            rows = self._row_cache()
+            for offset in offsets:
+                yield rows[offset]
+            return
+        with open(self.filename, "rb") as f:
+            for offset in offsets:
+                yield self._read_at(f, offset)
+
+    def all_rows(self):
+        """Mọi dòng báo cáo (dict) theo thứ tự trong file"""
+        if not self._ensure():
+            return []
+        rows = self._row_cache() if self.keep_rows else self._read_rows()
+        return list(rows.values())
+
+    def _row_cache(self):
+        if self._rows is None:
+            self._rows = self._read_rows()
+        return self._rows
+
+    def _read_rows(self):
+        offsets = sorted(set(self._by_report.values()).union(*self._by_project.values()))
+        with open(self.filename, "rb") as f:
+            return {offset: self._read_at(f, offset) for offset in offsets}
+
+    def _read_at(self, f, offset):
+        f.seek(offset)
+        record = self._read_record(f)
+        instrumentation.record_rows(1)
+        instrumentation.record_bytes_read(len(record))
+        values = next(csv.reader([record.decode("utf-8")]), [])
+        return dict(zip(self._header, values))
+
+    @staticmethod
+    def _read_record(f):
+        # 1 bản ghi CSV có thể trải nhiều dòng nếu ô có xuống dòng trong dấu "
+        record = f.readline()
+        while record.count(b'"') % 2 == 1:
+            more = f.readline()
+            if not more:
+                break
+            record += more
+        return record
+
+    # ================= DỰNG / NẠP INDEX =================
+    def _current_signature(self):
+        try:
+            st = os.stat(self.filename)
+        except FileNotFoundError:
+            return None
+        return [st.st_size, st.st_mtime_ns]
+
+    def _ensure(self):
+        """Đảm bảo index khớp với file CSV; False nếu file không tồn tại"""
+        signature = self._current_signature()
+        if signature is None:
+            return False
+        if signature == self._signature:
+            return True
+        if self._signature is None:
+            # Lần đầu: nạp index đã lưu (kể cả khi file đã được ghi thêm sau đó)
+            self._load_sidecar()
+            if signature == self._signature:
+                return True
+        if self._only_appended(signature):
+            # Chỉ ghi thêm vào cuối (add_item) → offset cũ vẫn đúng, quét phần mới
+            self._extend(signature)
+        else:
+            # File bị ghi lại → offset cũ không còn đúng
+            self._rows = None
+            self._rebuild(signature)
+        return True
+
+    def _load_sidecar(self):
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            signature, tail = data["signature"], data["tail"]
+            header, by_report, by_project = data["header"], data["reports"], data["projects"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+
+        self._signature = signature
+        self._tail = tail
+        self._header = header
+        self._by_report = by_report
+        self._by_project = by_project
+
+    def _tail_at(self, size):
+        """TAIL_BYTES byte cuối của file tính tới vị trí size – nhận ra file bị ghi lại"""
+        start = max(0, size - self.TAIL_BYTES)
+        with open(self.filename, "rb") as f:
+            f.seek(start)
+            return f.read(size - start).hex()
+
+    def _only_appended(self, signature):
+        """File chỉ dài thêm so với lần index trước, phần cũ giữ nguyên?"""
+        if self._signature is None or not self._header or signature[0] <= self._signature[0]:
+            return False
+        return self._tail_at(self._signature[0]) == self._tail
+
+    def _rebuild(self, signature):
+        with open(self.filename, "rb") as f:
+            header_line = self._read_record(f)
+            self._header = next(csv.reader([header_line.decode("utf-8-sig")]), [])
+            self._by_report = {}
+            self._by_project = {}
+            self._scan(f)
+        self._finish(signature)
+
+    def _extend(self, signature):
+        with open(self.filename, "rb") as f:
+            f.seek(self._signature[0])
+            offsets = self._scan(f)
+            if self._rows is not None:
+                for offset in offsets:
+                    self._rows[offset] = self._read_at(f, offset)
+        self._finish(signature)
+
+    def _scan(self, f):
+        """Đọc từ vị trí hiện tại tới cuối file, thêm offset vào index; trả về các offset mới"""
+        header = self._header
+        rid_col = header.index("report_id") if "report_id" in header else None
+        pid_col = header.index("project_id") if "project_id" in header else None
+
+        start = f.tell()
+        offsets = []
+        while True:
+            offset = f.tell()
+            record = self._read_record(f)
+            if not record:
+                break
+            if not record.strip():
+                continue
+            values = next(csv.reader([record.decode("utf-8")]), [])
+            if rid_col is not None and rid_col < len(values):
+                self._by_report[values[rid_col]] = offset
+            if pid_col is not None and pid_col < len(values):
+                self._by_project.setdefault(values[pid_col], []).append(offset)
+            offsets.append(offset)
+        instrumentation.record_rows(len(offsets))
+        instrumentation.record_bytes_read(f.tell() - start)
+        return offsets
+
+    def _finish(self, signature):
+        self._signature = signature
+        self._tail = self._tail_at(signature[0])
+        self._save_sidecar()
+
+    def _save_sidecar(self):
+        data = {
+            "signature": self._signature,
+            "tail": self._tail,
+            "header": self._header,
+            "reports": self._by_report,
+            "projects": self._by_project,
+        }
+        tmp = self.index_file + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp, self.index_file)
+        except OSError:
+            # Không ghi được file phụ → vẫn dùng index trong bộ nhớ
+            pass
@@ -1,5 +1,6 @@
 from reports.base_report import BaseReport
-from datetime import datetime, timedelta
+from datetime import timedelta
+from models.date_codec import format_iso
 
 
 class WeeklyReport(BaseReport):
@@ -19,10 +20,13 @@ class WeeklyReport(BaseReport):
         report_date,
         period_start_date,
         period_end_date,
-        is_loading=False
+        is_loading=False,
+        period_index=None
     ):
         # ================= PROJECT ID =================
         self.p_id = getattr(project, "project_id", getattr(project, "id", ""))
+        # WeeklyPeriodIndex của manager (nếu có) → kiểm tra trùng mã không cần đọc file
+        self.period_index = period_index
 
         # ================= VALIDATE =================
         if not is_loading:
@@ -65,8 +69,13 @@ class WeeklyReport(BaseReport):
         if not wreport_id.startswith("WR"):
             raise ValueError("Mã báo cáo phải bắt đầu bằng WR")
 
-        existing = BaseReport.load_from_csv(self.WEEKLY_CSV)
-        if any(r["report_id"] == wreport_id for r in existing):
+        if self.period_index is not None:
+            if self.period_index.contains(wreport_id):
+                raise ValueError("Mã báo cáo tuần đã tồn tại")
+            return
+
+        existing = BaseReport.iter_matching(self.WEEKLY_CSV, lambda r: r["report_id"] == wreport_id)
+        if next(existing, None) is not None:
             raise ValueError("Mã báo cáo tuần đã tồn tại")
 
     def _validate_author(self, author):
@@ -77,26 +86,15 @@ class WeeklyReport(BaseReport):
     # CORE DATA
     # ======================================================
     def _get_project_tasks(self):
-        return [
-            t for t in self.task_manager.task_list
-            if t.project_id == self.p_id
-        ]
+        return self.task_manager.tasks_of_project(self.p_id)
 
     def _get_tasks_in_week(self):
-        return [
-            t for t in self.project_tasks
-            if (
-                (t.start_date and self.period_start_date <= t.start_date <= self.period_end_date)
-                or
-                (t.deadline and self.period_start_date <= t.deadline <= self.period_end_date)
-                or
-                (
-                    t.start_date and t.deadline
-                    and t.start_date < self.period_start_date
-                    and t.deadline > self.period_end_date
-                )
-            )
-        ]
+        # Task bắt đầu / hết hạn trong tuần hoặc kéo dài qua cả tuần (index khoảng ngày)
+        return self.task_manager.tasks_overlapping(
+            self.period_start_date,
+            self.period_end_date,
+            project_id=self.p_id
+        )
 
     # ======================================================
     # CALCULATION (THEO TUẦN)
@@ -163,25 +161,28 @@ class WeeklyReport(BaseReport):
             next_end = p_end
 
         return [
-            t for t in self.project_tasks
-            if (
-                t.status_task not in ("Completed", "Cancelled")
-                and (
-                    (t.start_date and next_start <= t.start_date <= next_end)
-                    or
-                    (t.deadline and next_start <= t.deadline <= next_end)
-                )
+            t for t in self.task_manager.tasks_starting_or_due(
+                next_start, next_end, project_id=self.p_id
             )
+            if t.status_task not in ("Completed", "Cancelled")
         ]
 
     # ======================================================
     # CSV & DISPLAY
     # ======================================================
+    @staticmethod
+    def csv_fields():
+        return [
+            "report_id", "project_id", "author_id", "created_date",
+            "period_start", "period_end", "total_tasks", "completed_tasks",
+            "overdue_tasks", "progress", "status",
+        ]
+
     def as_dict(self):
         data = super().as_dict()
         data.update({
-            "period_start": self.period_start_date.strftime("%Y-%m-%d"),
-            "period_end": self.period_end_date.strftime("%Y-%m-%d"),
+            "period_start": format_iso(self.period_start_date),
+            "period_end": format_iso(self.period_end_date),
             "total_tasks": self.total_tasks_count,
             "completed_tasks": self.completed_tasks_count,
             "overdue_tasks": self.overdue_tasks_count,
@@ -0,0 +1,277 @@
+# server.py
+"""
+Server HTTP/JSON cục bộ (asyncio) – nhiều client dùng chung 1 bộ dữ liệu trong bộ nhớ
+
+    python server.py [--host 127.0.0.1] [--port 8765] [--data-dir .]
+
+- Đọc (GET): trả thẳng từ dữ liệu / index trong bộ nhớ, không đọc lại CSV
+- Ghi (POST / PATCH / DELETE): đưa vào hàng đợi, 1 writer task duy nhất xử lý
+  lần lượt; các yêu cầu dồn cùng lúc được gom vào 1 UnitOfWork → ghi file 1 lần.
+  Sửa dữ liệu trong bộ nhớ chạy trên event loop, ghi file (commit) chạy trong
+  thread riêng → GET vẫn được trả lời trong lúc ghi
+
+    GET    /tasks?project=&status=&assignee=&overdue=1
+    GET    /tasks/<task_id>            GET /search/tasks?q=
+    POST   /tasks                      PATCH /tasks/<task_id>     DELETE /tasks/<task_id>
+    POST   /tasks/<task_id>/assign     {"staff_id": ...}
+    GET    /projects[/<id>]            GET /staff[/<id>]          GET /progress/<project_id>
+    GET    /portfolio
+    GET    /reports/weekly?project=    GET /reports/weekly/<id>   POST /reports/weekly
+    GET    /reports/final?project=     GET /reports/final/<id>    POST /reports/final
+    POST   /batch                      {"operations": [...], "atomic": false}
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+from urllib.parse import urlsplit, parse_qs
+
+import config
+from app_context import AppContext
+from services.operations import list_tasks, run_operations
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+MAX_BODY = 10 * 1024 * 1024
+
+
+class ApiServer:
+    def __init__(self, ctx):
+        self.ctx = ctx
+        # (operations, atomic, future) – chỉ writer task lấy ra xử lý
+        self.queue = asyncio.Queue()
+
+    # ================= WRITER =================
+    async def submit(self, ops, atomic=False):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((ops, atomic, future))
+        return await future
+
+    async def _commit(self, unit_of_work):
+        """
+        Ghi xuống file trong thread riêng
+        Ghi lỗi (OSError...) → bộ nhớ đã sửa mà file không đổi: nạp lại các manager
+        đã sửa ngay trên event loop (nơi GET đọc dữ liệu) rồi mới báo lỗi
+        """
+        try:
+            await asyncio.to_thread(unit_of_work.commit)
+        except Exception:
+            with contextlib.redirect_stdout(sys.stderr):
+                unit_of_work.rollback()
+            raise
+
+    async def writer(self):
+        while True:
+            batch = [await self.queue.get()]
+            while not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            # Yêu cầu atomic chạy riêng (để rollback được), còn lại gom chung 1 lần ghi
+            shared = [job for job in batch if not job[1]]
+            try:
+                if shared:
+                    unit_of_work = self.ctx.unit_of_work(defer_commit=True)
+                    with contextlib.redirect_stdout(sys.stderr), unit_of_work:
+                        results = [run_operations(self.ctx, ops) for ops, _, _ in shared]
+                    await self._commit(unit_of_work)
+                    # Chỉ trả kết quả sau khi đã ghi xong xuống file
+                    for (_, _, future), result in zip(shared, results):
+                        future.set_result(result)
+                for ops, atomic, future in batch:
+                    if atomic:
+                        unit_of_work = self.ctx.unit_of_work(defer_commit=True)
+                        with contextlib.redirect_stdout(sys.stderr):
+                            result = run_operations(self.ctx, ops, atomic=True,
+                                                    unit_of_work=unit_of_work)
+                        # Bị rollback thì không còn gì để ghi
+                        await self._commit(unit_of_work)
+                        future.set_result(result)
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    # ================= HTTP =================
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = request_line.decode("latin-1").split()
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY:
+                    await self._respond(writer, 413, {"ok": False, "error": "Payload quá lớn"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                keep_alive = (version == "HTTP/1.1"
+                              and headers.get("connection", "").lower() != "close")
+                status, payload = await self.dispatch(method.upper(), target, body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        data = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1")
+            + data
+        )
+        await writer.drain()
+
+    async def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        parts = [p for p in url.path.split("/") if p]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            data = json.loads(body) if body else {}
+            if method == "GET":
+                return 200, self.read(parts, query)
+            return await self.write(method, parts, data)
+        except HttpError as e:
+            return e.status, {"ok": False, "error": str(e)}
+        except (ValueError, PermissionError) as e:
+            return 400, {"ok": False, "error": str(e)}
+        except Exception as e:
+            return 500, {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+    # ================= ĐỌC =================
+    def read(self, parts, query):
+        ctx = self.ctx
+        match parts:
+            case ["tasks"]:
+                tasks = list_tasks(ctx, query.get("project"), query.get("status"),
+                                   query.get("assignee"), query.get("overdue") == "1")
+                return {"ok": True, "count": len(tasks), "tasks": [t.to_dict() for t in tasks]}
+            case ["tasks", task_id]:
+                return {"ok": True, "task": self._found(ctx.task_manager.find_by_id(task_id)).to_dict()}
+            case ["search", "tasks"]:
+                tasks = ctx.task_manager.find_tasks(query.get("q", ""))
+                return {"ok": True, "count": len(tasks), "tasks": [t.to_dict() for t in tasks]}
+            case ["projects"]:
+                return {"ok": True, "projects": [p.to_dict() for p in ctx.project_manager.items]}
+            case ["projects", project_id]:
+                project = self._found(ctx.project_manager.find_by_id(project_id))
+                return {"ok": True, "project": project.to_dict()}
+            case ["staff"]:
+                sm = ctx.staff_manager
+                return {"ok": True, "staff": [sm._to_row(s) for s in sm.staff_list]}
+            case ["staff", staff_id]:
+                sm = ctx.staff_manager
+                return {"ok": True, "staff": sm._to_row(self._found(sm.find_by_id(staff_id)))}
+            case ["portfolio"]:
+                return {"ok": True, "portfolio": ctx.progress_service.portfolio()}
+            case ["progress", project_id]:
+                return {"ok": True, "progress": ctx.progress_service.compute(project_id).as_dict()}
+            case ["reports", "weekly" | "final" as kind]:
+                index = self._report_manager(kind).index
+                project_id = query.get("project")
+                rows = index.iter_rows_for_project(project_id) if project_id else index.all_rows()
+                return {"ok": True, "reports": list(rows)}
+            case ["reports", "weekly" | "final" as kind, report_id]:
+                row = self._found(self._report_manager(kind).index.get(report_id))
+                return {"ok": True, "report": row}
+        raise HttpError(404, "Không có đường dẫn này")
+
+    def _report_manager(self, kind):
+        if kind == "weekly":
+            return self.ctx.weekly_report_manager
+        return self.ctx.final_report_manager
+
+    @staticmethod
+    def _found(obj):
+        if obj is None:
+            raise HttpError(404, "Không tìm thấy")
+        return obj
+
+    # ================= GHI =================
+    async def write(self, method, parts, data):
+        if not isinstance(data, dict):
+            raise HttpError(400, "Body phải là JSON object")
+
+        match method, parts:
+            case "POST", ["batch"]:
+                result = await self.submit(data.get("operations", []), bool(data.get("atomic")))
+                return (200 if result["ok"] else 400), result
+            case "POST", ["tasks"]:
+                op = {"op": "tasks.create", "project_id": data.get("project_id", ""),
+                      "fields": data.get("fields", data)}
+            case "PATCH", ["tasks", task_id]:
+                op = {"op": "tasks.update", "task_id": task_id, "fields": data.get("fields", data)}
+            case "DELETE", ["tasks", task_id]:
+                op = {"op": "tasks.delete", "task_id": task_id}
+            case "POST", ["tasks", task_id, "assign"]:
+                op = {"op": "tasks.assign", "task_id": task_id, "staff_id": data.get("staff_id", "")}
+            case "POST", ["reports", "weekly" | "final" as kind]:
+                op = dict(data, op=f"reports.{kind}.generate")
+            case _:
+                raise HttpError(405 if parts else 404, "Không hỗ trợ thao tác này")
+
+        result = await self.submit([op])
+        if not result["ok"]:
+            return 400, {"ok": False, "error": result["errors"][0]["error"]}
+        return (201 if method == "POST" else 200), {"ok": True, "result": result["results"][0]["result"]}
+
+
+async def serve(host, port):
+    with contextlib.redirect_stdout(sys.stderr):
+        # Nạp hết lúc khởi động – request đầu tiên không phải chờ đọc CSV
+        ctx = AppContext().load_all()
+    # Báo cáo đã đọc giữ trong bộ nhớ, chỉ đọc lại khi file báo cáo đổi
+    for manager in (ctx.weekly_report_manager, ctx.final_report_manager):
+        manager.index.keep_rows = True
+    api = ApiServer(ctx)
+    writer_task = asyncio.create_task(api.writer())
+    server = await asyncio.start_server(api.handle_client, host, port)
+    print(f"Server đang chạy tại http://{host}:{port}", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        writer_task.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="server.py", description="Server JSON quản lý dự án")
+    parser.add_argument("--host", default=config.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=config.SERVER_PORT)
+    parser.add_argument("--data-dir", default=".", help="Thư mục chứa các file CSV")
+    args = parser.parse_args(argv)
+
+    # Báo cáo dùng tên file tương đối → chạy trong thư mục dữ liệu
+    os.chdir(args.data_dir)
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# services/operations.py
+"""
+Bảng thao tác dạng dict ({"op": "tasks.create", ...}) dùng chung cho CLI và server
+Mỗi thao tác gọi service tương ứng, trả về dict để in JSON
+"""
+
+
+class BatchAbort(Exception):
+    """Dừng batch --atomic để UnitOfWork rollback"""
+
+
+# ================= THAO TÁC =================
+def _task_dict(task):
+    return task.to_dict()
+
+
+def _report_dict(report):
+    return report.as_dict()
+
+
+def op_tasks_create(ctx, op):
+    fields = op.get("fields") or op
+    if not isinstance(fields, dict):
+        raise ValueError("fields phải là object {tên cột: giá trị}")
+    fields = dict(fields)
+    project_id = op.get("project_id") or fields.get("project_id", "")
+    fields.pop("op", None)
+    fields.pop("project_id", None)
+    return _task_dict(ctx.task_service.create(project_id, fields))
+
+
+def op_tasks_update(ctx, op):
+    return _task_dict(ctx.task_service.update(op["task_id"], op.get("fields", {})))
+
+
+def op_tasks_delete(ctx, op):
+    return _task_dict(ctx.task_service.delete(op["task_id"]))
+
+
+def op_tasks_assign(ctx, op):
+    if not ctx.task_manager.assign_task(op["task_id"], op["staff_id"]):
+        raise ValueError(f"Task {op['task_id']} không tồn tại")
+    return _task_dict(ctx.task_manager.find_by_id(op["task_id"]))
+
+
+def op_progress(ctx, op):
+    return ctx.progress_service.compute(op["project_id"]).as_dict()
+
+
+def _author_of(project, op):
+    # Không chỉ định người lập → mặc định PM của dự án
+    author_id = op.get("author_id") or project.pm_id
+    if not author_id:
+        raise ValueError(f"Dự án {project.project_id} chưa được gán Project Manager")
+    return author_id
+
+
+def op_weekly_generate(ctx, op):
+    service = ctx.weekly_report_service
+    project = ctx.project_manager.find_by_id(op["project_id"])
+    if not project:
+        raise ValueError(f"Dự án {op['project_id']} không tồn tại")
+
+    start = op.get("start")
+    end = op.get("end")
+    if not start:
+        start, is_first_week = service.expected_period(project)
+        if is_first_week and not end:
+            end = service.default_end(project, start)
+
+    report = service.generate(
+        project.project_id, start, end,
+        author_id=_author_of(project, op),
+        report_id=op.get("report_id")
+    )
+    return _report_dict(report)
+
+
+def op_final_generate(ctx, op):
+    project = ctx.project_manager.find_by_id(op["project_id"])
+    if not project:
+        raise ValueError(f"Dự án {op['project_id']} không tồn tại")
+    report = ctx.final_report_service.generate(
+        project.project_id,
+        author_id=_author_of(project, op),
+        report_id=op.get("report_id")
+    )
+    return _report_dict(report)
+
+
+OPERATIONS = {
+    "tasks.create": op_tasks_create,
+    "tasks.update": op_tasks_update,
+    "tasks.delete": op_tasks_delete,
+    "tasks.assign": op_tasks_assign,
+    "progress": op_progress,
+    "reports.weekly.generate": op_weekly_generate,
+    "reports.final.generate": op_final_generate,
+}
+
+
+def run_operations(ctx, ops, atomic=False, unit_of_work=None):
+    """
+    Chạy nhiều thao tác với 1 lần nạp dữ liệu và 1 lần ghi mỗi file (UnitOfWork)
+    atomic=True: có 1 thao tác lỗi → bỏ toàn bộ thay đổi Staff / Project / Task
+    (báo cáo tuần / tổng kết đã ghi thì vẫn giữ)
+    unit_of_work: UnitOfWork do người gọi tạo (vd defer_commit để tự commit sau)
+    """
+    results = []
+    errors = []
+    try:
+        with unit_of_work or ctx.unit_of_work():
+            for i, op in enumerate(ops):
+                name = op.get("op", "") if isinstance(op, dict) else ""
+                handler = OPERATIONS.get(name)
+                try:
+                    if not isinstance(op, dict):
+                        raise ValueError("Thao tác phải là JSON object")
+                    if handler is None:
+                        raise ValueError(f"Thao tác không hỗ trợ: {name!r}")
+                    results.append({"index": i, "op": name, "result": handler(ctx, op)})
+                except (ValueError, PermissionError, KeyError) as e:
+                    errors.append({"index": i, "op": name, "error": _error_text(e)})
+            if atomic and errors:
+                raise BatchAbort()
+    except BatchAbort:
+        results = []
+
+    return {
+        "ok": not errors,
+        "applied": len(results),
+        "results": results,
+        "errors": errors,
+        "rolled_back": bool(atomic and errors),
+    }
+
+
+def _error_text(e):
+    if isinstance(e, KeyError):
+        return f"Thiếu trường {e.args[0]}"
+    return str(e)
+
+
+def list_tasks(ctx, project=None, status=None, assignee=None, overdue=False):
+    """Lọc task theo dự án / trạng thái / người phụ trách – dùng index khi có thể"""
+    tm = ctx.task_manager
+    if overdue:
+        tasks = tm.overdue_tasks()
+    elif project:
+        tasks = tm.tasks_of_project(project)
+    elif assignee:
+        tasks = tm.tasks_of_staff(assignee)
+    else:
+        tasks = list(tm.items)
+
+    if project:
+        tasks = [t for t in tasks if t.project_id == project]
+    if assignee:
+        key = tm._assignee_key(assignee)
+        tasks = [t for t in tasks if tm._assignee_key(t.assignee_id) == key]
+    if status:
+        tasks = [t for t in tasks if t.status_task == status]
+
+    return tasks
@@ -0,0 +1,48 @@
+# services/progress_service.py
+from models.progress import Progress
+from models.task import Task
+
+
+class ProgressService:
+    """Tính tiến độ dự án không qua input()"""
+
+    def __init__(self, project_manager, task_manager):
+        self.project_manager = project_manager
+        self.task_manager = task_manager
+
+    def compute(self, project_id):
+        project = self.project_manager.find_by_id(project_id)
+        if not project:
+            raise ValueError(f"Dự án {project_id} không tồn tại")
+        return Progress(project, self.task_manager)
+
+    def portfolio(self, now=None):
+        """
+        Tổng quan mọi dự án: số task theo trạng thái, quá hạn, hoàn thành trễ
+        Đếm trên dữ liệu dạng cột của TaskManager – không duyệt từng Task
+        """
+        columns = self.task_manager.columns
+        by_status = columns.status_counts_by_project()
+        overdue = columns.overdue_by_project(now)
+        late = columns.completed_late_by_project()
+
+        projects = {}
+        for p in self.project_manager.items:
+            counts = Task.full_status_counts(by_status.get(p.project_id, {}))
+            total = sum(n for status, n in counts.items() if status != "Cancelled")
+            projects[p.project_id] = {
+                "status_counts": counts,
+                "total_tasks": total,
+                "overdue_tasks": overdue.get(p.project_id, 0),
+                "completed_late": late.get(p.project_id, 0),
+                "progress_rate": round(counts.get("Completed", 0) / total * 100, 2) if total else 0,
+            }
+
+        return {
+            "projects": len(projects),
+            "tasks": len(columns),
+            "status_counts": Task.full_status_counts(columns.status_counts()),
+            "overdue_tasks": sum(overdue.values()),
+            "completed_late": sum(late.values()),
+            "by_project": projects,
+        }
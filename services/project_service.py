@@ -0,0 +1,78 @@
+# services/project_service.py
+import re
+from models.fields import check_fields
+from models.project import Project
+
+
+class ProjectService:
+    """
+    Thao tác dự án không qua input() – menu, CLI, batch dùng chung
+    Dữ liệu sai → raise ValueError, không in / không hỏi lại
+    """
+
+    def __init__(self, project_manager, staff_manager, task_manager):
+        self.project_manager = project_manager
+        self.staff_manager = staff_manager
+        self.task_manager = task_manager
+
+    def _project(self, project_id):
+        project = self.project_manager.find_by_id(project_id)
+        if not project:
+            raise ValueError(f"Dự án {project_id} không tồn tại")
+        return project
+
+    def _check_pm(self, pm_id):
+        staff = self.staff_manager.find_by_id(pm_id) if self.staff_manager else None
+        if not staff:
+            raise ValueError(f"Nhân viên {pm_id} không tồn tại")
+        if getattr(staff, "management_title", "") != "Project Manager":
+            raise ValueError("PM của dự án phải là Project Manager")
+        return pm_id
+
+    def create(self, fields):
+        """
+        Thêm dự án
+        fields: dict theo cột CSV (project_id, project_name, customer, description,
+        start_date, expected_end_date, actual_end_date, budget, status_project, pm_id);
+        ngày dạng dd/mm/yyyy hoặc datetime
+        """
+        check_fields(fields, ("project_id", "pm_id") + Project.EDITABLE_FIELDS)
+        project_id = str(fields.get("project_id", "")).strip()
+        if not re.fullmatch(r"P\d{2}_\d{5}", project_id):
+            raise ValueError("Sai định dạng mã dự án (PYY_NNNNN)")
+        if self.project_manager.find_by_id(project_id):
+            raise ValueError(f"Mã dự án {project_id} đã tồn tại")
+        for key, label in (("project_name", "tên dự án"), ("customer", "khách hàng"),
+                           ("budget", "ngân sách"), ("status_project", "trạng thái")):
+            if key not in fields:
+                raise ValueError(f"Thiếu {label}")
+        pm_id = self._check_pm(str(fields.get("pm_id") or "").strip())
+
+        project = Project()
+        project.apply_fields({k: v for k, v in fields.items() if k not in ("project_id", "pm_id")})
+        project.project_id = project_id
+        project.id = project_id
+        project.pm_id = pm_id
+
+        self.project_manager._insert(project)
+        self.project_manager._log_upsert(project)
+        return project
+
+    def update(self, project_id, fields):
+        """Sửa các trường có trong fields (mã dự án không đổi)"""
+        project = self._project(project_id)
+        check_fields(fields, ("pm_id",) + Project.EDITABLE_FIELDS)
+        pm_id = project.pm_id
+        if fields.get("pm_id"):
+            pm_id = self._check_pm(str(fields["pm_id"]).strip())
+
+        with self.project_manager._updating(project):
+            project.apply_fields({k: v for k, v in fields.items() if k != "pm_id"})
+            project.pm_id = pm_id
+
+        self.project_manager._log_upsert(project)
+        return project
+
+    def delete(self, project_id):
+        """Xóa dự án cùng toàn bộ task – trả về danh sách task đã xóa"""
+        return self.project_manager.remove_project(self._project(project_id))
@@ -0,0 +1,162 @@
+# services/report_service.py
+import re
+from datetime import datetime, timedelta
+from models.date_codec import parse_dmy
+from reports.weekly_report import WeeklyReport
+from reports.final_report import FinalReport
+
+
+def _to_date(value, field_name):
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return parse_dmy(str(value).strip())
+    except ValueError:
+        raise ValueError(f"{field_name} sai định dạng (dd/mm/yyyy)")
+
+
+def _check_project_pm(project, author):
+    if not author:
+        raise ValueError("Nhân viên lập báo cáo không tồn tại")
+    if getattr(author, "management_title", "") != "Project Manager":
+        raise PermissionError("Chỉ Project Manager mới được lập báo cáo")
+    if author.staff_id != project.pm_id:
+        raise PermissionError("Người lập báo cáo phải là PM của dự án này")
+
+
+class WeeklyReportService:
+    """
+    Lập báo cáo tuần không qua input()
+    Ràng buộc giống WeeklyReportManager.create_report:
+    - Tuần đầu bắt đầu từ ngày bắt đầu dự án, dài tối đa 7 ngày
+    - Tuần sau bắt đầu ngay sau tuần trước, kết thúc tự động sau 6 ngày
+    """
+
+    def __init__(self, weekly_manager, project_manager, staff_manager, task_manager):
+        self.weekly_manager = weekly_manager
+        self.project_manager = project_manager
+        self.staff_manager = staff_manager
+        self.task_manager = task_manager
+
+    def expected_period(self, project):
+        """(ngày bắt đầu bắt buộc, là tuần đầu?) của kỳ báo cáo kế tiếp"""
+        if project.start_date is None or project.expected_end_date is None:
+            # Ngày trống / sai định dạng trong file → không xác định được kỳ báo cáo
+            raise ValueError(f"Dự án {project.project_id} thiếu ngày bắt đầu / ngày kết thúc dự kiến")
+        next_start = self.weekly_manager.periods.next_start(project.project_id)
+        if next_start is None:
+            return project.start_date, True
+        return next_start, False
+
+    @staticmethod
+    def default_end(project, start):
+        """Ngày kết thúc chuẩn: start + 6 ngày, không vượt ngày kết thúc dự án"""
+        return min(start + timedelta(days=6), project.expected_end_date)
+
+    def generate(self, project_id, start, end=None, author_id="", report_id=None, save=True):
+        """
+        start / end: datetime hoặc dd/mm/yyyy; end bỏ trống từ tuần thứ 2 trở đi
+        report_id: bỏ trống → dùng mã gợi ý WR<pid>_Wxx
+        save=False: chỉ dựng báo cáo (xem trước), lưu sau bằng save()
+        """
+        project = self.project_manager.find_by_id(project_id)
+        if not project:
+            raise ValueError(f"Dự án {project_id} không tồn tại")
+
+        author = self.staff_manager.find_by_id(author_id)
+        _check_project_pm(project, author)
+
+        start = _to_date(start, "Ngày bắt đầu")
+        end = _to_date(end, "Ngày kết thúc")
+        expected_start, is_first_week = self.expected_period(project)
+        if expected_start > project.expected_end_date:
+            raise ValueError("Dự án đã hết thời gian lập báo cáo tuần")
+        if start is None or start.date() != expected_start.date():
+            raise ValueError(
+                f"Ngày bắt đầu phải là {expected_start.strftime('%d/%m/%Y')} theo tiến độ dự án"
+            )
+
+        if is_first_week:
+            if end is None:
+                raise ValueError("Tuần đầu phải có ngày kết thúc")
+            if end < start:
+                raise ValueError("Ngày kết thúc không được trước ngày bắt đầu")
+            if end > project.expected_end_date:
+                raise ValueError("Ngày kết thúc vượt quá ngày kết thúc dự án")
+            if (end - start).days >= 7:
+                raise ValueError("Tuần báo cáo không được dài quá 7 ngày")
+        else:
+            auto_end = self.default_end(project, start)
+            if end is not None and end.date() != auto_end.date():
+                raise ValueError(f"Ngày kết thúc phải là {auto_end.strftime('%d/%m/%Y')}")
+            end = auto_end
+
+        periods = self.weekly_manager.periods
+        report_id = report_id or periods.suggest_id(project_id)
+        if not re.fullmatch(rf"WR{re.escape(project_id)}_W\d{{2}}", report_id):
+            raise ValueError(f"Sai định dạng mã báo cáo (WR{project_id}_Wxx)")
+
+        report = WeeklyReport(
+            wreport_id=report_id,
+            project=project,
+            author=author,
+            task_manager=self.task_manager,
+            report_date=datetime.now(),
+            period_start_date=start,
+            period_end_date=end,
+            is_loading=False,
+            period_index=periods
+        )
+        if save:
+            self.save(report)
+        return report
+
+    def save(self, report):
+        report.save()
+        self.weekly_manager.periods.add(
+            report.report_id, report.project_id, report.period_end_date
+        )
+        return report
+
+
+class FinalReportService:
+    """Lập báo cáo tổng kết không qua input()"""
+
+    FINISHED_STATUSES = ("Hoàn thành", "Hủy")
+
+    def __init__(self, final_manager, project_manager, staff_manager, task_manager):
+        self.final_manager = final_manager
+        self.project_manager = project_manager
+        self.staff_manager = staff_manager
+        self.task_manager = task_manager
+
+    def generate(self, project_id, author_id, report_id=None, save=True):
+        project = self.project_manager.find_by_id(project_id)
+        if not project:
+            raise ValueError(f"Dự án {project_id} không tồn tại")
+        if project.status_project not in self.FINISHED_STATUSES:
+            raise ValueError("Chỉ được lập báo cáo khi dự án đã hoàn thành hoặc bị hủy")
+
+        expected_id = f"FR{project.project_id}"
+        report_id = report_id or expected_id
+        if report_id != expected_id:
+            raise ValueError(f"Mã báo cáo phải là {expected_id}")
+        if self.final_manager.index.get(report_id) is not None:
+            raise ValueError(f"Báo cáo {report_id} đã tồn tại")
+
+        report = FinalReport(
+            project_id=project.project_id,
+            report_id=report_id,
+            author_id=author_id,
+            report_date=datetime.now(),
+            is_loading=False
+        )
+        # Nạp dữ liệu + kiểm tra PM (raise nếu không hợp lệ)
+        report.input_info(
+            project_manager=self.project_manager,
+            task_manager=self.task_manager,
+            staff_manager=self.staff_manager
+        )
+        if save:
+            report.save()
+        return report
@@ -0,0 +1,59 @@
+# services/staff_service.py
+from managers.unit_of_work import UnitOfWork
+from models.fields import check_fields
+from models.staff import Staff
+
+
+class StaffService:
+    """
+    Thao tác nhân viên không qua input() – menu, CLI, batch dùng chung
+    Dữ liệu sai → raise ValueError, không in / không hỏi lại
+    """
+
+    def __init__(self, staff_manager):
+        self.staff_manager = staff_manager
+
+    def _staff(self, staff_id):
+        staff = self.staff_manager.find_by_id(staff_id)
+        if not staff:
+            raise ValueError(f"Nhân viên {staff_id} không tồn tại")
+        return staff
+
+    def create(self, fields):
+        """
+        Thêm nhân viên
+        fields: dict theo cột CSV (staff_id, full_name, age, level, role, management_title)
+        """
+        check_fields(fields, ("staff_id",) + Staff.EDITABLE_FIELDS)
+        staff = Staff()
+        staff_id = str(fields.get("staff_id", "")).strip()
+        staff.validate_staff_id(staff_id, self.staff_manager._by_id.keys())
+        for key, label in (("full_name", "họ tên"), ("age", "tuổi"),
+                           ("level", "cấp độ"), ("role", "vai trò")):
+            if key not in fields:
+                raise ValueError(f"Thiếu {label}")
+
+        staff.apply_fields({k: v for k, v in fields.items() if k != "staff_id"})
+        staff.staff_id = staff_id
+
+        self.staff_manager._insert(staff)
+        self.staff_manager._log_upsert(staff)
+        return staff
+
+    def update(self, staff_id, fields):
+        """Sửa các trường có trong fields (mã nhân viên không đổi)"""
+        staff = self._staff(staff_id)
+        staff.apply_fields(fields)
+        self.staff_manager._log_upsert(staff)
+        return staff
+
+    def delete(self, staff_id):
+        """Xóa nhân viên, bỏ giao các task của họ – staff.csv / tasks.csv mỗi file ghi 1 lần"""
+        staff = self._staff(staff_id)
+        task_manager = self.staff_manager.task_manager
+        with UnitOfWork(self.staff_manager, task_manager):
+            self.staff_manager._remove(staff)
+            if task_manager:
+                task_manager.unassign_staff(staff_id)
+            self.staff_manager._log_delete(staff_id)
+        return staff
@@ -0,0 +1,73 @@
+# services/task_service.py
+import re
+from models.fields import check_fields
+from models.task import Task
+
+
+class TaskService:
+    """
+    Thao tác task không qua input() – dùng cho CLI, batch, benchmark
+    Dữ liệu sai → raise ValueError, không in / không hỏi lại
+    """
+
+    def __init__(self, task_manager, project_manager, staff_manager):
+        self.task_manager = task_manager
+        self.project_manager = project_manager
+        self.staff_manager = staff_manager
+
+    def _staff_list(self):
+        return self.staff_manager.staff_list if self.staff_manager else []
+
+    def _project(self, project_id):
+        project = self.project_manager.find_by_id(project_id)
+        if not project:
+            raise ValueError(f"Dự án {project_id} không tồn tại")
+        return project
+
+    def _task(self, task_id):
+        task = self.task_manager.find_by_id(task_id)
+        if not task:
+            raise ValueError(f"Task {task_id} không tồn tại")
+        return task
+
+    def create(self, project_id, fields):
+        """
+        Thêm task vào dự án
+        fields: dict theo cột CSV (task_id, task_name, task_description, assignee_id,
+        start_date, deadline, priority, status_task); ngày dạng dd/mm/yyyy hoặc datetime
+        """
+        project = self._project(project_id)
+        check_fields(fields, ("task_id",) + Task.EDITABLE_FIELDS)
+
+        task_id = str(fields.get("task_id", "")).strip()
+        if not re.fullmatch(rf"T{re.escape(project_id)}_\d{{5}}", task_id):
+            raise ValueError(f"Sai định dạng mã task (T{project_id}_NNNNN)")
+        if self.task_manager.find_by_id(task_id):
+            raise ValueError(f"Mã task {task_id} đã tồn tại")
+        if "task_name" not in fields:
+            raise ValueError("Thiếu tên công việc")
+
+        task = Task(project_id=project_id, task_id=task_id)
+        editable = {k: v for k, v in fields.items() if k != "task_id"}
+        task.apply_fields(editable, self._staff_list(), project)
+
+        self.task_manager._insert(task)
+        self.task_manager._log_upsert(task)
+        return task
+
+    def update(self, task_id, fields):
+        """Sửa các trường có trong fields (mã task / dự án không đổi)"""
+        task = self._task(task_id)
+        project = self.project_manager.find_by_id(task.project_id)
+
+        with self.task_manager._updating(task):
+            task.apply_fields(fields, self._staff_list(), project)
+
+        self.task_manager._log_upsert(task)
+        return task
+
+    def delete(self, task_id):
+        task = self._task(task_id)
+        self.task_manager._remove(task)
+        self.task_manager._log_delete(task.id)
+        return task
@@ -0,0 +1,165 @@
+# storage/csv_storage.py
+import csv
+import json
+import os
+
+import instrumentation
+from storage.snapshot import load_snapshot, source_signature, write_snapshot
+
+
+class CsvJournalStorage:
+    """
+    Lưu trữ CSV + journal ghi nối (append-only)
+    - File CSV gốc chỉ được ghi lại toàn bộ khi compact
+    - Mỗi thay đổi ghi thêm 1 dòng JSON vào <file>.journal
+    - Khi đọc: nạp CSV gốc rồi áp dụng lần lượt các dòng journal
+    """
+
+    # Số dòng journal tối đa trước khi gộp (compact) lại vào file CSV
+    JOURNAL_COMPACT_THRESHOLD = 1000
+
+    def __init__(self, filename, fieldnames, id_field, snapshot=True):
+        self.filename = filename
+        self.fieldnames = fieldnames
+        self.id_field = id_field
+        self.journal_file = filename + ".journal"
+        # Snapshot nhị phân của CSV gốc đã parse (bỏ qua parse CSV + ngày tháng)
+        self.snapshot_file = filename + ".snapshot" if snapshot else None
+        self._journal_count = 0
+
+    # ================= ĐỌC =================
+    def load_rows(self):
+        """Trả về danh sách dict (CSV gốc + journal)"""
+        return self._replay_journal(
+            self._read_csv(),
+            from_row=lambda row: row,
+            key=lambda row: row[self.id_field],
+        )
+
+    def load_objects(self, from_row, key):
+        """
+        Trả về danh sách object (CSV gốc + journal)
+        Phần CSV gốc lấy từ snapshot nếu snapshot còn khớp với file CSV
+        """
+        objs = None
+        if self.snapshot_file:
+            objs = load_snapshot(self.snapshot_file, self.filename)
+            if objs is not None:
+                instrumentation.record_rows(len(objs))
+
+        if objs is None:
+            # Chữ ký lấy trước khi đọc: file đổi giữa chừng thì snapshot tự hết hiệu lực
+            signature = source_signature(self.filename) if self.snapshot_file else None
+            objs = [from_row(row) for row in self._read_csv()]
+            if signature:
+                write_snapshot(self.snapshot_file, signature, objs)
+
+        return self._replay_journal(objs, from_row, key)
+
+    def _read_csv(self):
+        try:
+            with open(self.filename, "r", encoding="utf-8", newline="") as f:
+                rows = list(csv.DictReader(f))
+                instrumentation.record_rows(len(rows))
+                instrumentation.record_bytes_read(os.fstat(f.fileno()).st_size)
+                return rows
+        except FileNotFoundError:
+            return []
+
+    def _replay_journal(self, items, from_row, key):
+        self._journal_count = 0
+        if not os.path.exists(self.journal_file):
+            return items
+
+        by_id = {key(item): item for item in items}
+        with open(self.journal_file, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Dòng cuối ghi dở (mất điện, crash...) → bỏ qua
+                    continue
+
+                if entry.get("op") == "upsert":
+                    item = from_row(entry["row"])
+                    by_id[key(item)] = item
+                elif entry.get("op") == "delete":
+                    by_id.pop(entry["id"], None)
+                self._journal_count += 1
+            instrumentation.record_rows(self._journal_count)
+            instrumentation.record_bytes_read(os.fstat(f.fileno()).st_size)
+
+        return list(by_id.values())
+
+    # ================= GHI TỪNG DÒNG =================
+    def upsert(self, rows):
+        self.apply(rows, ())
+
+    def delete(self, item_ids):
+        self.apply((), item_ids)
+
+    def apply(self, upsert_rows, delete_ids):
+        """Ghi một lô thay đổi bằng 1 lần mở file journal"""
+        entries = [{"op": "upsert", "row": row} for row in upsert_rows]
+        entries += [{"op": "delete", "id": item_id} for item_id in delete_ids]
+        self._append(entries)
+
+    def _append(self, entries):
+        if not entries:
+            return
+        data = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries).encode("utf-8")
+        with open(self.journal_file, "a+b") as f:
+            self._truncate_torn_tail(f)
+            f.write(data)
+            # Journal là nơi duy nhất giữ thay đổi cho tới lần compact → phải xuống đĩa
+            f.flush()
+            os.fsync(f.fileno())
+            instrumentation.record_bytes_written(len(data))
+        self._journal_count += len(entries)
+
+    @staticmethod
+    def _truncate_torn_tail(f):
+        """
+        Dòng cuối ghi dở (crash giữa lúc ghi, thiếu xuống dòng ở cuối) → cắt bỏ
+        Nếu không, dòng mới bị nối vào dòng hỏng và cả 2 bị bỏ qua khi đọc lại
+        """
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+        # Tìm ký tự xuống dòng cuối cùng (đọc ngược từng khối)
+        end = size
+        while end > 0:
+            start = max(0, end - 65536)
+            f.seek(start)
+            pos = f.read(end - start).rfind(b"\n")
+            if pos != -1:
+                f.truncate(start + pos + 1)
+                return
+            end = start
+        f.truncate(0)
+
+    def needs_compaction(self):
+        return self._journal_count >= self.JOURNAL_COMPACT_THRESHOLD
+
+    def compact(self):
+        """Gộp journal vào CSV gốc chỉ từ dữ liệu trên đĩa (không cần object trong bộ nhớ)"""
+        self.save_all(self.load_rows())
+
+    # ================= GHI TOÀN BỘ =================
+    def save_all(self, rows):
+        """Ghi lại toàn bộ CSV – journal cũ không còn cần thiết nữa"""
+        # Ghi ra file tạm rồi đổi tên → crash giữa chừng không làm hỏng CSV gốc
+        tmp = self.filename + ".tmp"
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=self.fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+            instrumentation.record_bytes_written(f.tell())
+        os.replace(tmp, self.filename)
+
+        if os.path.exists(self.journal_file):
+            os.remove(self.journal_file)
+        self._journal_count = 0
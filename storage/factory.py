@@ -0,0 +1,35 @@
+# storage/factory.py
+import os
+
+import config
+from storage.csv_storage import CsvJournalStorage
+from storage.sqlite_storage import SqliteStorage
+
+
+def create_storage(filename, fieldnames, id_field, indexes=(), dmy_date_fields=()):
+    """
+    Tạo backend lưu trữ theo config.STORAGE_BACKEND
+    - "csv"   : file CSV + journal (+ snapshot nhị phân nếu config.SNAPSHOT_CACHE)
+    - "sqlite": bảng SQLite (tên bảng = tên file CSV), dữ liệu CSV cũ được nạp lần đầu
+    """
+    backend = config.STORAGE_BACKEND
+
+    if backend == "csv":
+        return CsvJournalStorage(
+            filename, fieldnames, id_field,
+            snapshot=config.SNAPSHOT_CACHE,
+        )
+
+    if backend == "sqlite":
+        table = os.path.splitext(os.path.basename(filename))[0]
+        return SqliteStorage(
+            config.SQLITE_PATH,
+            table,
+            fieldnames,
+            id_field,
+            indexes=indexes,
+            dmy_date_fields=dmy_date_fields,
+            seed_filename=filename,
+        )
+
+    raise ValueError(f"Backend lưu trữ không hợp lệ: {backend}")
@@ -0,0 +1,94 @@
+# storage/snapshot.py
+"""
+Snapshot nhị phân (pickle) của dữ liệu đã parse từ file CSV
+
+Snapshot gắn với chữ ký của file nguồn (kích thước, mtime, sha1):
+- Kích thước + mtime khớp → dùng luôn, không đọc lại file CSV
+- Cùng kích thước nhưng mtime khác (copy / touch) → so sha1, khớp thì dùng
+  và ghi lại snapshot với mtime mới
+- Còn lại → snapshot bị bỏ qua và được ghi lại sau khi parse CSV
+Phần đầu file (phiên bản, chữ ký) là 1 pickle riêng → snapshot cũ bị loại
+mà không phải giải nén dữ liệu.
+
+Lưu ý an toàn: pickle.load có thể chạy code tùy ý. Snapshot nằm cạnh file CSV
+(<file>.snapshot) nên thư mục dữ liệu được coi là tin cậy – ai ghi được vào đó
+cũng có thể chạy code trong tiến trình này. Với thư mục dữ liệu dùng chung /
+nhận từ nơi khác, tắt snapshot bằng PM_SNAPSHOT_CACHE=0.
+"""
+import hashlib
+import os
+import pickle
+
+import instrumentation
+
+# Tăng khi đổi cấu trúc object được lưu trong snapshot
+SNAPSHOT_VERSION = 4
+
+
+def _stat(filename):
+    """(size, mtime_ns) của file nguồn; None nếu file không tồn tại"""
+    try:
+        st = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+
+def _sha1(filename):
+    digest = hashlib.sha1()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+        instrumentation.record_bytes_read(f.tell())
+    return digest.hexdigest()
+
+
+def source_signature(filename):
+    """(size, mtime_ns, sha1) của file nguồn; None nếu file không tồn tại"""
+    stat = _stat(filename)
+    if stat is None:
+        return None
+    return stat + (_sha1(filename),)
+
+
+def load_snapshot(path, filename):
+    """Trả về dữ liệu trong snapshot nếu còn khớp file nguồn, ngược lại None"""
+    stat = _stat(filename)
+    if stat is None:
+        return None
+    try:
+        with open(path, "rb") as f:
+            header = pickle.load(f)
+            if not (isinstance(header, tuple) and len(header) == 2
+                    and header[0] == SNAPSHOT_VERSION):
+                return None
+            saved_signature = tuple(header[1])
+            if saved_signature[0] != stat[0]:
+                return None
+            if saved_signature[1] != stat[1] and saved_signature[2] != _sha1(filename):
+                return None
+            payload = pickle.load(f)
+            instrumentation.record_bytes_read(f.tell())
+    except (OSError, EOFError, ValueError, IndexError, TypeError,
+            pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+
+    if saved_signature[1] != stat[1]:
+        # Nội dung không đổi, chỉ khác mtime → cập nhật để lần sau khỏi tính sha1
+        write_snapshot(path, stat + saved_signature[2:], payload)
+    return payload
+
+
+def write_snapshot(path, signature, payload):
+    # Ghi ra file tạm rồi đổi tên → không bao giờ để lại snapshot ghi dở
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump((SNAPSHOT_VERSION, signature), f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            instrumentation.record_bytes_written(f.tell())
+        os.replace(tmp, path)
+    except OSError:
+        # Không ghi được snapshot thì lần sau đọc CSV như bình thường
+        if os.path.exists(tmp):
+            os.remove(tmp)
@@ -0,0 +1,141 @@
+# storage/sqlite_storage.py
+import os
+import re
+import sqlite3
+
+import instrumentation
+from storage.csv_storage import CsvJournalStorage
+
+
+def _dmy_to_iso(s):
+    # dd/mm/yyyy -> yyyy-mm-dd (để index theo ngày sắp xếp đúng thứ tự)
+    if s and len(s) == 10 and s[2] == "/" and s[5] == "/":
+        return f"{s[6:]}-{s[3:5]}-{s[:2]}"
+    return s
+
+
+def _iso_to_dmy(s):
+    if s and len(s) == 10 and s[4] == "-" and s[7] == "-":
+        return f"{s[8:]}/{s[5:7]}/{s[:4]}"
+    return s
+
+
+class SqliteStorage:
+    """
+    Lưu trữ SQLite – mỗi manager một bảng
+    - Khóa chính là cột ID, có index cho các cột hay truy vấn
+    - Mỗi thay đổi chỉ ghi đúng các dòng liên quan
+    - Lần đầu tạo bảng: tự nạp dữ liệu từ file CSV cũ (nếu có)
+
+    Chỉ thay chỗ lưu, không thay cách tra cứu: manager vẫn nạp toàn bộ bảng
+    vào bộ nhớ khi khởi tạo và tra cứu bằng index trong bộ nhớ như backend csv
+    """
+
+    def __init__(self, db_path, table, fieldnames, id_field,
+                 indexes=(), dmy_date_fields=(), seed_filename=None):
+        self.db_path = db_path
+        self.table = re.sub(r"\W", "_", table)
+        self.fieldnames = fieldnames
+        self.id_field = id_field
+        self.dmy_date_fields = set(dmy_date_fields)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+
+        is_new = not self._table_exists()
+        self._create_schema(indexes)
+        if is_new and seed_filename and os.path.exists(seed_filename):
+            seed = CsvJournalStorage(seed_filename, fieldnames, id_field)
+            self.save_all(seed.load_rows())
+
+    # ================= SCHEMA =================
+    def _table_exists(self):
+        cur = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (self.table,)
+        )
+        return cur.fetchone() is not None
+
+    def _create_schema(self, indexes):
+        cols = ", ".join(f'"{f}" TEXT' for f in self.fieldnames)
+        with self.conn:
+            self.conn.execute(
+                f'CREATE TABLE IF NOT EXISTS "{self.table}" '
+                f'({cols}, PRIMARY KEY ("{self.id_field}"))'
+            )
+            for field in indexes:
+                self.conn.execute(
+                    f'CREATE INDEX IF NOT EXISTS "idx_{self.table}_{field}" '
+                    f'ON "{self.table}" ("{field}")'
+                )
+
+    # ================= CHUYỂN ĐỔI DÒNG =================
+    def _to_db(self, row):
+        values = []
+        for f in self.fieldnames:
+            v = row.get(f)
+            v = "" if v is None else str(v)
+            if f in self.dmy_date_fields:
+                v = _dmy_to_iso(v)
+            values.append(v)
+        return tuple(values)
+
+    def _from_db(self, values):
+        return {
+            f: _iso_to_dmy(v) if f in self.dmy_date_fields else v
+            for f, v in zip(self.fieldnames, values)
+        }
+
+    def _select_sql(self):
+        cols = ", ".join(f'"{f}"' for f in self.fieldnames)
+        return f'SELECT {cols} FROM "{self.table}"'
+
+    # ================= ĐỌC =================
+    def load_rows(self):
+        cur = self.conn.execute(self._select_sql() + " ORDER BY rowid")
+        rows = [self._from_db(values) for values in cur]
+        instrumentation.record_rows(len(rows))
+        return rows
+
+    def load_objects(self, from_row, key):
+        return [from_row(row) for row in self.load_rows()]
+
+    # ================= GHI TỪNG DÒNG =================
+    def upsert(self, rows):
+        self.apply(rows, ())
+
+    def delete(self, item_ids):
+        self.apply((), item_ids)
+
+    def apply(self, upsert_rows, delete_ids):
+        """Ghi một lô thay đổi trong 1 transaction"""
+        cols = ", ".join(f'"{f}"' for f in self.fieldnames)
+        marks = ", ".join("?" for _ in self.fieldnames)
+        updates = ", ".join(
+            f'"{f}" = excluded."{f}"' for f in self.fieldnames if f != self.id_field
+        )
+        with self.conn:
+            self.conn.executemany(
+                f'INSERT INTO "{self.table}" ({cols}) VALUES ({marks}) '
+                f'ON CONFLICT ("{self.id_field}") DO UPDATE SET {updates}',
+                [self._to_db(row) for row in upsert_rows]
+            )
+            self.conn.executemany(
+                f'DELETE FROM "{self.table}" WHERE "{self.id_field}" = ?',
+                [(item_id,) for item_id in delete_ids]
+            )
+
+    def needs_compaction(self):
+        return False
+
+    def compact(self):
+        pass
+
+    # ================= GHI TOÀN BỘ =================
+    def save_all(self, rows):
+        cols = ", ".join(f'"{f}"' for f in self.fieldnames)
+        marks = ", ".join("?" for _ in self.fieldnames)
+        with self.conn:
+            self.conn.execute(f'DELETE FROM "{self.table}"')
+            self.conn.executemany(
+                f'INSERT INTO "{self.table}" ({cols}) VALUES ({marks})',
+                [self._to_db(row) for row in rows]
+            )